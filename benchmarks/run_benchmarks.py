@@ -0,0 +1,252 @@
+"""Sıcak yollar için tekrarlanabilir performans ölçümleri.
+
+Kullanım (depo kök dizininden):
+    python -m benchmarks.run_benchmarks --sizes 10000 100000 1000000
+    python -m benchmarks.run_benchmarks --sizes 10000 --compare benchmarks/results/onceki.json
+
+Her ölçüm geçici bir çalışma dizininde sentetik filo ile yapılır; gerçek
+data/, machine_profiles/ ve models/ klasörlerine dokunulmaz. Sonuçlar
+makine tarafından okunabilir bir JSON dosyasına yazılır.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic_fleet import write_fleet_csv
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+FEATURES = ['air_temp', 'process_temp', 'rotational_speed', 'torque', 'tool_wear']
+
+
+def measure(fn, repeat=3):
+    """fn'i repeat kez çalıştırır; en iyi ve ortanca süreyi ve son sonucu döndürür."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return {'best': min(times), 'median': float(np.median(times)), 'runs': repeat}, result
+
+
+class BenchmarkSuite:
+    def __init__(self, sizes, train_rows=20_000, repeat=3, latency_calls=200, models=None, seed=42):
+        self.sizes = sizes
+        self.train_rows = train_rows
+        self.repeat = repeat
+        self.latency_calls = latency_calls
+        self.models = models
+        self.seed = seed
+        self.results = []
+
+    def record(self, benchmark, size, timing, **extra):
+        entry = {'benchmark': benchmark, 'size': size, **timing, **extra}
+        self.results.append(entry)
+        label = f"{benchmark}" + (f" [{extra['model']}]" if 'model' in extra else "")
+        print(f"  {label:<45} n={size:<9} en iyi: {timing['best'] * 1000:10.2f} ms")
+
+    def run(self):
+        for size in self.sizes:
+            print(f"\n📏 Filo büyüklüğü: {size}")
+            with tempfile.TemporaryDirectory(prefix="pm_bench_") as workdir:
+                cwd = os.getcwd()
+                os.chdir(workdir)
+                try:
+                    self._run_size(size)
+                finally:
+                    os.chdir(cwd)
+        return self.results
+
+    def _run_size(self, size):
+        from src.data_processor import DataProcessor
+        from src.machine_manager import MachineManager
+        from src.model_registry import ModelRegistry
+        from src.model_trainer import ModelTrainer
+        from src.risk_index import RiskIndex
+        from src.scoring_engine import ScoringEngine
+
+        os.makedirs("data", exist_ok=True)
+        raw_path = write_fleet_csv("data/ai4i2020.csv", size, seed=self.seed)
+
+        #1. Veri işleme (tüm dosya belleğe / akış modu)
+        timing, _ = measure(lambda: DataProcessor().process_data(raw_path), repeat=1)
+        self.record("process_data", size, timing)
+        timing, _ = measure(lambda: DataProcessor(chunksize=max(size // 10, 1000)).process_data(raw_path), repeat=1)
+        self.record("process_data_streaming", size, timing)
+
+        #2. Profil yükleme (soğuk başlangıç)
+        timing, manager = measure(MachineManager, self.repeat)
+        self.record("load_profiles", size, timing)
+
+        #3. Eğitim (büyük filolarda ilk train_rows satır ile sınırlı)
+        processed = pd.read_csv(DataProcessor.PROCESSED_PATH)
+        processed.head(self.train_rows).to_csv(DataProcessor.PROCESSED_PATH, index=False)
+        trainer = ModelTrainer(svm_mode="both")  #Tam ve yaklaşık SVM yan yana ölçülür
+        trainer.registry = ModelRegistry()
+        if self.models:
+            trainer.models = {name: model for name, model in trainer.models.items() if name in self.models}
+        per_model = trainer.train_all(parallel=False)
+        train_size = min(size, self.train_rows)
+        for model_name, stats in per_model.items():
+            self.record("train", train_size, {'best': stats['seconds'], 'median': stats['seconds'], 'runs': 1},
+                        model=model_name, peak_memory=stats['peak_memory'])
+
+        for model_name in per_model:
+            model = trainer.registry.get(model_name)
+            self._bench_scoring(size, model_name, model, manager, ScoringEngine, RiskIndex)
+
+    def _bench_scoring(self, size, model_name, model, manager, ScoringEngine, RiskIndex):
+        #4. Tek makine gecikmesi (GUI'deki predict_failure ile aynı yol)
+        machine = next(iter(manager.machines.values()))
+        latencies = []
+        for _ in range(self.latency_calls):
+            start = time.perf_counter()
+            features = pd.DataFrame([[machine.features[col] for col in FEATURES]], columns=FEATURES)
+            model.predict_proba(features)[0][1]
+            latencies.append(time.perf_counter() - start)
+        latencies = np.array(latencies)
+        self.record("single_predict_latency", 1,
+                    {'best': float(latencies.min()), 'median': float(np.median(latencies)), 'runs': len(latencies)},
+                    model=model_name, p99=float(np.percentile(latencies, 99)))
+
+        #5a. Eski yol: makine sözlüklerinden DataFrame kur ve tüm filoyu skorla
+        def legacy_fleet_scoring():
+            df = pd.DataFrame([{'machine_id': machine_id, 'type': m.machine_type, **m.features}
+                               for machine_id, m in manager.machines.items()])
+            df['risk_score'] = model.predict_proba(df[FEATURES])[:, 1]
+            return df
+
+        timing, df = measure(legacy_fleet_scoring, self.repeat)
+        self.record("fleet_scoring_legacy", size, timing, model=model_name)
+
+        #5b. Skorlama motoru (soğuk: ilk skorlama, sıcak: önbellekten)
+        engine = ScoringEngine(manager)
+        timing, risk = measure(lambda: engine.risk_scores(("bench", model_name, time.perf_counter()), lambda: model),
+                               self.repeat)
+        self.record("fleet_scoring_engine_cold", size, timing, model=model_name)
+        engine.risk_scores(("bench", model_name), lambda: model)
+        timing, _ = measure(lambda: engine.risk_scores(("bench", model_name), lambda: model), self.repeat)
+        self.record("fleet_scoring_engine_cached", size, timing, model=model_name)
+
+        #5c. Düz ağaç tahmincisi (yalnızca ağaç toplulukları)
+        from src.tree_inference import compile_model
+        flat = compile_model(model)
+        if flat is not None:
+            timing, _ = measure(lambda: flat.predict_risk(engine.features), self.repeat)
+            self.record("fleet_scoring_flat", size, timing, model=model_name)
+            row = engine.features[:1]
+            latencies = []
+            for _ in range(self.latency_calls):
+                start = time.perf_counter()
+                flat.predict_risk(row)
+                latencies.append(time.perf_counter() - start)
+            latencies = np.array(latencies)
+            self.record("single_predict_latency_flat", 1,
+                        {'best': float(latencies.min()), 'median': float(np.median(latencies)),
+                         'runs': len(latencies)},
+                        model=model_name, p99=float(np.percentile(latencies, 99)))
+
+        #6. İlk 40 sıralaması (eski nlargest ve RiskIndex)
+        timing, _ = measure(lambda: df.nlargest(40, 'risk_score'), self.repeat)
+        self.record("top40_nlargest", size, timing, model=model_name)
+        timing, index = measure(lambda: RiskIndex(risk, engine.machine_types), self.repeat)
+        self.record("risk_index_build", size, timing, model=model_name)
+        timing, _ = measure(lambda: index.page(1, 20), self.repeat)
+        self.record("risk_index_page", size, timing, model=model_name)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def library_versions():
+    versions = {'python': platform.python_version()}
+    for name in ("numpy", "pandas", "sklearn", "xgboost", "imblearn"):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = None
+    return versions
+
+
+def compare(results, baseline_path, threshold=1.2):
+    """Sonuçları önceki bir çalıştırmayla karşılaştırır; yavaşlayan ölçümleri listeler."""
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+
+    def key(entry):
+        return entry['benchmark'], entry['size'], entry.get('model')
+
+    previous = {key(entry): entry for entry in baseline['results']}
+    regressions = []
+    print(f"\n📊 Karşılaştırma: {baseline_path}")
+    print(f"{'Ölçüm':<45}{'n':>10}{'Önceki (ms)':>14}{'Şimdi (ms)':>14}{'Oran':>8}")
+    for entry in results:
+        old = previous.get(key(entry))
+        if old is None or old['best'] == 0:
+            continue
+        ratio = entry['best'] / old['best']
+        label = entry['benchmark'] + (f" [{entry['model']}]" if entry.get('model') else "")
+        flag = " ⚠️" if ratio > threshold else ""
+        print(f"{label:<45}{entry['size']:>10}{old['best'] * 1000:>14.2f}{entry['best'] * 1000:>14.2f}{ratio:>8.2f}{flag}")
+        if ratio > threshold:
+            regressions.append({**entry, 'baseline_best': old['best'], 'ratio': ratio})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Predictive Maintenance performans ölçümleri")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                        help="Sentetik filo büyüklükleri (ör. 10000 100000 1000000)")
+    parser.add_argument("--train-rows", type=int, default=20_000, help="Eğitimde kullanılacak en fazla satır")
+    parser.add_argument("--models", nargs="+", default=None, help="Yalnızca bu modelleri ölç")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Sonuç JSON dosyası (varsayılan: benchmarks/results/)")
+    parser.add_argument("--compare", default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Bu oranın üstü yavaşlama sayılır")
+    args = parser.parse_args(argv)
+
+    suite = BenchmarkSuite(args.sizes, args.train_rows, args.repeat, models=args.models, seed=args.seed)
+    results = suite.run()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'versions': library_versions(),
+            'sizes': args.sizes,
+            'train_rows': args.train_rows,
+            'seed': args.seed
+        },
+        'results': results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Sonuçlar kaydedildi: {output}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"\n⚠️ {len(regressions)} ölçümde yavaşlama var")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+TYPE_SHARES = {'L': 0.6, 'M': 0.3, 'H': 0.1}
+#AI4I veri setindeki aşırı zorlanma (OSF) eşikleri, tipe göre
+OSF_LIMITS = {'L': 11000, 'M': 12000, 'H': 13000}
+
+
+def generate_fleet(n_machines, seed=42, duplicate_ratio=0.0):
+    """AI4I 2020 şemasında, verilen büyüklükte sentetik bir ham veri seti üretir.
+
+    Dağılımlar ve arıza kuralları (TWF, HDF, PWF, OSF, RNF) orijinal veri setinin
+    tanımına göre yaklaşık olarak taklit edilir; aynı seed her zaman aynı veriyi
+    üretir. duplicate_ratio > 0 ise bazı Product ID'ler tekrar eder (tekrar
+    eleme adımını da ölçmek için).
+    """
+    rng = np.random.default_rng(seed)
+    types = rng.choice(list(TYPE_SHARES), size=n_machines, p=list(TYPE_SHARES.values()))
+    numbers = np.arange(n_machines) + 10000
+    if duplicate_ratio > 0:
+        duplicates = rng.random(n_machines) < duplicate_ratio
+        numbers[duplicates] = rng.integers(10000, 10000 + n_machines, size=int(duplicates.sum()))
+        #Tekrar eden numara, ilk sahibinin tipini alır (aynı makine farklı tipte görünmesin)
+        types = types[numbers - 10000]
+    product_ids = np.char.add(types.astype(str), numbers.astype(str))
+
+    air_temp = np.round(rng.normal(300.0, 2.0, n_machines), 1)
+    process_temp = np.round(air_temp + 10.0 + rng.normal(0.0, 1.0, n_machines), 1)
+    rotational_speed = np.round(rng.normal(1538.0, 179.0, n_machines)).clip(1168, 2886)
+    torque = np.round(rng.normal(40.0, 10.0, n_machines), 1).clip(3.8, 76.6)
+    tool_wear = rng.integers(0, 254, n_machines)
+
+    power = torque * rotational_speed * 2 * np.pi / 60
+    osf_limit = np.vectorize(OSF_LIMITS.get)(types)
+    twf = ((tool_wear >= 200) & (tool_wear <= 240) & (rng.random(n_machines) < 0.05)).astype(np.int8)
+    hdf = ((process_temp - air_temp < 8.6) & (rotational_speed < 1380)).astype(np.int8)
+    pwf = ((power < 3500) | (power > 9000)).astype(np.int8)
+    osf = (tool_wear * torque > osf_limit).astype(np.int8)
+    rnf = (rng.random(n_machines) < 0.001).astype(np.int8)
+    failure = (twf | hdf | pwf | osf | rnf).astype(np.int8)
+
+    return pd.DataFrame({
+        'UDI': np.arange(1, n_machines + 1),
+        'Product ID': product_ids,
+        'Type': types,
+        'Air temperature [K]': air_temp,
+        'Process temperature [K]': process_temp,
+        'Rotational speed [rpm]': rotational_speed,
+        'Torque [Nm]': torque,
+        'Tool wear [min]': tool_wear,
+        'Machine failure': failure,
+        'TWF': twf,
+        'HDF': hdf,
+        'PWF': pwf,
+        'OSF': osf,
+        'RNF': rnf
+    })
+
+
+def write_fleet_csv(path, n_machines, seed=42, duplicate_ratio=0.0):
+    generate_fleet(n_machines, seed, duplicate_ratio).to_csv(path, index=False)
+    return path
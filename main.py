@@ -1,33 +1,81 @@
-import os
 import sys
-import tkinter as tk
+
+#Ölçüm, diğer tüm içe aktarmalardan önce başlamalı
+if "--startup-report" in sys.argv:
+    from src.startup_report import install_import_timer
+    IMPORT_TIMER = install_import_timer()
+else:
+    IMPORT_TIMER = None
+
+import argparse
+import os
 from pathlib import Path
-from src.data_processor import DataProcessor
-from src.model_trainer import ModelTrainer
-from src.app_interface import PredictiveMaintenanceApp
+from src.build_cache import BuildCache
+
+RAW_DATA_PATH = "data/ai4i2020.csv"
+PROCESSING_MANIFEST = "data/build_manifest.json"
+TRAINING_MANIFEST = "models/trained_models/classification/build_manifest.json"
 
 def initialize():
     paths = ["data", "machine_profiles", "models/trained_models/classification"]
     for path in paths:
         os.makedirs(path, exist_ok=True)
 
-def run_data_processing():
-    processor = DataProcessor()
-    processor.process_data()
+def run_data_processing(force=False, chunksize=None):
+    """Veriyi işler; işleme çalıştıysa profilleri yüklü MachineManager'ı döndürür."""
+    #pandas yalnızca işleme gerçekten çalışırsa yüklenir
+    from src.data_processor import DataProcessor
+    processor = DataProcessor(chunksize=chunksize)
+    cache = BuildCache(PROCESSING_MANIFEST)
+    fingerprint = cache.fingerprint(files=[RAW_DATA_PATH], params=processor.get_params())
+    if not force and cache.is_fresh("processing", fingerprint):
+        print("⏩ Veri değişmedi, veri işleme atlandı.")
+        return None
+    processor.process_data(RAW_DATA_PATH)
+    cache.record("processing", fingerprint, outputs=processor.output_paths())
+    return processor.manager
 
-def run_model_training():
-    trainer = ModelTrainer()
+def run_model_training(force=False, svm_mode="exact", history_features=False):
+    #ML kütüphaneleri yalnızca eğitim gerçekten çalışırsa yüklenir
+    from src.model_trainer import ModelTrainer
+    trainer = ModelTrainer(svm_mode=svm_mode, history_features=history_features)
+    cache = BuildCache(TRAINING_MANIFEST)
+    fingerprint = cache.fingerprint(files=trainer.input_files(), params=trainer.get_params())
+    if not force and cache.is_fresh("training", fingerprint):
+        print("⏩ Veri ve model parametreleri değişmedi, model eğitimi atlandı.")
+        return
     trainer.train_all()
+    cache.record("training", fingerprint, outputs=trainer.output_paths())
 
-def start_gui():
+def start_gui(manager=None, import_timer=None):
+    import tkinter as tk
+    from src.app_interface import PredictiveMaintenanceApp
     root = tk.Tk()
-    PredictiveMaintenanceApp(root)
+    PredictiveMaintenanceApp(root, manager=manager)
+    if import_timer is not None:
+        #Pencere çizilip olay döngüsü ilk kez boşta kaldığında raporla
+        root.after_idle(import_timer.print_report)
     root.mainloop()
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Predictive Maintenance System")
+    parser.add_argument("--force", action="store_true",
+                        help="Girdiler değişmemiş olsa bile veri işleme ve eğitimi yeniden çalıştır")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Ham CSV'yi bu boyutta parçalar halinde akış modunda işle")
+    parser.add_argument("--svm-mode", choices=("exact", "approx", "both"), default="exact",
+                        help="SVM eğitimi: exact (tam SVC, varsayılan), approx (Nyström + doğrusal SVM) veya both")
+    parser.add_argument("--history-features", action="store_true",
+                        help="Modelleri sensör geçmişi özellikleriyle (kayan ortalama/std/eğim) eğit")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="GUI açıldığında modül başına içe aktarma sürelerini yazdır")
+    return parser.parse_args()
+
 if __name__ == "__main__":
     BASE_DIR = Path(__file__).parent
     sys.path.append(str(BASE_DIR))
+    args = parse_args()
     initialize()
-    run_data_processing()
-    run_model_training()
-    start_gui()
\ No newline at end of file
+    manager = run_data_processing(force=args.force, chunksize=args.chunksize)
+    run_model_training(force=args.force, svm_mode=args.svm_mode, history_features=args.history_features)
+    start_gui(manager, import_timer=IMPORT_TIMER)
@@ -1,20 +1,44 @@
+import json
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import joblib
-import pandas as pd
 from datetime import datetime
+from src.background import BackgroundRunner
+from src.instrumentation import span
 from src.machine_manager import MachineManager
+from src.model_registry import get_registry
+from src.report_export import export_ranking
+from src.scoring_engine import ScoringEngine, predict_risk, with_history
+from src.sharded_scoring import ShardedScorer, should_shard
+from src.virtual_list import VirtualList
+
+#Son gösterilen risk sayfası; açılışta modeller yüklenmeden hemen gösterilir
+LAST_RANKING_PATH = "data/cache/last_ranking.json"
 
 
 class PredictiveMaintenanceApp:
-    def __init__(self, root):
+    SEARCH_DELAY_MS = 150  # Yazma durduktan sonra aramanın başlayacağı süre
+    COMPARE_ROWS = 200  # Karşılaştırma penceresinde gösterilen makine sayısı
+
+    def __init__(self, root, manager=None):
         self.root = root
-        self.manager = MachineManager()  # Makine yöneticisi
+        self.manager = manager or MachineManager()  # Makine yöneticisi (verilirse paylaşılır)
+        self.scoring = ScoringEngine(self.manager)  # Filo skorlama motoru (önbellekli)
+        self.registry = get_registry()  # Model kayıt defteri (bellekte LRU)
         self.loaded_model = None  # Yüklü model
         self.selected_machine_id = None  # Seçili makine ID
-        self.current_risk_page = 0  # Risk listesi sayfa numarası (0: 1-20, 1: 21-40)
+        self.current_risk_page = 0  # Risk listesi sayfa numarası (0'dan başlar)
+        self.search_job = None  # Bekleyen (gecikmeli) arama
+        self.showing_progress = False  # Durum çubuğunda ilerleme yüzdesi gösteriliyor mu
         self.setup_ui()  # Arayüzü kur
-        self.refresh_high_risk_list()  # Risk listesini güncelle
+        # Model yükleme ve skorlama arka planda çalışır, pencere donmaz
+        self.worker = BackgroundRunner(root, on_busy=self.set_busy)
+        # Tek makine tahmini filo işlerinin (skorlama, dışa aktarma, karşılaştırma) arkasında beklemez
+        self.predict_worker = BackgroundRunner(root)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.show_last_ranking()  # Önceki oturumun risk listesi (önbellekten)
+        # Güncel liste pencere çizildikten sonra hesaplanır (model kütüphaneleri o zaman yüklenir)
+        self.root.after_idle(self.refresh_high_risk_list)
 
     def setup_ui(self):
         """Arayüz bileşenlerini oluşturur."""
@@ -43,8 +67,8 @@ class PredictiveMaintenanceApp:
         self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
         self.search_entry.bind("<KeyRelease>", self.filter_machines)
 
-        # Makine listesi
-        self.machine_listbox = tk.Listbox(left_frame, width=25, height=25)
+        # Makine listesi (yalnızca görünen satırlar çizilir)
+        self.machine_listbox = VirtualList(left_frame, width=25, height=25)
         self.machine_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.refresh_machine_list()
         self.machine_listbox.bind("<<ListboxSelect>>", self.on_machine_select)
@@ -72,14 +96,18 @@ class PredictiveMaintenanceApp:
         # Model seçim combobox
         ttk.Label(right_frame, text="Model:").pack(anchor=tk.W)
         self.model_var = tk.StringVar()
+        #Yalnızca eğitilmiş modeller listelenir (SVM Approx isteğe bağlı: --svm-mode approx/both)
+        labels = ["Random Forest", "SVM", "SVM Approx", "XGBoost"]
+        trained = set(self.registry.available())
         self.model_combobox = ttk.Combobox(
             right_frame,
             textvariable=self.model_var,
-            values=["Random Forest", "SVM", "XGBoost"],
+            values=[label for label in labels if self.model_name_of(label) in trained] or labels,
             state="readonly"
         )
         self.model_combobox.pack(fill=tk.X, pady=5)
         self.model_combobox.current(0)
+        self.model_combobox.bind("<<ComboboxSelected>>", lambda event: self.show_risk_page(0))
 
         # Tahmin butonu
         self.predict_btn = ttk.Button(
@@ -105,16 +133,48 @@ class PredictiveMaintenanceApp:
         )
         self.risk_title_label.pack()
 
+        # Filtreler: sayfa boyutu, makine tipi ve minimum risk eşiği
+        filter_frame = ttk.Frame(bottom_frame)
+        filter_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Label(filter_frame, text="Sayfa Boyutu:").pack(side=tk.LEFT)
+        self.page_size_var = tk.StringVar(value="20")
+        ttk.Combobox(
+            filter_frame,
+            textvariable=self.page_size_var,
+            values=["20", "50", "100", "500"],
+            width=5,
+            state="readonly"
+        ).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(filter_frame, text="Tip:").pack(side=tk.LEFT)
+        self.risk_type_var = tk.StringVar(value="Tümü")
+        ttk.Combobox(
+            filter_frame,
+            textvariable=self.risk_type_var,
+            values=["Tümü", "L", "M", "H"],
+            width=6,
+            state="readonly"
+        ).pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(filter_frame, text="Min. Risk (%):").pack(side=tk.LEFT)
+        self.min_risk_entry = ttk.Entry(filter_frame, width=6)
+        self.min_risk_entry.pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(filter_frame, text="Uygula", command=self.apply_risk_filters).pack(side=tk.LEFT, padx=5)
+
         # Treeview (Tablo görünümü)
         self.risk_tree = ttk.Treeview(
             bottom_frame,
-            columns=("machine_id", "risk_score"),
+            columns=("machine_id", "type", "risk_score"),
             show="headings",
             height=8
         )
         self.risk_tree.heading("machine_id", text="Makine ID")
+        self.risk_tree.heading("type", text="Tip")
         self.risk_tree.heading("risk_score", text="Risk Skoru")
         self.risk_tree.column("machine_id", width=150)
+        self.risk_tree.column("type", width=50)
         self.risk_tree.column("risk_score", width=100)
         self.risk_tree.pack(fill=tk.BOTH, expand=True)
 
@@ -127,42 +187,58 @@ class PredictiveMaintenanceApp:
         button_frame = ttk.Frame(bottom_frame)
         button_frame.pack(fill=tk.X, pady=5)
 
+        self.prev_page_btn = ttk.Button(
+            button_frame,
+            text="◀ Önceki Sayfa",
+            command=lambda: self.show_risk_page(self.current_risk_page - 1)
+        )
+        self.prev_page_btn.pack(side=tk.LEFT, padx=5)
+
         self.next_page_btn = ttk.Button(
             button_frame,
-            text="Sonraki 20 Makineyi Göster",
-            command=self.show_next_risk_page
+            text="Sonraki Sayfa ▶",
+            command=lambda: self.show_risk_page(self.current_risk_page + 1)
         )
         self.next_page_btn.pack(side=tk.LEFT, padx=5)
 
         ttk.Button(
             button_frame,
-            text="Rapor Oluştur (CSV)",
+            text="Rapor Oluştur (Tüm Filo)",
             command=self.export_risk_report
         ).pack(side=tk.LEFT, padx=5)
 
+        ttk.Button(
+            button_frame,
+            text="Modelleri Karşılaştır",
+            command=self.compare_models
+        ).pack(side=tk.LEFT, padx=5)
+
+        # İlerleme göstergesi (arka plan işleri sürerken)
+        self.status_label = ttk.Label(button_frame, text="")
+        self.status_label.pack(side=tk.RIGHT, padx=5)
+        self.progress_bar = ttk.Progressbar(button_frame, length=150, mode="determinate", maximum=1.0)
+        self.progress_bar.pack(side=tk.RIGHT, padx=5)
+
         self.risk_tree.bind("<Double-1>", self.on_risk_tree_select)
 
     # ---------------------- İŞLEVSEL METODLAR ----------------------
 
     def filter_machines(self, event):
-        """Arama kutusuna girilen metne göre makine listesini filtreler."""
-        search_term = self.search_entry.get().lower()
-        self.machine_listbox.delete(0, tk.END)
-        for machine_id in sorted(self.manager.machines.keys()):
-            if search_term in machine_id.lower():
-                self.machine_listbox.insert(tk.END, machine_id)
+        """Arama kutusuna yazıldıkça aramayı erteler; yalnızca son tuştan sonra arar."""
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(self.SEARCH_DELAY_MS, self.refresh_machine_list)
 
     def refresh_machine_list(self):
-        """Makine listesini veritabanından yeniden yükler."""
-        self.machine_listbox.delete(0, tk.END)
-        for machine_id in sorted(self.manager.machines.keys()):
-            self.machine_listbox.insert(tk.END, machine_id)
+        """Makine listesini arama indeksine göre günceller."""
+        self.search_job = None
+        self.machine_listbox.set_items(self.manager.search(self.search_entry.get()))
 
     def on_machine_select(self, event):
         """Listeden makine seçildiğinde detayları gösterir."""
-        selected = self.machine_listbox.curselection()
+        selected = self.machine_listbox.selected()
         if selected:
-            self.selected_machine_id = self.machine_listbox.get(selected[0])
+            self.selected_machine_id = selected
             self.show_machine_details()
             self.predict_btn.config(state=tk.NORMAL)
 
@@ -186,80 +262,185 @@ class PredictiveMaintenanceApp:
         self.detail_text.insert(tk.END, details)
         self.detail_text.config(state=tk.DISABLED)
 
-    def load_model(self):
-        """Seçili modeli diskten yükler."""
-        model_name = self.model_var.get().lower().replace(" ", "_")
-        try:
-            self.loaded_model = joblib.load(f"models/trained_models/classification/{model_name}.joblib")
-            return True
-        except Exception as e:
-            messagebox.showerror("Hata", f"Model yüklenemedi:\n{str(e)}")
-            return False
+    def model_name(self):
+        """Seçili modelin dosya adını döndürür."""
+        return self.model_name_of(self.model_var.get())
 
-    def predict_failure(self):
-        """Seçili makine için arıza tahmini yapar."""
-        if not self.load_model():
-            return
+    @staticmethod
+    def model_name_of(label):
+        """Arayüzdeki model adını dosya adına çevirir ("SVM Approx" -> "svm_approx")."""
+        return label.lower().replace(" ", "_")
 
-        try:
-            machine = self.manager.machines[self.selected_machine_id]
-            features = pd.DataFrame([[
-                machine.features['air_temp'],
-                machine.features['process_temp'],
-                machine.features['rotational_speed'],
-                machine.features['torque'],
-                machine.features['tool_wear']
-            ]], columns=['air_temp', 'process_temp', 'rotational_speed', 'torque', 'tool_wear'])
-
-            proba = self.loaded_model.predict_proba(features)[0][1]
+    def predict_failure(self):
+        """Seçili makine için arıza tahminini arka planda yapar."""
+        machine_id = self.selected_machine_id
+        model_name = self.model_name()
+        #Satırın kopyası ana iş parçacığında alınır; arka plan yalnızca modeli yükleyip tahmin eder
+        table = self.manager.machines
+        features = table.feature_matrix()[[table.row_index[machine_id]]].copy()
+        inputs = with_history(features, [machine_id], self.manager.history)
+
+        def predict(job):
+            model = self.registry.get(model_name)
+            with span("gui.predict_machine", model=model_name, rows=1):
+                return float(predict_risk(model, inputs)[0])
+
+        def show(proba):
             result_text = (
                 f"Arıza Olasılığı: {proba * 100:.2f}%\n"
                 f"Risk Seviyesi: {'🔴 YÜKSEK' if proba > 0.7 else '🟡 ORTA' if proba > 0.3 else '🟢 DÜŞÜK'}"
             )
             self.result_label.config(text=result_text)
 
-        except Exception as e:
-            messagebox.showerror("Hata", f"Tahmin başarısız:\n{str(e)}")
-
-    def get_all_machines_features(self):
-        """Tüm makinelerin özelliklerini DataFrame olarak döndürür."""
-        features = []
-        for machine_id, machine in self.manager.machines.items():
-            features.append({
-                'machine_id': machine_id,
-                'type': machine.machine_type,
-                **machine.features
-            })
-        return pd.DataFrame(features)
+        self.result_label.config(text="Tahmin yapılıyor...")
+        self.predict_worker.submit("predict", predict, on_done=show,
+                           on_error=lambda e: messagebox.showerror("Hata", f"Tahmin başarısız:\n{str(e)}"))
+
+    def get_risk_index(self, model_name=None, progress=None):
+        """Seçili modelin skorları üzerindeki sıralı risk indeksini döndürür.
+
+        Skorlar model dosyası ve veri sürümüne göre önbellekte tutulur; model
+        yalnızca yeniden skorlama gerektiğinde kayıt defterinden alınır.
+        Skorlama motoru yalnızca arka plan iş parçacığından çağrılmalıdır.
+        Büyük filolar tüm çekirdeklerde parçalı (sharded) skorlanır.
+        """
+        model_name = model_name or self.model_name()
+        model_key = (model_name, self.registry.signature(model_name))
+
+        def load():
+            self.loaded_model = self.registry.get(model_name)
+            return self.loaded_model
+
+        scorer = None
+        if should_shard(len(self.manager.machines)):
+            scorer = ShardedScorer(model_name, registry=self.registry)
+        return self.scoring.risk_index(model_key, load, progress, scorer)
+
+    def get_risk_filters(self):
+        """Sayfa boyutu, tip ve eşik filtrelerini okur."""
+        page_size = int(self.page_size_var.get())
+        machine_type = None if self.risk_type_var.get() == "Tümü" else self.risk_type_var.get()
+        min_risk = self.min_risk_entry.get().strip().replace(",", ".")
+        min_score = float(min_risk) / 100 if min_risk else None
+        return page_size, machine_type, min_score
+
+    def get_risk_page(self, model_name, page, filters, progress=None):
+        """İstenen sayfadaki makineleri DataFrame olarak ve filtreye uyan toplam sayıyı döndürür."""
+        with span("gui.risk_scoring", model=model_name, rows=len(self.scoring.features)):
+            index = self.get_risk_index(model_name, progress)
+        page_size, machine_type, min_score = filters
+        with span("gui.risk_page", model=model_name, page=page) as trace:
+            rows, total = index.page(page, page_size, machine_type, min_score)
+            trace.set(rows=len(rows), total=total)
+        return self.scoring.frame(rows, index.risk), total
+
+    def set_busy(self, busy):
+        """Arka plan işi sürerken ilerleme çubuğunu gösterir."""
+        if busy:
+            #İlerleme bildiriliyorsa yüzde metni korunur
+            if not self.showing_progress:
+                self.status_label.config(text="Yükleniyor...")
+        else:
+            self.showing_progress = False
+            self.progress_bar.stop()
+            self.progress_bar.config(mode="determinate", value=0)
+            self.status_label.config(text="")
+
+    def show_progress(self, fraction):
+        self.showing_progress = True
+        self.progress_bar.stop()
+        self.progress_bar.config(mode="determinate", value=fraction)
+        self.status_label.config(text=f"İşleniyor... %{fraction * 100:.0f}")
 
     def refresh_high_risk_list(self):
-        """Risk listesini günceller."""
-        if not self.load_model():
-            return
-
+        """Risk listesini arka planda hesaplar; model veya sayfa hızla değişirse eski iş iptal edilir."""
         try:
-            df = self.get_all_machines_features()
-            X = df[['air_temp', 'process_temp', 'rotational_speed', 'torque', 'tool_wear']]
-            df['risk_score'] = self.loaded_model.predict_proba(X)[:, 1]
-
-            start_idx = self.current_risk_page * 20
-            top_risky = df.nlargest(40, 'risk_score').iloc[start_idx:start_idx + 20]
+            filters = self.get_risk_filters()
+        except ValueError:
+            filters = (int(self.page_size_var.get()), None, None)
+        model_label = self.model_var.get()
+        model_name = self.model_name()
+        page = self.current_risk_page
+
+        self.progress_bar.config(mode="indeterminate")
+        self.progress_bar.start(15)
+
+        def rank(job):
+            top_risky, total = self.get_risk_page(model_name, page, filters, job.progress)
+            rows = list(top_risky[['machine_id', 'type', 'risk_score']].itertuples(index=False, name=None))
+            self.save_last_ranking(model_label, page, filters, rows, total)
+            return rows, total
+
+        self.worker.submit(
+            "risk", rank,
+            on_done=lambda result: self.show_risk_list(*result, page_size=filters[0]),
+            on_error=lambda e: messagebox.showerror("Hata", f"Risk listesi oluşturulamadı:\n{str(e)}"),
+            on_progress=self.show_progress
+        )
 
+    def save_last_ranking(self, model_label, page, filters, rows, total):
+        """Gösterilen risk sayfasını bir sonraki açılışta hemen göstermek için saklar."""
+        page_size, machine_type, min_score = filters
+        ranking = {
+            'model': model_label,
+            'signature': list(self.registry.signature(self.model_name_of(model_label))),
+            'page': page,
+            'filters': {'page_size': page_size, 'machine_type': machine_type, 'min_score': min_score},
+            'rows': [[machine_id, str(kind), float(risk)] for machine_id, kind, risk in rows],
+            'total': int(total),
+            'saved_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        os.makedirs(os.path.dirname(LAST_RANKING_PATH), exist_ok=True)
+        tmp_path = f"{LAST_RANKING_PATH}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(ranking, f)
+        os.replace(tmp_path, LAST_RANKING_PATH)
+
+    def show_last_ranking(self):
+        """Önceki oturumda kaydedilen risk sayfasını (model yüklemeden) gösterir."""
+        try:
+            with open(LAST_RANKING_PATH, "r") as f:
+                ranking = json.load(f)
+        except (OSError, ValueError):
+            return
+        if ranking.get('model') not in self.model_combobox['values']:
+            return
+        # Arka plandaki yenileme aynı görünümü hesaplasın diye seçimler geri yüklenir
+        filters = ranking['filters']
+        self.model_var.set(ranking['model'])
+        self.page_size_var.set(str(filters['page_size']))
+        self.risk_type_var.set(filters['machine_type'] or "Tümü")
+        if filters['min_score'] is not None:
+            self.min_risk_entry.insert(0, f"{filters['min_score'] * 100:g}")
+        self.current_risk_page = ranking['page']
+        try:
+            stale = list(self.registry.signature(self.model_name())) != ranking['signature']
+        except OSError:
+            stale = True
+        cached_at = ranking['saved_at'] + (", model değişti" if stale else "")
+        self.show_risk_list([tuple(row) for row in ranking['rows']], ranking['total'],
+                            filters['page_size'], cached_at=cached_at)
+
+    def show_risk_list(self, top_risky, total, page_size, cached_at=None):
+        """Risk sayfasını (makine, tip, skor satırları) tabloya yazar (ana iş parçacığında)."""
+        try:
             self.risk_tree.delete(*self.risk_tree.get_children())
-            for _, row in top_risky.iterrows():
-                risk_level = "high" if row['risk_score'] > 0.7 else "medium" if row['risk_score'] > 0.3 else "low"
+            for machine_id, machine_type, risk_score in top_risky:
+                risk_level = "high" if risk_score > 0.7 else "medium" if risk_score > 0.3 else "low"
                 self.risk_tree.insert(
                     "", "end",
-                    values=(row['machine_id'], f"{row['risk_score'] * 100:.1f}%"),
+                    values=(machine_id, machine_type, f"{risk_score * 100:.1f}%"),
                     tags=(risk_level,)
                 )
 
             # Başlık ve buton güncelleme
-            page_range = "21-40" if self.current_risk_page == 1 else "1-20"
-            self.risk_title_label.config(text=f"Yüksek Riskli Makineler (Top {page_range})")
-            self.next_page_btn.config(
-                text="İlk 20 Makineyi Göster" if self.current_risk_page == 1 else "Sonraki 20 Makineyi Göster"
+            start = self.current_risk_page * page_size
+            cached = f" - önbellek: {cached_at}" if cached_at else ""
+            self.risk_title_label.config(
+                text=f"Yüksek Riskli Makineler (Top {start + 1}-{start + len(top_risky)} / {total}){cached}"
             )
+            self.prev_page_btn.config(state=tk.NORMAL if self.current_risk_page > 0 else tk.DISABLED)
+            self.next_page_btn.config(state=tk.NORMAL if start + page_size < total else tk.DISABLED)
 
             # Renk etiketleri
             self.risk_tree.tag_configure('high', background='#ffdddd')
@@ -269,22 +450,28 @@ class PredictiveMaintenanceApp:
         except Exception as e:
             messagebox.showerror("Hata", f"Risk listesi oluşturulamadı:\n{str(e)}")
 
-    def show_next_risk_page(self):
-        """Risk listesi sayfaları arasında geçiş yapar."""
-        self.current_risk_page = 1 if self.current_risk_page == 0 else 0
+    def show_risk_page(self, page):
+        """Risk listesinde istenen sayfaya geçer."""
+        self.current_risk_page = max(page, 0)
         self.refresh_high_risk_list()
 
+    def apply_risk_filters(self):
+        """Filtreler değiştiğinde risk listesini ilk sayfadan gösterir."""
+        try:
+            self.get_risk_filters()
+        except ValueError:
+            messagebox.showerror("Hata", "Geçersiz risk eşiği")
+            return
+        self.show_risk_page(0)
+
     def on_risk_tree_select(self, event):
         """Risk listesinden çift tıklanan makineyi seçer."""
         item = self.risk_tree.selection()[0]
         machine_id = self.risk_tree.item(item, "values")[0]
         self.selected_machine_id = machine_id
-        items = self.machine_listbox.get(0, tk.END)
-        if machine_id in items:
-            idx = items.index(machine_id)
-            self.machine_listbox.selection_clear(0, tk.END)
-            self.machine_listbox.selection_set(idx)
-            self.machine_listbox.see(idx)
+        idx = self.machine_listbox.index_of(machine_id)
+        if idx is not None:
+            self.machine_listbox.select(idx)
         self.show_machine_details()
         self.predict_btn.config(state=tk.NORMAL)
 
@@ -314,15 +501,20 @@ class PredictiveMaintenanceApp:
             entries[feature].insert(0, str(machine.features[feature]))
 
         def save_changes():
+            values = {}
             for feature in entries:
                 try:
-                    machine.features[feature] = float(entries[feature].get())
+                    values[feature] = float(entries[feature].get())
                 except ValueError:
                     messagebox.showerror("Hata", f"Geçersiz değer: {feature}")
                     return
 
-            machine.last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            machine.save_to_file()
+            #Tablo dizileri kilit altında değişir; arka plandaki skorlama anlık kopyayla çalışır
+            with self.manager.lock:
+                for feature, value in values.items():
+                    machine.features[feature] = value
+                machine.last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self.manager.save_machine(machine)
             self.show_machine_details()
             self.refresh_high_risk_list()  # Risk listesini yenile
             top.destroy()
@@ -331,31 +523,127 @@ class PredictiveMaintenanceApp:
             row=len(features), column=0, columnspan=2, pady=10)
 
     def export_risk_report(self):
-        """Risk listesini CSV olarak dışa aktarır."""
-        if not self.loaded_model:
-            messagebox.showwarning("Uyarı", "Önce bir model yükleyin!")
-            return
+        """Filtreye uyan tüm sıralı filoyu (sayfa değil) arka planda parça parça dışa aktarır.
 
+        Seçili modelin skorları önbellekten alınır; önbellekte güncel skoru olan
+        diğer modellerin skorları da ayrı sütunlar olarak eklenir.
+        """
         try:
-            df = self.get_all_machines_features()
-            X = df[['air_temp', 'process_temp', 'rotational_speed', 'torque', 'tool_wear']]
-            df['risk_score'] = self.loaded_model.predict_proba(X)[:, 1]
-
-            start_idx = self.current_risk_page * 20
-            top_risky = df.nlargest(40, 'risk_score').iloc[start_idx:start_idx + 20]
-
-            file_path = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV Dosyası", "*.csv"), ("Tüm Dosyalar", "*.*")],
-                title="Raporu Kaydet"
-            )
+            _, machine_type, min_score = self.get_risk_filters()
+        except ValueError:
+            messagebox.showerror("Hata", "Geçersiz risk eşiği")
+            return
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV Dosyası", "*.csv"), ("Sıkıştırılmış CSV", "*.csv.gz"),
+                       ("Parquet", "*.parquet"), ("Tüm Dosyalar", "*.*")],
+            title="Raporu Kaydet"
+        )
+        if not file_path:
+            return
+        model_name = self.model_name()
+        other_models = [self.model_name_of(label) for label in self.model_combobox['values']]
+
+        def export(job):
+            index = self.get_risk_index(model_name, job.progress)
+            rows = index.above(min_score, machine_type)
+            scores = {}
+            for name in other_models:
+                try:
+                    risk = self.scoring.cached((name, self.registry.signature(name)))
+                except OSError:
+                    continue
+                if risk is not None and name != model_name:
+                    scores[f"score_{name}"] = risk
+            with span("gui.export", model=model_name, rows=len(rows)):
+                export_ranking(self.scoring, index.risk, rows, file_path, model=model_name, scores=scores,
+                               progress=job.progress, float_format="%.4f", encoding='utf-8-sig')
+            return file_path, len(rows)
+
+        self.progress_bar.config(mode="indeterminate")
+        self.progress_bar.start(15)
+        self.worker.submit(
+            "export", export,
+            on_done=lambda result: messagebox.showinfo("Başarılı", f"Rapor kaydedildi ({result[1]} makine):\n{result[0]}"),
+            on_error=lambda e: messagebox.showerror("Hata", f"Rapor oluşturulamadı:\n{str(e)}"),
+            on_progress=self.show_progress
+        )
 
-            if file_path:
-                top_risky.to_csv(file_path, index=False, float_format="%.2f", encoding='utf-8-sig')
-                messagebox.showinfo("Başarılı", f"Rapor kaydedildi:\n{file_path}")
+    def compare_models(self):
+        """Filoyu tüm modellerle tek paralel geçişte skorlar ve karşılaştırma penceresini açar."""
+        from src.fused_scoring import score_all_models
+
+        def compare(job):
+            df, results, version, stats = score_all_models(
+                registry=self.registry, engine=self.scoring, verbose=False)
+            # Sınıflandırıcı skorları önbelleğe alınır; model değiştirmek yeniden skorlama gerektirmez
+            for (task, name), scores in results.items():
+                if task == "classification":
+                    self.scoring.prime((name, self.registry.signature(name)), scores, version)
+            return df, stats
+
+        self.progress_bar.config(mode="indeterminate")
+        self.progress_bar.start(15)
+        self.worker.submit(
+            "compare", compare,
+            on_done=lambda result: self.show_comparison(*result),
+            on_error=lambda e: messagebox.showerror("Hata", f"Modeller karşılaştırılamadı:\n{str(e)}")
+        )
 
-        except Exception as e:
-            messagebox.showerror("Hata", f"Rapor oluşturulamadı:\n{str(e)}")
+    def show_comparison(self, df, stats):
+        """Model skorlarını, topluluk skorunu ve sıra farklarını yan yana gösterir."""
+        top = tk.Toplevel(self.root)
+        top.title("Model Karşılaştırması")
+        top.geometry("1000x500")
+
+        ttk.Label(
+            top,
+            text=(f"{stats['machines']} makine, {len(stats['models'])} model, {stats['workers']} süreç: "
+                  f"{stats['score_seconds']:.2f} sn"),
+        ).pack(anchor=tk.W, padx=5, pady=5)
+
+        sort_var = tk.StringVar(value="ensemble_score")
+        sort_frame = ttk.Frame(top)
+        sort_frame.pack(fill=tk.X, padx=5)
+        ttk.Label(sort_frame, text="Sırala:").pack(side=tk.LEFT)
+        for value, text in (("ensemble_score", "Topluluk skoru"), ("max_rank_delta", "En çok ayrışan"),
+                            ("score_spread", "Skor farkı")):
+            ttk.Radiobutton(sort_frame, text=text, value=value, variable=sort_var,
+                            command=lambda: render()).pack(side=tk.LEFT, padx=5)
+
+        models = stats['models']
+        value_models = stats.get('value_models', [])
+        columns = ["machine_id", "type", "ensemble_score", "agreement", "max_rank_delta"] + \
+                  [f"score_{name}" for name in models] + [f"value_{name}" for name in value_models]
+        headings = {"machine_id": "Makine ID", "type": "Tip", "ensemble_score": "Topluluk",
+                    "agreement": "Uyum", "max_rank_delta": "Maks. Sıra Farkı"}
+        tree = ttk.Treeview(top, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=headings.get(column, column.split("_", 1)[1]))
+            tree.column(column, width=110 if column == "machine_id" else 80, anchor=tk.CENTER)
+        scrollbar = ttk.Scrollbar(top, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        def render():
+            tree.delete(*tree.get_children())
+            rows = df.nlargest(self.COMPARE_ROWS, sort_var.get(), keep='first')
+            for row in rows[columns].itertuples(index=False):
+                values = [row.machine_id, row.type, f"{row.ensemble_score * 100:.1f}%",
+                          f"{row.agreement * 100:.0f}%", int(row.max_rank_delta)]
+                values += [f"{score * 100:.1f}%" for score in row[len(values):len(values) + len(models)]]
+                #Regresyon tahminleri kendi biriminde (ör. takım aşınması, dakika) gösterilir
+                values += [f"{value:.1f}" for value in row[len(values):]]
+                tree.insert("", "end", values=values)
+
+        render()
+
+    def on_close(self):
+        """Pencere kapanırken bekleyen arka plan işlerini iptal eder."""
+        self.worker.shutdown()
+        self.predict_worker.shutdown()
+        self.root.destroy()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """Yerine daha yeni bir iş gönderildiği için yarıda bırakılan iş."""
+
+
+class Job:
+    """Arka plandaki işin ilerleme bildirimi ve iptal kontrolü için tutamacı."""
+
+    __slots__ = ('runner', 'key', 'generation')
+
+    def __init__(self, runner, key, generation):
+        self.runner = runner
+        self.key = key
+        self.generation = generation
+
+    @property
+    def cancelled(self):
+        return self.runner._generations.get(self.key) != self.generation
+
+    def progress(self, done, total):
+        """İlerlemeyi arayüze bildirir; iş geçersiz kaldıysa JobCancelled fırlatır."""
+        if self.cancelled:
+            raise JobCancelled(self.key)
+        self.runner._results.put(('progress', self, done / total if total else 1.0))
+
+
+class BackgroundRunner:
+    """Uzun süren işleri Tk ana iş parçacığı dışında çalıştırır.
+
+    Sonuçlar bir kuyruk üzerinden root.after ile ana iş parçacığına taşınır;
+    Tk nesnelerine yalnızca geri çağırmalarda (on_done, on_error, on_progress)
+    dokunulmalıdır. Aynı anahtarla yeni bir iş gönderildiğinde eski iş geçersiz
+    sayılır: henüz başlamadıysa iptal edilir, çalışıyorsa ilk ilerleme
+    bildiriminde durur, bitmişse sonucu yok sayılır.
+    """
+    POLL_MS = 30
+
+    def __init__(self, root, max_workers=1, on_busy=None):
+        self.root = root
+        self.on_busy = on_busy  #on_busy(bool): meşgul göstergesini aç/kapat
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui-worker")
+        self._results = queue.Queue()
+        self._generations = {}
+        self._futures = {}
+        self._callbacks = {}
+        self._lock = threading.Lock()
+        self._polling = False
+        self._busy = False
+
+    def submit(self, key, fn, *args, on_done=None, on_error=None, on_progress=None):
+        """fn(job, *args) işini arka planda çalıştırır; aynı anahtardaki eski işi geçersiz kılar."""
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+        previous = self._futures.pop(key, None)
+        if previous is not None:
+            previous.cancel()
+
+        job = Job(self, key, generation)
+        self._callbacks[key] = (generation, on_done, on_error, on_progress)
+        future = self.executor.submit(self._run, job, fn, args)
+        self._futures[key] = future
+        self._set_busy(True)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+        return job
+
+    def cancel(self, key):
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+        future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+        self._callbacks.pop(key, None)
+        self._set_busy(bool(self._futures))
+
+    def _run(self, job, fn, args):
+        if job.cancelled:
+            return
+        try:
+            result = fn(job, *args)
+        except JobCancelled:
+            return
+        except Exception as e:
+            self._results.put(('error', job, e))
+        else:
+            self._results.put(('done', job, result))
+
+    def _poll(self):
+        #Yalnızca ana iş parçacığında çalışır
+        while True:
+            try:
+                kind, job, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            generation, on_done, on_error, on_progress = self._callbacks.get(job.key, (None, None, None, None))
+            if generation != job.generation:
+                continue  #Yerine yenisi gönderilmiş işin sonucu
+            if kind == 'progress':
+                if on_progress:
+                    on_progress(value)
+                continue
+            self._callbacks.pop(job.key, None)
+            self._futures.pop(job.key, None)
+            callback = on_done if kind == 'done' else on_error
+            if callback:
+                callback(value)
+
+        if self._futures or not self._results.empty():
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+        self._set_busy(bool(self._futures))
+
+    def _set_busy(self, busy):
+        #Yalnızca durum değiştiğinde bildirilir (her yoklamada değil)
+        if busy == self._busy:
+            return
+        self._busy = busy
+        if self.on_busy:
+            self.on_busy(busy)
+
+    def shutdown(self):
+        with self._lock:
+            for key in self._generations:
+                self._generations[key] += 1
+        self.executor.shutdown(wait=False, cancel_futures=True)
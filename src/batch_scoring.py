@@ -0,0 +1,85 @@
+import time
+import numpy as np
+from src.machine_manager import MachineManager
+from src.model_registry import get_registry
+from src.report_export import export_ranking
+from src.scoring_engine import predict_risk, risk_levels, ScoringEngine
+from src.sharded_scoring import ShardedScorer, should_shard
+
+
+def score_fleet(model_name="xgboost", output_path=None, fmt=None, batch_size=50_000,
+                manager=None, registry=None, min_score=None, limit=None, verbose=True, backend=None,
+                return_frame=True, workers=None):
+    """Tüm filoyu GUI olmadan skorlar ve risk sırasına göre sıralı sonuçları döndürür.
+
+    Profil deposu ve model kayıt defterinden okur; yeniden eğitim yapmaz.
+    output_path verilirse sonuçlar CSV, gzip'li CSV, Parquet veya JSON Lines
+    olarak parça parça yazılır (report_export).
+    backend='flat' ağaç modellerini düz dizi tabanlı tahminciyle skorlar.
+    return_frame=False ise sıralı sonuçlar bellekte DataFrame olarak kurulmaz
+    (çok büyük filolarda yalnızca dosyaya yazmak için).
+    workers > 1 ise filo paylaşılan bellek üzerinde satır parçalarına bölünüp
+    bu kadar süreçte skorlanır (sharded_scoring); sıralama parçalardan birleştirilir.
+    Tek çekirdekte veya küçük filolarda (should_shard) tek süreçte skorlanır.
+    Sonuç DataFrame'ini (veya None) ve süre/verim istatistiklerini döndürür.
+    """
+    start = time.perf_counter()
+    manager = manager or MachineManager()
+    registry = registry or get_registry()
+    engine = ScoringEngine(manager)
+    engine.sync()
+    load_seconds = time.perf_counter() - start
+
+    model = registry.get(model_name, backend=backend)
+    n_machines = len(engine.machine_ids)
+
+    #Parça parça skorla: bellekteki ara DataFrame boyutu batch_size ile sınırlı kalır
+    score_start = time.perf_counter()
+    X = engine.inputs(model)
+    if workers is not None and workers > 1 and not should_shard(n_machines, workers):
+        #Süreç başlatma ve model yükleme küçük filolarda skorlamadan uzun sürer
+        if verbose:
+            print(f"ℹ️ {n_machines} makine için parçalı skorlama kazanç sağlamaz; tek süreçte skorlanıyor")
+        workers = None
+    if workers is not None and workers > 1:
+        scorer = ShardedScorer(model_name, workers=workers, backend=backend, registry=registry,
+                               shard_rows=batch_size)
+        risk, order = scorer(X)
+    else:
+        risk = np.empty(n_machines, dtype=np.float64)
+        for batch_start in range(0, n_machines, batch_size):
+            batch = slice(batch_start, batch_start + batch_size)
+            risk[batch] = predict_risk(model, X[batch])
+        order = np.argsort(-risk, kind='stable')
+    score_seconds = time.perf_counter() - score_start
+
+    if min_score is not None:
+        order = order[risk[order] > min_score]
+    if limit is not None:
+        order = order[:limit]
+
+    if output_path:
+        export_ranking(engine, risk, order, output_path, fmt, model=model_name, chunk_rows=batch_size)
+
+    df = None
+    if return_frame:
+        df = engine.frame(order, risk)
+        df.insert(0, 'rank', np.arange(1, len(df) + 1))
+        df['risk_level'] = risk_levels(df['risk_score'].to_numpy())
+        df['model'] = model_name
+
+    stats = {
+        'model': model_name,
+        'machines': n_machines,
+        'workers': max(workers or 1, 1),
+        'load_seconds': load_seconds,
+        'score_seconds': score_seconds,
+        'machines_per_second': n_machines / score_seconds if score_seconds > 0 else float('inf'),
+        'total_seconds': time.perf_counter() - start
+    }
+    if verbose:
+        print(f"✅ {n_machines} makine {model_name} ile skorlandı: "
+              f"{score_seconds:.2f} sn ({stats['machines_per_second']:,.0f} makine/sn)")
+        if output_path:
+            print(f"📄 Sıralı sonuçlar kaydedildi: {output_path} ({len(order)} satır)")
+    return df, stats
@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+
+
+class BuildCache:
+    """Başlangıç aşamaları için içerik özetine dayalı önbellek.
+
+    Her aşamanın girdileri (dosya içerikleri ve parametreler) tek bir özette
+    toplanır ve çıktılarıyla birlikte bir manifest dosyasına yazılır. Özet ve
+    çıktılar değişmemişse aşama atlanabilir.
+    """
+
+    def __init__(self, manifest_path):
+        self.manifest_path = manifest_path
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self):
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=4, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def file_hash(path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @classmethod
+    def fingerprint(cls, files=(), params=None):
+        """Girdi dosyalarının içeriği ve parametrelerden tek bir özet üretir."""
+        digest = hashlib.sha256()
+        for path in files:
+            digest.update(path.encode())
+            digest.update(cls.file_hash(path).encode())
+        digest.update(json.dumps(params or {}, sort_keys=True, default=repr).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _output_signature(path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def is_fresh(self, stage, fingerprint):
+        """Aşamanın girdileri ve kayıtlı çıktıları değişmemişse True döndürür."""
+        entry = self.manifest.get(stage)
+        if entry is None or entry.get('fingerprint') != fingerprint:
+            return False
+        for path, signature in entry.get('outputs', {}).items():
+            if not os.path.exists(path) or self._output_signature(path) != signature:
+                return False
+        return True
+
+    def record(self, stage, fingerprint, outputs=()):
+        """Aşamanın özetini ve çıktılarının imzalarını manifeste yazar."""
+        self.manifest[stage] = {
+            'fingerprint': fingerprint,
+            'outputs': {path: self._output_signature(path) for path in outputs if os.path.exists(path)}
+        }
+        self._write_manifest()
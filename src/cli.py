@@ -0,0 +1,171 @@
+import argparse
+
+#Ağır kütüphaneler (pandas, scikit-learn, tkinter) yalnızca ilgili komut içinde yüklenir
+
+
+def cmd_score(args):
+    from src.batch_scoring import score_fleet
+    score_fleet(
+        model_name=args.model,
+        output_path=args.output,
+        fmt=args.format,
+        batch_size=args.batch_size,
+        min_score=args.min_score,
+        limit=args.limit,
+        backend=args.backend,
+        return_frame=False,
+        workers=args.workers
+    )
+
+
+def cmd_serve(args):
+    from src.scoring_service import run_service
+    run_service(
+        host=args.host,
+        port=args.port,
+        default_model=args.model,
+        max_batch_size=args.max_batch_size,
+        max_latency_ms=args.max_latency_ms,
+        workers=args.workers,
+        backend=args.backend
+    )
+
+
+def cmd_ingest(args):
+    from src.sensor_ingest import SensorIngestor
+    ingestor = SensorIngestor(batch_size=args.batch_size)
+    for path in args.files:
+        stats = ingestor.ingest_file(path)
+        print(f"✅ {path}: {stats['applied']} güncelleme, {stats['created']} yeni makine, "
+              f"{stats['rejected']} reddedilen kayıt ({stats['seconds']:.2f} sn)")
+    if args.compact:
+        ingestor.compact()
+        print(f"🗜️ Günlük depoya yazıldı: {ingestor.manager.store.path}")
+
+
+def cmd_tune(args):
+    from src.model_trainer import ModelTrainer
+    from src.model_tuning import ModelTuner
+    #Arama alanı tüm modelleri kapsar; yaklaşık SVM de ayarlanabilsin
+    tuner = ModelTuner(ModelTrainer(svm_mode="both"), n_candidates=args.candidates, cv=args.cv, factor=args.factor,
+                       n_jobs=args.jobs)
+    report = tuner.tune(args.models, latency_budget_us=args.latency_budget_us)
+    if args.apply:
+        path = tuner.save_best_params(report)
+        print(f"💾 Seçilen parametreler kaydedildi: {path} (bir sonraki eğitimde kullanılır)")
+
+
+def cmd_compare(args):
+    from src.fused_scoring import score_all_models
+    from src.model_registry import get_registry
+    from src.report_export import write_frame
+    models = None
+    if args.models:
+        tasks = ("classification", "regression") if args.regression else ("classification",)
+        models = [key for key in get_registry().discover() if key[0] in tasks and key[1] in args.models]
+    df, _, _, _ = score_all_models(models=models, include_regression=args.regression,
+                                   workers=args.workers, backend=args.backend)
+    if args.limit is not None:
+        df = df.head(args.limit)
+    write_frame(df, args.output)
+    print(f"📄 Karşılaştırma tablosu kaydedildi: {args.output} ({len(df)} satır)")
+
+
+def cmd_scale(args):
+    from src.sharded_scoring import scaling_report
+    scaling_report(
+        model_name=args.model,
+        worker_counts=args.workers,
+        task=args.task,
+        backend=args.backend,
+        shard_rows=args.shard_rows,
+        target_machines=args.target_machines,
+        output_path=args.output
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m src",
+        description="Predictive Maintenance System - GUI gerektirmeyen komutlar"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    score = subparsers.add_parser("score", help="Tüm filoyu skorla ve risk sırasına göre kaydet")
+    score.add_argument("--model", default="xgboost", help="Model adı (ör. random_forest, svm, xgboost)")
+    score.add_argument("--output", default="data/risk_scores.csv", help="Çıktı dosyası")
+    score.add_argument("--format", choices=("csv", "csv.gz", "parquet", "jsonl"), default=None,
+                       help="Çıktı formatı (varsayılan: dosya uzantısından)")
+    score.add_argument("--batch-size", type=int, default=50_000, help="Skorlama parça boyutu")
+    score.add_argument("--min-score", type=float, default=None, help="Yalnızca bu skordan yüksek makineler")
+    score.add_argument("--limit", type=int, default=None, help="En riskli N makine")
+    score.add_argument("--backend", choices=("native", "flat"), default="native",
+                       help="Çıkarım arka ucu: native (joblib modeli) veya flat (düz ağaç tahmincisi)")
+    score.add_argument("--workers", type=int, default=None,
+                       help="Filoyu paylaşılan bellek üzerinde bu kadar süreçte parçalı skorla "
+                            "(varsayılan: tek süreç; küçük filolarda tek sürece düşülür)")
+    score.set_defaults(func=cmd_score)
+
+    serve = subparsers.add_parser("serve", help="Yerel HTTP skorlama servisini başlat")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--model", default="xgboost", help="İstekte model belirtilmezse kullanılacak model")
+    serve.add_argument("--max-batch-size", type=int, default=256, help="Mikro-parti başına en fazla satır")
+    serve.add_argument("--max-latency-ms", type=float, default=5.0,
+                       help="Parti doldurmak için beklenecek en uzun süre (ms)")
+    serve.add_argument("--workers", type=int, default=2, help="Tahmin iş parçacığı sayısı")
+    serve.add_argument("--backend", choices=("native", "flat"), default="native",
+                       help="Çıkarım arka ucu: native (joblib modeli) veya flat (düz ağaç tahmincisi)")
+    serve.set_defaults(func=cmd_serve)
+
+    ingest = subparsers.add_parser("ingest", help="Sensör güncellemelerini (CSV/JSONL/JSON) profillere uygula")
+    ingest.add_argument("files", nargs="+", help="Güncelleme dosyaları (.csv, .jsonl veya nesne listesi içeren .json)")
+    ingest.add_argument("--batch-size", type=int, default=500, help="Parti başına güncelleme sayısı")
+    ingest.add_argument("--compact", action="store_true", help="Sonunda günlüğü sütunlu depoya yaz")
+    ingest.set_defaults(func=cmd_ingest)
+
+    tune = subparsers.add_parser("tune", help="Sınıflandırıcılar için paralel hiperparametre araması")
+    tune.add_argument("--models", nargs="+", default=None,
+                      help="Aranacak modeller (varsayılan: tümü; random_forest, svm, svm_approx, xgboost)")
+    tune.add_argument("--candidates", type=int, default=24, help="Model başına ilk turdaki aday sayısı")
+    tune.add_argument("--cv", type=int, default=3, help="Katlama sayısı")
+    tune.add_argument("--factor", type=int, default=3, help="Her turda adayların kaçta birinin kalacağı")
+    tune.add_argument("--jobs", type=int, default=-1, help="Paralel iş sayısı (-1: tüm çekirdekler)")
+    tune.add_argument("--latency-budget-us", type=float, default=None,
+                      help="Satır başına tahmin süresi bütçesi (µs); en iyi model bu bütçeye uyanlardan seçilir")
+    tune.add_argument("--apply", action="store_true",
+                      help="Seçilen parametreleri kaydet; sonraki eğitim bunları kullanır")
+    tune.set_defaults(func=cmd_tune)
+
+    compare = subparsers.add_parser("compare", help="Filoyu tüm modellerle tek paralel geçişte skorla ve karşılaştır")
+    compare.add_argument("--models", nargs="+", default=None,
+                         help="Karşılaştırılacak modeller (varsayılan: kayıt defterindeki tümü)")
+    compare.add_argument("--regression", action="store_true",
+                         help="Regresyon modellerinin ham tahminlerini de value_* sütunları olarak ekle "
+                              "(risk karşılaştırmasına katılmaz)")
+    compare.add_argument("--workers", type=int, default=None, help="Süreç sayısı (varsayılan: çekirdek ve model sayısının küçüğü)")
+    compare.add_argument("--backend", choices=("native", "flat"), default="native",
+                         help="Çıkarım arka ucu: native (joblib modeli) veya flat (düz ağaç tahmincisi)")
+    compare.add_argument("--output", default="data/model_comparison.csv", help="Çıktı dosyası")
+    compare.add_argument("--limit", type=int, default=None, help="Topluluk skoruna göre en riskli N makine")
+    compare.set_defaults(func=cmd_compare)
+
+    scale = subparsers.add_parser("scale", help="Parçalı skorlamanın süreç sayısına göre hızlanmasını ölç")
+    scale.add_argument("--model", default="xgboost", help="Model adı (ör. random_forest, svm, xgboost)")
+    scale.add_argument("--task", choices=("classification", "regression"), default="classification")
+    scale.add_argument("--workers", type=int, nargs="+", default=None,
+                       help="Denenecek süreç sayıları (varsayılan: 2, 4, ... çekirdek sayısı; taban tek süreç)")
+    scale.add_argument("--backend", choices=("native", "flat"), default="native",
+                       help="Çıkarım arka ucu: native (joblib modeli) veya flat (düz ağaç tahmincisi)")
+    scale.add_argument("--shard-rows", type=int, default=50_000, help="Parça başına en fazla satır")
+    scale.add_argument("--target-machines", type=int, default=1_000_000,
+                       help="Tahmini süresi raporlanacak filo boyutu")
+    scale.add_argument("--output", default="data/scaling_report.json", help="JSON rapor dosyası")
+    scale.set_defaults(func=cmd_scale)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
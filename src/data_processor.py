@@ -1,66 +1,115 @@
-import pandas as pd
+import numpy as np
 import os
+from src.instrumentation import span
 from src.machine_manager import MachineManager
-import shutil  #Dosya işlemleri için
+from src.machine_profile import RAW_FEATURE_NAMES
+from src.quantile_sketch import QuantileSketch
+from src.sensor_history import HISTORY_COLUMNS, SensorHistory
 
-pd.set_option('display.max_columns', None)
-pd.set_option('display.width', 170)
-pd.set_option('display.max_rows', None)
-pd.set_option('display.float_format', lambda x: '%.3f' % x)
+#Veri inceleme çıktısının görünüm ayarları; yalnızca bu çıktı için geçerlidir
+DISPLAY_OPTIONS = (
+    'display.max_columns', None,
+    'display.width', 170,
+    'display.max_rows', None,
+    'display.float_format', lambda x: '%.3f' % x
+)
 
 class DataProcessor:
-    def __init__(self):
-        self.manager = MachineManager()
+    OUTLIER_QUANTILES = (0.05, 0.95)
+    IQR_FACTOR = 1.5
+    PROCESSED_PATH = "data/processed_data.csv"
+    NUM_COLS = ['air_temp', 'process_temp', 'rotational_speed', 'torque', 'tool_wear']
+    COLUMN_MAPPING = {**RAW_FEATURE_NAMES, 'Machine failure': 'failure'}
+    #Akış modunda ham CSV için açık veri tipleri (tip çıkarımı parçalar arasında tutarsız olmasın)
+    RAW_DTYPES = {
+        'UDI': np.int64,
+        'Product ID': str,
+        'Type': str,
+        'Air temperature [K]': np.float64,
+        'Process temperature [K]': np.float64,
+        'Rotational speed [rpm]': np.float64,
+        'Torque [Nm]': np.float64,
+        'Tool wear [min]': np.float64,
+        'Machine failure': np.int8,
+        'TWF': np.int8,
+        'HDF': np.int8,
+        'PWF': np.int8,
+        'OSF': np.int8,
+        'RNF': np.int8
+    }
+
+    def __init__(self, chunksize=None, manager=None):
+        self._manager = manager  #Verilirse GUI ile aynı MachineManager paylaşılır
+        self.chunksize = chunksize  #None: tüm dosya belleğe okunur, sayı: akış modu
         self._initialize_directories()
 
+    @property
+    def manager(self):
+        #Profiller yalnızca gerektiğinde yüklenir (işleme atlanırsa hiç yüklenmez)
+        if self._manager is None:
+            self._manager = MachineManager()
+        return self._manager
+
+    def get_params(self):
+        """İşleme sonucunu etkileyen parametreler (önbellek özeti için)."""
+        return {
+            'outlier_quantiles': self.OUTLIER_QUANTILES,
+            'iqr_factor': self.IQR_FACTOR,
+            'duplicates': 'Product ID/last',
+            #Akış modunda eşikler yaklaşık hesaplandığı için sonuç farklı olabilir
+            'streaming': self.chunksize is not None,
+            #Sensör geçmişi tekrar eden Product ID okumalarından kurulur
+            'history': {'columns': HISTORY_COLUMNS, 'window': SensorHistory.WINDOW}
+        }
+
+    def output_paths(self):
+        #Profil deposu GUI'den de güncellendiği için imzası izlenmez
+        return [self.PROCESSED_PATH]
+
     def _initialize_directories(self):
         required_dirs = ["data", "machine_profiles", "models/trained_models/classification"]
         for directory in required_dirs:
             os.makedirs(directory, exist_ok=True)
 
-    def process_data(self, csv_path="data/ai4i2020.csv"):
+    def process_data(self, csv_path="data/ai4i2020.csv", chunksize=None):
+        chunksize = chunksize or self.chunksize
+        if chunksize:
+            return self.process_data_streaming(csv_path, chunksize)
+        import pandas as pd
         try:
             #Veriyi yükle ve sütun isimlerini standartlaştır
             data = pd.read_csv(csv_path)
 
             #Veri inceleme
-            print("\n" + "=" * 50)
-            print("📊 VERİ İNCELEME")
-            print("=" * 50)
-            print("\n👉 İlk 5 Kayıt:")
-            print(data.head())
-            print("\n📐 Veri Boyutu:", data.shape)
-            print("\nℹ️ Veri Bilgisi:")
-            print(data.info())
+            with pd.option_context(*DISPLAY_OPTIONS):
+                print("\n" + "=" * 50)
+                print("📊 VERİ İNCELEME")
+                print("=" * 50)
+                print("\n👉 İlk 5 Kayıt:")
+                print(data.head())
+                print("\n📐 Veri Boyutu:", data.shape)
+                print("\nℹ️ Veri Bilgisi:")
+                print(data.info())
 
             #Orijinal ve düzenlenmiş sütun isimlerini kontrol et
             print("Orijinal Sütunlar:", data.columns.tolist())
 
-            #Sütun isimlerini temizle (köşeli parantezleri ve boşlukları kaldır)
-            data.columns = [col.replace('[', '').replace(']', '').strip() for col in data.columns]
+            #Sütun isimlerini temizle ve kesinleştir
+            data = self._standardize_columns(data)
             print("Düzenlenmiş Sütunlar:", data.columns.tolist())
 
-            #2. Sütun isimlerini kesinleştir
-            column_mapping = {
-                'Air temperature K': 'air_temp',
-                'Process temperature K': 'process_temp',
-                'Rotational speed rpm': 'rotational_speed',
-                'Torque Nm': 'torque',
-                'Tool wear min': 'tool_wear',
-                'Machine failure': 'failure'
-            }
-            data = data.rename(columns=column_mapping)
-
             #3. AYKIRI DEĞER İŞLEME
             data = self._handle_outliers(data)
 
             #4. Veri doğrulama ve işleme
             self._validate_data(data)
+            self.manager.history.reset()
+            self._record_history(data)
             data = self._handle_duplicates(data)
             self._create_machine_profiles(data)
 
             #İŞLENMİŞ VERİYİ KAYDET (YENİ DOSYA)
-            processed_path = "data/processed_data.csv"
+            processed_path = self.PROCESSED_PATH
             data.to_csv(processed_path, index=False)
             print(f"✅ İşlenmiş veri kaydedildi: {processed_path}")
             return data  #İşlenmiş veriyi döndür
@@ -69,6 +118,91 @@ class DataProcessor:
             print(f"🔴 Kritik Hata: Veri işleme başarısız: {str(e)}")
             raise
 
+    def process_data_streaming(self, csv_path, chunksize=100_000):
+        """Büyük CSV dosyalarını sabit boyutlu parçalar halinde iki geçişte işler.
+
+        1. geçiş: aykırı değer eşikleri için kantil özetleri güncellenir ve her
+        Product ID'nin son göründüğü satır kaydedilir (keep='last').
+        2. geçiş: değerler kırpılır, her makinenin yalnızca son kaydı tutulur ve
+        çıktı parça parça diske yazılır.
+        Tepe bellek girdi satır sayısına değil, parça boyutuna ve benzersiz
+        makine sayısına bağlıdır; dosyanın tamamı hiçbir zaman belleğe alınmaz.
+        """
+        try:
+            print("\n" + "=" * 50)
+            print(f"📊 AKIŞ MODUNDA VERİ İŞLEME (parça boyutu: {chunksize})")
+            print("=" * 50)
+
+            #1. geçiş: kantil özetleri ve son satır indeksleri
+            sketches = {col: QuantileSketch() for col in self.NUM_COLS}
+            last_row = {}
+            total_rows = 0
+            with span("process.stream_scan") as trace:
+                for chunk in self._read_chunks(csv_path, chunksize):
+                    if total_rows == 0:
+                        self._validate_data(chunk)
+                    for col in self.NUM_COLS:
+                        sketches[col].update(chunk[col].to_numpy())
+                    last_row.update(zip(chunk['Product ID'].tolist(), range(total_rows, total_rows + len(chunk))))
+                    total_rows += len(chunk)
+                trace.set(rows=total_rows)
+            print(f"📐 Toplam satır: {total_rows}, benzersiz makine: {len(last_row)}")
+
+            q1, q3 = self.OUTLIER_QUANTILES
+            thresholds = {}
+            for col, sketch in sketches.items():
+                low, high = sketch.quantile(q1), sketch.quantile(q3)
+                iqr = high - low
+                thresholds[col] = (low - self.IQR_FACTOR * iqr, high + self.IQR_FACTOR * iqr)
+
+            #2. geçiş: kırpma, tekrar eleme ve parça parça yazma
+            processed_path = self.PROCESSED_PATH
+            tmp_path = f"{processed_path}.tmp"
+            outlier_counts = dict.fromkeys(self.NUM_COLS, 0)
+            profile_parts = []
+            offset = 0
+            written = 0
+            self.manager.history.reset()
+            with span("process.stream_clip_dedup", rows=total_rows) as trace:
+                for chunk in self._read_chunks(csv_path, chunksize):
+                    positions = np.arange(offset, offset + len(chunk))
+                    offset += len(chunk)
+                    for col, (low, high) in thresholds.items():
+                        outlier_counts[col] += int(((chunk[col] < low) | (chunk[col] > high)).sum())
+                        chunk[col] = chunk[col].clip(lower=low, upper=high)
+                    self._record_history(chunk)
+                    keep = chunk['Product ID'].map(last_row).to_numpy() == positions
+                    chunk = chunk[keep]
+                    chunk.to_csv(tmp_path, mode="w" if written == 0 else "a", header=written == 0, index=False)
+                    written += len(chunk)
+                    profile_parts.append(chunk[['Product ID', 'Type'] + self.NUM_COLS + ['failure']])
+                trace.set(rows_out=written)
+            os.replace(tmp_path, processed_path)
+
+            print("\n🔍 AYKIRI DEĞER ANALİZİ")
+            for col, (low, high) in thresholds.items():
+                print(f"{col}: [{low:.2f}, {high:.2f}] aralığı dışında {outlier_counts[col]} aykırı değer")
+
+            #Profiller makine başına bir satır olduğundan girdi boyutundan bağımsızdır
+            import pandas as pd
+            self._create_machine_profiles(pd.concat(profile_parts, ignore_index=True))
+            print(f"✅ İşlenmiş veri kaydedildi: {processed_path} ({written} satır)")
+            return {'rows_in': total_rows, 'rows_out': written, 'thresholds': thresholds}
+
+        except Exception as e:
+            print(f"🔴 Kritik Hata: Veri işleme başarısız: {str(e)}")
+            raise
+
+    def _read_chunks(self, csv_path, chunksize):
+        import pandas as pd
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize, dtype=self.RAW_DTYPES):
+            yield self._standardize_columns(chunk)
+
+    def _standardize_columns(self, data):
+        #Sütun isimlerini temizle (köşeli parantezleri ve boşlukları kaldır)
+        data.columns = [col.replace('[', '').replace(']', '').strip() for col in data.columns]
+        return data.rename(columns=self.COLUMN_MAPPING)
+
     def _validate_data(self, data):
         #sütun isimlerini kontrol et
         required_columns = [
@@ -91,44 +225,39 @@ class DataProcessor:
         print("=" * 50)
 
         #Sayısal sütunları seç (kategorik olan 'Type' ve 'Product ID' hariç)
-        num_cols = ['air_temp', 'process_temp', 'rotational_speed', 'torque', 'tool_wear']
-
-        for col in num_cols:
-            low, high = self._outlier_thresholds(data, col)
-            print(
-                f"{col}: [{low:.2f}, {high:.2f}] aralığı dışında {sum((data[col] < low) | (data[col] > high))} aykırı değer")
-            data[col] = data[col].clip(lower=low, upper=high)
+        with span("process.outlier_clip", rows=len(data)):
+            for col in self.NUM_COLS:
+                low, high = self._outlier_thresholds(data, col)
+                print(
+                    f"{col}: [{low:.2f}, {high:.2f}] aralığı dışında {sum((data[col] < low) | (data[col] > high))} aykırı değer")
+                data[col] = data[col].clip(lower=low, upper=high)
 
         return data
 
-    def _outlier_thresholds(self, dataframe, col_name, q1=0.05, q3=0.95):
+    def _outlier_thresholds(self, dataframe, col_name, q1=OUTLIER_QUANTILES[0], q3=OUTLIER_QUANTILES[1]):
         quartile1 = dataframe[col_name].quantile(q1)
         quartile3 = dataframe[col_name].quantile(q3)
         iqr = quartile3 - quartile1
-        up_limit = quartile3 + 1.5 * iqr
-        low_limit = quartile1 - 1.5 * iqr
+        up_limit = quartile3 + self.IQR_FACTOR * iqr
+        low_limit = quartile1 - self.IQR_FACTOR * iqr
         return low_limit, up_limit
 
+    def _record_history(self, data):
+        """Tekrarlardan önce, her Product ID okumasını dosya sırasıyla sensör geçmişine ekler."""
+        with span("process.history", rows=len(data)):
+            history = self.manager.history
+            history.extend(data['Product ID'].tolist(), data[HISTORY_COLUMNS].to_numpy())
+            history.flush()
+
     def _handle_duplicates(self, data):
-        return data.drop_duplicates(subset=['Product ID'], keep='last') #aynı IDye sahip olanlardan sonuncusunu tut
+        with span("process.deduplicate", rows=len(data)) as trace:
+            data = data.drop_duplicates(subset=['Product ID'], keep='last') #aynı IDye sahip olanlardan sonuncusunu tut
+            trace.set(rows_out=len(data))
+        return data
 
     def _create_machine_profiles(self, data):
-        #Eski verileri temizle
-        self.manager.machines.clear()
-
-        #Klasörü yeniden oluştur
-        profiles_dir = "machine_profiles"
-        if os.path.exists(profiles_dir):
-            shutil.rmtree(profiles_dir)
-        os.makedirs(profiles_dir, exist_ok=True)
-
-        #Yeni verileri işle
-        for _, row in data.iterrows():
-            try:
-                self.manager.create_machine(
-                    machine_id=row['Product ID'],
-                    machine_type=row['Type'],
-                    features=row.to_dict()
-                )
-            except Exception as e:
-                print(f"⚠️ Hata: {str(e)}")
\ No newline at end of file
+        #Profiller satır satır değil, sütunlardan tek geçişte oluşturulur
+        columns = self.manager.store.columns_from_frame(data)
+        changed = self.manager.replace_profiles(columns)
+        print(f"✅ {len(self.manager.machines)} makine profili hazır ({changed} yeni/değişen): "
+              f"{self.manager.store.path}")
\ No newline at end of file
@@ -0,0 +1,236 @@
+from collections.abc import MutableMapping
+import json
+import os
+import numpy as np
+from src.machine_profile import FEATURE_COLUMNS
+
+FEATURE_KEYS = FEATURE_COLUMNS + ['failure']
+
+
+def _to_datetimes(values):
+    """'YYYY-MM-DD HH:MM:SS' metinlerini datetime64[s] dizisine çevirir (boş metin -> NaT)."""
+    return np.array(values, dtype='datetime64[s]')
+
+
+def _to_strings(values):
+    """datetime64[s] dizisini 'YYYY-MM-DD HH:MM:SS' metinlerine çevirir."""
+    strings = np.char.replace(np.datetime_as_string(values, unit='s'), 'T', ' ')
+    return np.where(np.isnat(values), '', strings)
+
+
+class FeatureView(MutableMapping):
+    """Bir makinenin özelliklerine FleetTable dizileri üzerinden sözlük gibi erişim."""
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key):
+        if key == 'failure':
+            return int(self._table._failure[self._row])
+        return float(self._table._features[self._row, FEATURE_COLUMNS.index(key)])
+
+    def __setitem__(self, key, value):
+        if key == 'failure':
+            self._table._failure[self._row] = int(value)
+        elif key in FEATURE_COLUMNS:
+            self._table._features[self._row, FEATURE_COLUMNS.index(key)] = float(value)
+        else:
+            raise KeyError(key)
+
+    def __delitem__(self, key):
+        raise TypeError("Makine özellikleri silinemez")
+
+    def __iter__(self):
+        return iter(FEATURE_KEYS)
+
+    def __len__(self):
+        return len(FEATURE_KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class MachineView:
+    """FleetTable içindeki tek bir makineye MachineProfile ile aynı arayüzle erişim.
+
+    Kendi verisini tutmaz; yalnızca tablo ve satır numarasını saklar.
+    """
+
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    @property
+    def machine_id(self):
+        return self._table.machine_ids[self._row]
+
+    @property
+    def machine_type(self):
+        return self._table.machine_types[self._row]
+
+    @machine_type.setter
+    def machine_type(self, value):
+        self._table.machine_types[self._row] = value
+
+    @property
+    def features(self):
+        return FeatureView(self._table, self._row)
+
+    @property
+    def created_at(self):
+        return str(_to_strings(self._table._created_at[self._row:self._row + 1])[0])
+
+    @created_at.setter
+    def created_at(self, value):
+        self._table._created_at[self._row] = np.datetime64(value or 'NaT', 's')
+
+    @property
+    def last_updated(self):
+        return str(_to_strings(self._table._last_updated[self._row:self._row + 1])[0])
+
+    @last_updated.setter
+    def last_updated(self, value):
+        self._table._last_updated[self._row] = np.datetime64(value or 'NaT', 's')
+
+    def to_dict(self):
+        return {
+            'machine_id': self.machine_id,
+            'machine_type': self.machine_type,
+            'features': dict(self.features),
+            'created_at': self.created_at,
+            'last_updated': self.last_updated
+        }
+
+    def save_to_file(self, directory="machine_profiles"):
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{directory}/{self.machine_id}.json", "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    def __repr__(self):
+        return f"MachineView({self.machine_id!r}, row={self._row})"
+
+
+class FleetTable(MutableMapping):
+    """machine_id -> makine eşlemesi; veriler tip belirli, bitişik dizilerde tutulur.
+
+    Sensör değerleri tek bir (n, 5) float64 matriste, arıza bilgisi int8,
+    zaman damgaları datetime64[s] olarak saklanır. Erişimde MachineView nesneleri
+    üretilir; böylece bellek kullanımı ham veri boyutuyla orantılı kalır.
+    Silme işlemi son satırı silinen satırın yerine taşır; o makineye ait eski
+    görünümler geçersiz olur.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.machine_ids = []
+        self.machine_types = []
+        self.row_index = {}
+        self._features = np.empty((0, len(FEATURE_COLUMNS)), dtype=np.float64)
+        self._failure = np.empty(0, dtype=np.int8)
+        self._created_at = np.empty(0, dtype='datetime64[s]')
+        self._last_updated = np.empty(0, dtype='datetime64[s]')
+
+    def _reserve(self, capacity):
+        if capacity <= len(self._failure):
+            return
+        capacity = max(capacity, 2 * len(self._failure), 16)
+        size = len(self.machine_ids)
+        features = np.empty((capacity, len(FEATURE_COLUMNS)), dtype=np.float64)
+        features[:size] = self._features[:size]
+        self._features = features
+        for name in ('_failure', '_created_at', '_last_updated'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:size] = old[:size]
+            setattr(self, name, new)
+
+    # ---------------------- Mapping arayüzü ----------------------
+
+    def __len__(self):
+        return len(self.machine_ids)
+
+    def __iter__(self):
+        return iter(self.machine_ids)
+
+    def __contains__(self, machine_id):
+        return machine_id in self.row_index
+
+    def __getitem__(self, machine_id):
+        return MachineView(self, self.row_index[machine_id])
+
+    def __setitem__(self, machine_id, machine):
+        row = self.row_index.get(machine_id)
+        if isinstance(machine, MachineView) and machine._table is self and machine._row == row:
+            return
+        if row is None:
+            row = len(self.machine_ids)
+            self._reserve(row + 1)
+            self.machine_ids.append(machine_id)
+            self.machine_types.append(machine.machine_type)
+            self.row_index[machine_id] = row
+        view = MachineView(self, row)
+        view.machine_type = machine.machine_type
+        features = machine.features
+        self._features[row] = [features[col] for col in FEATURE_COLUMNS]
+        self._failure[row] = features['failure']
+        view.created_at = machine.created_at
+        view.last_updated = machine.last_updated
+
+    def __delitem__(self, machine_id):
+        row = self.row_index.pop(machine_id)
+        last = len(self.machine_ids) - 1
+        if row != last:
+            moved_id = self.machine_ids[last]
+            self.machine_ids[row] = moved_id
+            self.machine_types[row] = self.machine_types[last]
+            self.row_index[moved_id] = row
+            for array in (self._features, self._failure, self._created_at, self._last_updated):
+                array[row] = array[last]
+        self.machine_ids.pop()
+        self.machine_types.pop()
+
+    # ---------------------- Toplu erişim ----------------------
+
+    def feature_matrix(self):
+        """(n, 5) sensör matrisini kopyalamadan döndürür."""
+        return self._features[:len(self.machine_ids)]
+
+    def failure_array(self):
+        return self._failure[:len(self.machine_ids)]
+
+    def type_array(self):
+        return np.array(self.machine_types, dtype=str)
+
+    def load_columns(self, columns):
+        """ProfileStore sütunlarını satır satır nesne oluşturmadan tabloya yükler."""
+        self.clear()
+        size = len(columns['machine_id'])
+        self._reserve(size)
+        self.machine_ids = columns['machine_id'].tolist()
+        self.machine_types = columns['machine_type'].tolist()
+        self.row_index = {machine_id: row for row, machine_id in enumerate(self.machine_ids)}
+        self._features[:size] = np.column_stack([columns[col] for col in FEATURE_COLUMNS]) if size else 0
+        self._failure[:size] = columns['failure']
+        self._created_at[:size] = _to_datetimes(columns['created_at'])
+        self._last_updated[:size] = _to_datetimes(columns['last_updated'])
+
+    def to_columns(self):
+        """Tabloyu ProfileStore sütun formatına çevirir."""
+        size = len(self.machine_ids)
+        columns = {
+            'machine_id': np.array(self.machine_ids, dtype=str),
+            'machine_type': np.array(self.machine_types, dtype=str),
+            'failure': self._failure[:size].copy(),
+            'created_at': _to_strings(self._created_at[:size]),
+            'last_updated': _to_strings(self._last_updated[:size])
+        }
+        for i, col in enumerate(FEATURE_COLUMNS):
+            columns[col] = self._features[:size, i].copy()
+        return columns
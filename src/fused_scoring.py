@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from src.machine_manager import MachineManager
+from src.model_registry import ModelRegistry, get_registry
+from src.scoring_engine import ScoringEngine, predict_risk, predict_values, risk_levels
+
+
+def column_name(task, name):
+    """Karşılaştırma tablosundaki model sütun adı (regresyon modelleri '_reg' ekiyle)."""
+    return name if task == "classification" else f"{name}_reg"
+
+
+def _score(model, task, features, threads):
+    """Modeli filonun tamamıyla skorlar.
+
+    Sınıflandırıcılar arıza olasılığı, regresyon modelleri kendi biriminde
+    (ör. takım aşınması, dakika) ham tahmin döndürür; ikisi karıştırılmaz.
+    """
+    from threadpoolctl import threadpool_limits
+    start = time.perf_counter()
+    with threadpool_limits(limits=threads):
+        if task == "classification":
+            scores = predict_risk(model, features)
+        else:
+            scores = predict_values(model, features)
+    return np.asarray(scores, dtype=np.float64), time.perf_counter() - start
+
+
+def _score_in_worker(base_dir, task, name, backend, features_path, threads):
+    """Havuz sürecinde modeli yükleyip skorlar; özellik matrisi bellek eşlemeli açılır."""
+    features = np.load(features_path, mmap_mode='r')
+    model = ModelRegistry(base_dir).get(name, task, backend=backend)
+    return (task, name, *_score(model, task, features, threads))
+
+
+def _ranks(scores):
+    """En riskli makine 1 olacak şekilde sıra numaraları."""
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[np.argsort(-scores, kind='stable')] = np.arange(1, len(scores) + 1)
+    return ranks
+
+
+def score_all_models(models=None, include_regression=False, workers=None, backend=None,
+                     manager=None, registry=None, engine=None, verbose=True):
+    """Filoyu tüm modellerle tek bir paralel geçişte skorlar ve karşılaştırma tablosu üretir.
+
+    Özellik matrisi (sensör geçmişi özellikleriyle) bir kez kurulur ve geçici
+    bir .npy dosyasına yazılır; her model ayrı bir süreçte bu dosyayı bellek
+    eşlemeli açıp skorlar. Tablo,
+    model başına skor ve sıra sütunlarını, sınıflandırıcıların ortalaması olan
+    topluluk (ensemble) skorunu, modellerin risk seviyesinde topluluğa ne kadar
+    uyduğunu (agreement) ve her modelin sırasının topluluk sırasından farkını
+    (rank_delta_*, pozitif: model makineyi daha az riskli görüyor) içerir.
+    Regresyon modelleri risk tahmini yapmadığından bu hesaplara katılmaz;
+    include_regression=True ise ham tahminleri ayrı value_* sütunlarında yer alır.
+
+    models: (task, name) listesi; verilmezse kayıt defterindeki sınıflandırıcılar
+        (include_regression=True ise regresyon modelleri de)
+    engine: verilirse onun özellik matrisi kullanılır (GUI'nin skorlama motoru)
+    Sonuç DataFrame'i (topluluk skoruna göre sıralı), model başına ham skorlar
+    {(task, name): dizi}, skorların veri sürümü ve istatistikleri döndürür.
+    """
+    start = time.perf_counter()
+    registry = registry or get_registry()
+    engine = engine or ScoringEngine(manager or MachineManager())
+    engine.sync()
+    version = engine.manager.version
+    if models is None:
+        models = [key for key in registry.discover() if include_regression or key[0] == "classification"]
+    models = list(models)
+    if not any(task == "classification" for task, _ in models):
+        raise FileNotFoundError("Karşılaştırılacak sınıflandırıcı bulunamadı; önce modelleri eğitin")
+
+    n_cores = os.cpu_count() or 1
+    workers = max(1, min(workers or n_cores, len(models)))
+    threads = max(1, n_cores // workers)  #Süreç başına iş parçacığı bütçesi
+    results = {}
+    model_seconds = {}
+    score_start = time.perf_counter()
+    if workers == 1:
+        outputs = []
+        for task, name in models:
+            model = registry.get(name, task, backend=backend)
+            outputs.append((task, name, *_score(model, task, engine.inputs(model), threads)))
+    else:
+        with tempfile.TemporaryDirectory(prefix="pm_fused_") as tmp_dir:
+            features_path = os.path.join(tmp_dir, "features.npy")
+            #Geniş matris: temel modeller ilk beş sütunu, geçmişle eğitilenler tümünü kullanır
+            np.save(features_path, engine.full_inputs())
+            jobs = [(registry.base_dir, task, name, backend, features_path, threads) for task, name in models]
+            #spawn: GUI'nin iş parçacıkları varken fork güvenli değil
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                outputs = list(pool.map(_score_in_worker, *zip(*jobs)))
+    for task, name, scores, seconds in outputs:
+        results[(task, name)] = scores
+        model_seconds[column_name(task, name)] = seconds
+    score_seconds = time.perf_counter() - score_start
+
+    df = compare_scores(engine, results)
+    stats = {
+        'models': [name for task, name in models if task == "classification"],
+        'value_models': [column_name(task, name) for task, name in models if task != "classification"],
+        'machines': len(engine.features),
+        'workers': workers,
+        'score_seconds': score_seconds,
+        'model_seconds': model_seconds,
+        'total_seconds': time.perf_counter() - start
+    }
+    if verbose:
+        print(f"✅ {stats['machines']} makine {len(models)} modelle {workers} süreçte skorlandı: "
+              f"{score_seconds:.2f} sn (modellerin toplamı {sum(model_seconds.values()):.2f} sn)")
+    return df, results, version, stats
+
+
+def compare_scores(engine, results):
+    """Sınıflandırıcı skorlarından topluluk skoru, uyum ve sıra farkları içeren tablo üretir.
+
+    Regresyon sonuçları (risk değil) yalnızca ham value_* sütunları olarak eklenir.
+    """
+    columns = {name: scores for (task, name), scores in results.items() if task == "classification"}
+    values = {column_name(task, name): scores for (task, name), scores in results.items()
+              if task != "classification"}
+    if not columns:
+        raise ValueError("Karşılaştırma için en az bir sınıflandırıcı gerekir")
+    matrix = np.column_stack(list(columns.values()))
+    ensemble = matrix.mean(axis=1)
+
+    levels = risk_levels(ensemble)
+    agreement = np.mean([risk_levels(scores) == levels for scores in columns.values()], axis=0)
+    ensemble_ranks = _ranks(ensemble)
+
+    order = np.argsort(-ensemble, kind='stable')
+    df = engine.frame(order, ensemble).rename(columns={'risk_score': 'ensemble_score'})
+    df.insert(0, 'rank', ensemble_ranks[order])
+    df['risk_level'] = levels[order]
+    df['agreement'] = agreement[order]
+    df['score_spread'] = (matrix.max(axis=1) - matrix.min(axis=1))[order]
+    deltas = []
+    for name, scores in columns.items():
+        df[f'score_{name}'] = scores[order]
+        ranks = _ranks(scores)
+        df[f'rank_{name}'] = ranks[order]
+        delta = ranks - ensemble_ranks
+        df[f'rank_delta_{name}'] = delta[order]
+        deltas.append(np.abs(delta))
+    df['max_rank_delta'] = np.max(deltas, axis=0)[order]
+    for name, predictions in values.items():
+        df[f'value_{name}'] = predictions[order]
+    return df
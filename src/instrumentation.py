@@ -0,0 +1,199 @@
+"""Hafif ölçüm katmanı: aşama süreleri, satır sayıları ve bellek farkları.
+
+PM_TRACE=1 ortam değişkeniyle açılır; kapalıyken span() paylaşılan boş bir
+bağlam yöneticisi döndürür ve traced() fonksiyonu hiç sarmaz (maliyet ~sıfır).
+
+    PM_TRACE=1                   ölçümü aç
+    PM_TRACE_FILE=iz.json        çıkışta yazılacak iz dosyası (varsayılan: pm_trace.json)
+    PM_PROFILE=profil.prof       ayrıca cProfile çıktısı üret
+
+İz dosyası Chrome trace formatındadır (chrome://tracing veya Perfetto ile açılır)
+ve aşama bazında özet içerir.
+"""
+import atexit
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+ENABLED = os.environ.get("PM_TRACE", "") not in ("", "0")
+TRACE_FILE = os.environ.get("PM_TRACE_FILE", "pm_trace.json")
+PROFILE_FILE = os.environ.get("PM_PROFILE")
+
+_events = []
+_lock = threading.Lock()
+_local = threading.local()
+_origin = time.perf_counter()
+_profiler = None
+_page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _current_rss():
+    """Sürecin anlık bellek kullanımı (bayt). Desteklenmeyen platformlarda None."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _page_size
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ('name', 'attrs', 'start', 'rss_start', 'parent')
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        """Aşama çalışırken ek bilgi (ör. rows=...) ekler."""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.rss_start = _current_rss()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        _local.stack.pop()
+        rss_end = _current_rss()
+        memory_delta = rss_end - self.rss_start if rss_end is not None and self.rss_start is not None else None
+        _record(self.name, self.start, end - self.start, self.parent, memory_delta,
+                error=exc_type.__name__ if exc_type else None, **self.attrs)
+        return False
+
+
+def _record(name, start, duration, parent=None, memory_delta=None, **attrs):
+    event = {
+        'name': name,
+        'start': start - _origin,
+        'duration': duration,
+        'parent': parent,
+        'memory_delta': memory_delta,
+        'thread': threading.current_thread().name,
+        **{key: value for key, value in attrs.items() if value is not None}
+    }
+    with _lock:
+        _events.append(event)
+
+
+def span(name, **attrs):
+    """Bir aşamayı ölçen bağlam yöneticisi: `with span("process.outliers", rows=n): ...`"""
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+
+def record(name, duration, **attrs):
+    """Başka bir süreçte ölçülmüş bir süreyi (ör. paralel eğitim) ize ekler."""
+    if ENABLED:
+        _record(name, time.perf_counter() - duration, duration, **attrs)
+
+
+def traced(name=None):
+    """Fonksiyonu bir span ile saran dekoratör. Ölçüm kapalıysa fonksiyon olduğu gibi döner."""
+    def decorator(fn):
+        if not ENABLED:
+            return fn
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(span_name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def events():
+    with _lock:
+        return list(_events)
+
+
+def summary():
+    """Aşama adına göre toplam/ortalama/en uzun süre ve satır sayıları."""
+    stats = {}
+    for event in events():
+        entry = stats.setdefault(event['name'], {'count': 0, 'total': 0.0, 'max': 0.0, 'rows': 0})
+        entry['count'] += 1
+        entry['total'] += event['duration']
+        entry['max'] = max(entry['max'], event['duration'])
+        entry['rows'] += event.get('rows', 0) or 0
+    for entry in stats.values():
+        entry['mean'] = entry['total'] / entry['count']
+    return stats
+
+
+def dump(path=None):
+    """İzi Chrome trace formatında JSON olarak yazar."""
+    path = path or TRACE_FILE
+    trace_events = []
+    for event in events():
+        args = {key: value for key, value in event.items() if key not in ('name', 'start', 'duration', 'thread')}
+        trace_events.append({
+            'name': event['name'],
+            'ph': 'X',
+            'ts': event['start'] * 1e6,
+            'dur': event['duration'] * 1e6,
+            'pid': os.getpid(),
+            'tid': event['thread'],
+            'args': args
+        })
+    with open(path, "w") as f:
+        json.dump({'traceEvents': trace_events, 'summary': summary()}, f, indent=2, default=str)
+    return path
+
+
+def print_summary(stream=None):
+    stream = stream or sys.stderr
+    stats = summary()
+    if not stats:
+        return
+    print("\n⏱️ ÖLÇÜM ÖZETİ", file=stream)
+    print(f"{'Aşama':<32}{'Adet':>6}{'Toplam (ms)':>14}{'Ort. (ms)':>12}{'En uzun (ms)':>14}{'Satır':>12}",
+          file=stream)
+    for name, entry in sorted(stats.items(), key=lambda item: -item[1]['total']):
+        print(f"{name:<32}{entry['count']:>6}{entry['total'] * 1000:>14.1f}{entry['mean'] * 1000:>12.1f}"
+              f"{entry['max'] * 1000:>14.1f}{entry['rows']:>12}", file=stream)
+
+
+def _finish():
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(PROFILE_FILE)
+        print(f"📈 cProfile çıktısı: {PROFILE_FILE}", file=sys.stderr)
+    if ENABLED and _events:
+        print_summary()
+        print(f"📝 İz dosyası: {dump()}", file=sys.stderr)
+
+
+if PROFILE_FILE:
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+if ENABLED or PROFILE_FILE:
+    atexit.register(_finish)
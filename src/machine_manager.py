@@ -1,30 +1,259 @@
-import os
-import json
+import threading
+from datetime import datetime
+from src.fleet_table import FleetTable, FEATURE_KEYS
+from src.instrumentation import span
 from src.machine_profile import MachineProfile
+from src.profile_journal import ProfileJournal, PROFILE_JOURNAL_PATH
+from src.profile_store import ProfileStore, PROFILE_STORE_PATH, PROFILES_DIR
+from src.search_index import SearchIndex
+from src.sensor_history import HISTORY_COLUMNS, HISTORY_INDEX, SensorHistory
+
 
 class MachineManager:
-    def __init__(self):
-        self.machines = {}
+    COMPACT_AFTER = 50_000  #Günlük bu kadar kaydı aşınca depo yeniden yazılır
+
+    def __init__(self, store_path=PROFILE_STORE_PATH, profiles_dir=PROFILES_DIR,
+                 journal_path=PROFILE_JOURNAL_PATH):
+        self.machines = FleetTable()  #machine_id -> MachineView (dizi tabanlı)
+        self.store = ProfileStore(store_path)
+        self.journal = ProfileJournal(journal_path)
+        self.profiles_dir = profiles_dir
+        self.version = 0  #Her değişiklikte artan veri sürümü
+        self._structure_version = 0  #Makine kümesinin son değiştiği sürüm
+        self._changed_at = {}  #machine_id -> son değiştiği sürüm
+        self._search_index = None
+        self._search_version = -1  #Arama indeksinin kurulduğu yapısal sürüm
+        self._history = None
+        #Filo dizilerini değiştiren işlemler bu kilidi tutar; skorlama motoru anlık kopyayı
+        #kilit altında alır (GUI'de düzenlemeler ana, skorlama arka plan iş parçacığındadır)
+        self.lock = threading.RLock()
         self.load_profiles()
 
     def load_profiles(self):
-        if not os.path.exists("machine_profiles"):
-            return
-        for filename in os.listdir("machine_profiles"):
-            if filename.endswith(".json"):
-                with open(f"machine_profiles/{filename}", "r") as f:
-                    data = json.load(f)
-                    machine = MachineProfile(
-                        data['machine_id'],
-                        data['machine_type'],
-                        data['features']
-                    )
-                    self.machines[machine.machine_id] = machine
-
-    def create_machine(self, machine_id, machine_type, features):
+        with span("profiles.load") as trace:
+            columns = self.store.load()
+            if columns is None:
+                #Sütunlu depo henüz yoksa JSON klasöründen bir kez içe aktar
+                columns = self.store.import_json_directory(self.profiles_dir)
+                if columns is None:
+                    return
+                self._write_store(columns)
+            self._load_columns(columns)
+            #Depoya henüz yazılmamış güncellemeleri uygula
+            for record in self.journal.replay():
+                self._apply_record(record)
+            trace.set(rows=len(self.machines), journal_entries=self.journal.entries)
+
+    def _load_columns(self, columns):
+        #Sütunlar doğrudan tablo dizilerine kopyalanır, makine başına nesne oluşturulmaz
+        with self.lock:
+            self.machines.load_columns(columns)
+            self.mark_changed()
+
+    def clear(self):
+        with self.lock:
+            self.machines.clear()
+            self.mark_changed()
+
+    def mark_changed(self, machine_id=None):
+        """Veri sürümünü artırır. machine_id verilmezse tüm filo değişmiş sayılır."""
+        self.version += 1
+        if machine_id is None:
+            self._structure_version = self.version
+            self._changed_at.clear()
+        else:
+            self._changed_at[machine_id] = self.version
+
+    def changed_since(self, version):
+        """Verilen sürümden sonra değişen makineleri döndürür.
+
+        Makine eklenip silindiyse (yapısal değişiklik) None döner; bu durumda
+        tüm filonun yeniden işlenmesi gerekir.
+        """
+        if version < self._structure_version:
+            return None
+        #list() kopyası: GUI skorlaması arka planda çalışırken sözlük değişebilir
+        return [machine_id for machine_id, changed in list(self._changed_at.items()) if changed > version]
+
+    @property
+    def history(self):
+        """Makine başına sensör geçmişi (ilk erişimde diskten bellek eşlemeli açılır)."""
+        if self._history is None:
+            self._history = SensorHistory()
+        return self._history
+
+    def record_history(self, machine_ids):
+        """Makinelerin güncel tool_wear/torque değerlerini geçmişe yeni okuma olarak ekler."""
+        history = self.history
+        features = self.machines.feature_matrix()
+        for machine_id in machine_ids:
+            history.append(machine_id, features[self.machines.row_index[machine_id], HISTORY_INDEX])
+        history.flush()
+
+    @property
+    def search_index(self):
+        """Makine kimlikleri için arama indeksi; makine kümesi değiştiyse yeniden kurulur."""
+        if self._search_version != self._structure_version:
+            self._search_index = SearchIndex(self.machines.machine_ids)
+            self._search_version = self._structure_version
+        return self._search_index
+
+    def search(self, query):
+        """Sorguyu içeren makine kimliklerini sıralı olarak döndürür."""
+        return self.search_index.matches(query)
+
+    def create_machine(self, machine_id, machine_type, features, persist=True):
         if machine_id in self.machines:
             print(f"⚠️ Uyarı: {machine_id} zaten var! Üzerine yazılıyor...")
-        new_machine = MachineProfile(machine_id, machine_type, features)
-        self.machines[machine_id] = new_machine
-        new_machine.save_to_file()
-        return new_machine
\ No newline at end of file
+        is_new = machine_id not in self.machines
+        with self.lock:
+            self.machines[machine_id] = MachineProfile(machine_id, machine_type, features)
+            self.mark_changed(None if is_new else machine_id)
+        if persist:
+            self.save_profiles()
+        return self.machines[machine_id]
+
+    def save_machine(self, machine):
+        """Tek bir makinedeki değişikliği günlüğe ekler (tüm depo yeniden yazılmaz)."""
+        with self.lock:
+            is_new = machine.machine_id not in self.machines
+            self.machines[machine.machine_id] = machine
+            self.journal.append([{
+                'machine_id': machine.machine_id,
+                'machine_type': machine.machine_type,
+                'features': dict(machine.features),
+                'timestamp': machine.last_updated
+            }])
+            self.record_history([machine.machine_id])
+            self.mark_changed(None if is_new else machine.machine_id)
+        self._compact_if_needed()
+
+    def apply_updates(self, updates):
+        """Makine başına kısmi sensör güncellemelerini yerinde uygular.
+
+        Her güncelleme machine_id ve değişen özellikleri içeren bir sözlüktür;
+        isteğe bağlı 'timestamp' (YYYY-MM-DD HH:MM:SS) ve yeni makineler için
+        'machine_type' alanı içerebilir. Kayıtlar önce günlüğe yazılır, sonra
+        yalnızca ilgili makineler güncellenip yeniden skorlama için işaretlenir.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        records = []
+        rejected = 0
+        for update in updates:
+            try:
+                record = self._parse_update(update, now)
+            except (KeyError, TypeError, ValueError):
+                record = None
+            if record is None:
+                rejected += 1
+            else:
+                records.append(record)
+
+        self.journal.append(records)
+        created = 0
+        history_ids = []
+        history_values = []
+        with self.lock:
+            for record in records:
+                created += self._apply_record(record)
+                #Aynı partideki okumalar sırayla, her biri kendi değeriyle geçmişe eklenir
+                reading = self._history_reading(record)
+                if reading is not None:
+                    history_ids.append(record['machine_id'])
+                    history_values.append(reading)
+            if history_ids:
+                self.history.extend(history_ids, history_values)
+                self.history.flush()
+        self._compact_if_needed()
+        return {'applied': len(records) - created, 'created': created, 'rejected': rejected}
+
+    def _history_reading(self, record):
+        """Kaydın geçmiş okuması (HISTORY_COLUMNS sırasıyla); tool_wear/torque içermiyorsa None.
+
+        Kayıtta olmayan sütun için makinenin o anki değeri kullanılır. Günlük
+        tekrarında çağrılmaz; tekrarlanan kayıtlar geçmişe yeniden eklenmez.
+        """
+        features = record['features']
+        if record['machine_id'] not in self.machines or not any(col in features for col in HISTORY_COLUMNS):
+            return None
+        current = self.machines[record['machine_id']].features
+        return [features[col] if col in features else current[col] for col in HISTORY_COLUMNS]
+
+    def _parse_update(self, update, now):
+        machine_id = str(update['machine_id']).strip()
+        features = {}
+        for key in FEATURE_KEYS:
+            value = update.get(key)
+            if value is not None and value != '':
+                features[key] = int(float(value)) if key == 'failure' else float(value)
+        timestamp = update.get('timestamp') or now
+        datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S")
+        record = {'machine_id': machine_id, 'features': features, 'timestamp': timestamp}
+        if machine_id not in self.machines:
+            #Bilinmeyen makine ancak tipi verilmişse oluşturulur
+            if not update.get('machine_type'):
+                return None
+            record['machine_type'] = update['machine_type']
+        return record
+
+    def _apply_record(self, record):
+        """Günlük kaydını uygular; yeni makine oluşturulduysa 1 döndürür."""
+        machine_id = record['machine_id']
+        if machine_id in self.machines:
+            machine = self.machines[machine_id]
+            for key, value in record['features'].items():
+                machine.features[key] = value
+            machine.last_updated = record['timestamp']
+            self.mark_changed(machine_id)
+            return 0
+        if not record.get('machine_type'):
+            return 0
+        self.machines[machine_id] = MachineProfile(
+            machine_id, record['machine_type'], record['features'], created_at=record['timestamp']
+        )
+        self.mark_changed()
+        return 1
+
+    def _compact_if_needed(self):
+        if self.journal.entries >= self.COMPACT_AFTER:
+            self.save_profiles()
+
+    def _write_store(self, columns):
+        #Depo atomik olarak yazıldıktan sonra günlükteki kayıtlar artık depoda
+        self.store.save(columns)
+        self.journal.clear()
+
+    def replace_profiles(self, columns):
+        """Tüm filoyu verilen sütunlarla değiştirir.
+
+        Değişmeyen makinelerin zaman damgaları korunur; hiçbir makine
+        değişmediyse depo dosyası yeniden yazılmaz. Değişen makine sayısını döndürür.
+        """
+        old = self.store.load()
+        columns, unchanged = self.store.merge_unchanged(old, columns)
+        changed = int(len(unchanged) - unchanged.sum())
+        same_rows = old is not None and len(old['machine_id']) == len(columns['machine_id']) \
+            and bool((old['machine_id'] == columns['machine_id']).all())
+        if changed or not same_rows:
+            self.store.save(columns)
+        #Yeniden işleme tüm filoyu sıfırlar; önceki günlük kayıtları geçersizdir
+        self.journal.clear()
+        self._load_columns(columns)
+        return changed
+
+    def save_profiles(self):
+        """Tüm makineleri tek bir sütunlu dosyaya yazar ve günlüğü boşaltır."""
+        self._write_store(self.machines.to_columns())
+
+    def import_profiles(self, directory=None):
+        """JSON klasöründeki profilleri içe aktarır ve depoyu günceller."""
+        columns = self.store.import_json_directory(directory or self.profiles_dir)
+        if columns is None:
+            return 0
+        self._write_store(columns)
+        self._load_columns(columns)
+        return len(self.machines)
+
+    def export_profiles(self, directory=None):
+        """Profilleri makine başına bir JSON dosyası olarak dışa aktarır (yazılan dosya sayısını döndürür)."""
+        return self.store.export_json_directory(self.machines.to_columns(), directory or self.profiles_dir)
@@ -2,8 +2,22 @@ import json
 import os
 from datetime import datetime
 
+#Modellerin beklediği sensör sütunları (sıra önemli)
+FEATURE_COLUMNS = ['air_temp', 'process_temp', 'rotational_speed', 'torque', 'tool_wear']
+#Ham veri setindeki sensör sütun adları (köşeli parantezsiz) -> özellik adı
+RAW_FEATURE_NAMES = {
+    'Air temperature K': 'air_temp',
+    'Process temperature K': 'process_temp',
+    'Rotational speed rpm': 'rotational_speed',
+    'Torque Nm': 'torque',
+    'Tool wear min': 'tool_wear'
+}
+
+
 class MachineProfile:
-    def __init__(self, machine_id, machine_type, features):
+    __slots__ = ('machine_id', 'machine_type', 'features', 'created_at', 'last_updated')
+
+    def __init__(self, machine_id, machine_type, features, created_at=None, last_updated=None):
         self.machine_id = machine_id
         self.machine_type = machine_type
         self.features = {
@@ -14,10 +28,13 @@ class MachineProfile:
             'tool_wear': float(features.get('tool_wear', 0)),
             'failure': int(features.get('failure', 0))
         }
-        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.last_updated = self.created_at
+        self.created_at = created_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.last_updated = last_updated or self.created_at
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
 
     def save_to_file(self, directory="machine_profiles"):
         os.makedirs(directory, exist_ok=True)
         with open(f"{directory}/{self.machine_id}.json", "w") as f:
-            json.dump(self.__dict__, f, indent=4)
\ No newline at end of file
+            json.dump(self.to_dict(), f, indent=4)
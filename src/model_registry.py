@@ -0,0 +1,168 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from src.instrumentation import span
+from src.tree_inference import BACKENDS, compile_model
+
+MODELS_DIR = "models/trained_models"
+TASKS = ("classification", "regression")
+
+
+class ModelRegistry:
+    """Eğitilmiş model dosyalarını bulur, tembel yükler ve bellekte LRU olarak tutar.
+
+    GUI, eğitici ve toplu araçlar modelleri bu sınıf üzerinden alır. Bellek
+    hesabı model dosyası boyutuna göre yapılır; sınır aşılınca en uzun süredir
+    kullanılmayan modeller bellekten çıkarılır. Dosyanın değiştirilme zamanı
+    veya boyutu değişirse (verify_hash=True ise içerik özeti de) model yeniden
+    yüklenir.
+
+    backend='flat' ise ağaç toplulukları (Random Forest, XGBoost) ilk kullanımda
+    düz dizi tabanlı tahminciye (tree_inference) çevrilip onunla birlikte
+    saklanır; desteklenmeyen modeller (ör. SVM) olduğu gibi döner.
+    """
+
+    def __init__(self, base_dir=MODELS_DIR, max_bytes=512 * 1024 * 1024, verify_hash=False, backend="native"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Bilinmeyen çıkarım arka ucu: {backend} (desteklenenler: {', '.join(BACKENDS)})")
+        self.base_dir = base_dir
+        self.max_bytes = max_bytes
+        self.verify_hash = verify_hash
+        self.backend = backend
+        self.memory_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  #(task, name) -> {'model', 'signature', 'size', 'sha256', 'flat'}
+        self._lock = threading.RLock()
+
+    def path(self, name, task="classification"):
+        return f"{self.base_dir}/{task}/{name}.joblib"
+
+    def discover(self):
+        """Disk üzerindeki tüm model dosyalarını {(task, name): path} olarak döndürür."""
+        found = {}
+        for task in TASKS:
+            directory = f"{self.base_dir}/{task}"
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                if filename.endswith(".joblib"):
+                    name = filename[:-len(".joblib")]
+                    found[(task, name)] = f"{directory}/{filename}"
+        return found
+
+    def available(self, task="classification"):
+        return [name for (model_task, name) in self.discover() if model_task == task]
+
+    def signature(self, name, task="classification"):
+        """Model dosyasının (değiştirilme zamanı, boyut) imzasını döndürür."""
+        stat = os.stat(self.path(name, task))
+        return stat.st_mtime_ns, stat.st_size
+
+    def _file_hash(self, path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def get(self, name, task="classification", backend=None):
+        """Modeli döndürür; bellekte yoksa veya dosya değiştiyse diskten yükler.
+
+        backend verilmezse kayıt defterinin varsayılanı kullanılır.
+        """
+        entry = self._entry(name, task)
+        if (backend or self.backend) == "native":
+            return entry['model']
+        with self._lock:
+            if 'flat' not in entry:
+                with span("model.compile", model=name, task=task):
+                    entry['flat'] = compile_model(entry['model']) or entry['model']
+            return entry['flat']
+
+    def _entry(self, name, task):
+        key = (task, name)
+        path = self.path(name, task)
+        with self._lock:
+            signature = self.signature(name, task)
+            entry = self._entries.get(key)
+            if entry is not None and entry['signature'] != signature and self.verify_hash:
+                #Zaman damgası değişti ama içerik aynıysa yeniden yükleme
+                if entry['sha256'] == self._file_hash(path):
+                    entry['signature'] = signature
+            if entry is not None and entry['signature'] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            self._drop(key)
+            with span("model.load", model=name, task=task, bytes=signature[1]):
+                import joblib  #joblib ve model kütüphaneleri ilk model yüklemesinde içe aktarılır
+                model = joblib.load(path)
+            return self._store(key, model, signature, path)
+
+    def save(self, model, name, task="classification"):
+        """Modeli atomik olarak diske yazar ve bellekteki kaydı günceller."""
+        path = self.path(name, task)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        import joblib
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._drop((task, name))
+            self._store((task, name), model, self.signature(name, task), path)
+        return path
+
+    def _store(self, key, model, signature, path):
+        size = signature[1]
+        entry = {
+            'model': model,
+            'signature': signature,
+            'size': size,
+            'sha256': self._file_hash(path) if self.verify_hash else None
+        }
+        self._entries[key] = entry
+        self.memory_used += size
+        #Sınır aşıldıysa en eski modelleri çıkar (en son eklenen her zaman kalır)
+        while self.memory_used > self.max_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+        return entry
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.memory_used -= entry['size']
+
+    def invalidate(self, name=None, task="classification"):
+        """Bellekteki modelleri siler; name verilmezse tümü silinir."""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                self.memory_used = 0
+            else:
+                self._drop((task, name))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'loaded': [f"{task}/{name}" for task, name in self._entries],
+                'memory_used': self.memory_used,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+_default_registry = None
+
+
+def get_registry():
+    """Uygulama genelinde paylaşılan model kayıt defterini döndürür."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelRegistry()
+    return _default_registry
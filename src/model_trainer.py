@@ -1,68 +1,328 @@
-import joblib
-import pandas as pd
-import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.svm import SVC, SVR
-from xgboost import XGBClassifier, XGBRegressor
+import importlib
+import multiprocessing
 import os
-from imblearn.over_sampling import SMOTE
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    mean_absolute_error,
-    mean_squared_error,
-    r2_score,
-    roc_auc_score,
-    precision_recall_curve,
-    confusion_matrix
-)
+import sys
+import time
+import tracemalloc
+from importlib import metadata
+from src.instrumentation import record, span
+from src.machine_profile import FEATURE_COLUMNS
+from src.model_registry import get_registry
+from src.model_tuning import load_tuned_params
+from src.sensor_history import HISTORY_COLUMNS, MODEL_COLUMNS, SensorHistory
+from src.training_cache import TrainingDataCache, as_frames, load_arrays
+from src.tree_inference import compile_model, verify
+
+#scikit-learn, xgboost, imblearn ve pandas yalnızca eğitim gerçekten çalışırken
+#yüklenir; önbellek güncelse (eğitim atlanırsa) bu kütüphaneler hiç içe aktarılmaz.
+
+try:
+    import resource  #Windows'ta yok; orada tracemalloc kullanılır
+except ImportError:
+    resource = None
+
+
+def _peak_rss():
+    """Sürecin şimdiye kadarki tepe RSS değeri (bayt)."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _fit_model(model_name, model, X_train, y_train, threads):
+    """Tek bir modeli eğitir; süreyi ve tepe belleği ölçer.
+
+    Tepe bellek, ru_maxrss'in görev başındaki değerine göre artışıdır. Havuz
+    spawn bağlamıyla kurulur; alt süreç üst sürecin belleğini devralmadığı
+    için değer yalnızca bu modelin verisini ve eğitimini yansıtır. Sıralı
+    eğitimde (aynı süreçte) sürecin önceki tepesini aşan kısım ölçülür, yani
+    değer bir alt sınırdır. X_train yerine eğitim önbelleği dizini verilirse
+    diziler alt süreçte bellek eşlemeli açılır (kopyalanıp sürece aktarılmaz).
+    """
+    from threadpoolctl import threadpool_limits
+    if resource is None:
+        tracemalloc.start()
+    else:
+        rss_at_start = _peak_rss()
+    if isinstance(X_train, str):
+        X_train, _, y_train, _ = as_frames(*load_arrays(X_train))
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=threads)
+
+    start = time.perf_counter()
+    #BLAS/OpenMP iş parçacıklarını da bütçeyle sınırla (aşırı abonelik olmasın)
+    with threadpool_limits(limits=threads):
+        model.fit(X_train, y_train)
+    elapsed = time.perf_counter() - start
+
+    if resource is None:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    else:
+        peak_memory = _peak_rss() - rss_at_start
+    return model_name, model, elapsed, peak_memory
+
+
+SVM_MODES = ("exact", "approx", "both")
+#Model adı -> (kurucu, parametreler); kurucunun modülü yalnızca model kurulurken yüklenir
+MODEL_SPECS = {
+    "random_forest": ("sklearn.ensemble.RandomForestClassifier", {'class_weight': 'balanced', 'n_estimators': 200}),
+    "svm": ("sklearn.svm.SVC", {'probability': True, 'class_weight': 'balanced'}),
+    "svm_approx": ("src.model_trainer.build_svm_approx", {'n_components': 300, 'random_state': 42}),
+    "xgboost": ("xgboost.XGBClassifier", {'eval_metric': 'logloss', 'scale_pos_weight': 10})
+}
+#Varsayılan hiperparametreleri belirleyen kütüphaneler (sürümleri önbellek özetine girer)
+TRAINING_LIBRARIES = ("scikit-learn", "xgboost", "imbalanced-learn")
+
+
+def _build_model(spec):
+    path, params = spec
+    module_name, attr = path.rsplit('.', 1)
+    return getattr(importlib.import_module(module_name), attr)(**params)
+
+
+def _library_versions():
+    versions = {}
+    for name in TRAINING_LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def build_svm_approx(n_components=300, random_state=42):
+    """Tam SVC'ye ucuz alternatif: Nyström çekirdek yaklaşımı + doğrusal SVM.
+
+    RBF çekirdeği n_components boyutlu açık bir özellik uzayına yaklaştırılır ve
+    üzerinde doğrusal SVM eğitilir; olasılıklar ayrı bir sigmoid kalibrasyonuyla
+    (3 katlı) elde edilir. Tahmin maliyeti destek vektörü sayısına değil
+    n_components'a bağlıdır.
+    """
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.kernel_approximation import Nystroem
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import LinearSVC
+    return CalibratedClassifierCV(
+        Pipeline([
+            ('scale', StandardScaler()),
+            ('kernel', Nystroem(kernel='rbf', n_components=n_components, random_state=random_state)),
+            ('svm', LinearSVC(class_weight='balanced', dual=False))
+        ]),
+        method='sigmoid',
+        cv=3
+    )
+
 
 class ModelTrainer:
-    def __init__(self):
-        self.models = {
-            "random_forest": RandomForestClassifier(class_weight='balanced', n_estimators=200),
-            "svm": SVC(probability=True, class_weight='balanced'),
-            "xgboost": XGBClassifier(eval_metric='logloss', scale_pos_weight=10)
+    def __init__(self, svm_mode="exact", history_features=False):
+        if svm_mode not in SVM_MODES:
+            raise ValueError(f"Geçersiz SVM modu: {svm_mode} (desteklenenler: {', '.join(SVM_MODES)})")
+        excluded = {"exact": "svm_approx", "approx": "svm"}.get(svm_mode)
+        self.model_names = [name for name in MODEL_SPECS if name != excluded]
+        #`python -m src tune --apply` ile seçilen parametreler varsa kullanılır
+        self.tuned_params = load_tuned_params()
+        self._models = None  #İlk erişimde kurulur (ML kütüphaneleri o zaman yüklenir)
+        self.smote_params = {'random_state': 42}
+        self.split_params = {'test_size': 0.2, 'random_state': 42}
+        self.data_path = "data/processed_data.csv"
+        self.registry = get_registry()
+        self.data_cache = TrainingDataCache()
+        self.data_dir = None  #Son hazırlanan eğitim verisinin önbellek dizini
+        #Sensör geçmişi özellikleri (kayan ortalama/std/eğim) isteğe bağlıdır
+        self.history = SensorHistory() if history_features else None
+        self.feature_columns = MODEL_COLUMNS if history_features else FEATURE_COLUMNS
+
+    @property
+    def models(self):
+        if self._models is None:
+            self._models = {}
+            for name in self.model_names:
+                model = _build_model(MODEL_SPECS[name])
+                if name in self.tuned_params:
+                    model.set_params(**self.tuned_params[name])
+                self._models[name] = model
+        return self._models
+
+    @models.setter
+    def models(self, models):
+        self._models = dict(models)
+        self.model_names = list(self._models)
+
+    def get_params(self):
+        """Eğitim sonucunu etkileyen parametreler (önbellek özeti için).
+
+        Modeller kurulmadan, tanımlarından ve kütüphane sürümlerinden üretilir;
+        böylece eğitim atlanacaksa scikit-learn/xgboost içe aktarılmaz.
+        """
+        models = {}
+        for name in self.model_names:
+            if name in MODEL_SPECS:
+                models[name] = {'spec': MODEL_SPECS[name], 'tuned': self.tuned_params.get(name, {})}
+            else:
+                models[name] = self.models[name].get_params()
+        return {
+            'models': models,
+            'smote': self.smote_params,
+            'split': self.split_params,
+            'features': self.feature_columns,
+            'libraries': _library_versions()
         }
 
-    def train_all(self):
-        try:
-            data = pd.read_csv("data/processed_data.csv")
-            data.columns = [col.replace('[', '').replace(']', '') for col in data.columns]
+    def input_files(self):
+        """İçeriği eğitim verisini belirleyen dosyalar (önbellek özeti için)."""
+        return [self.data_path, *(self.history.files() if self.history is not None else [])]
+
+    def output_paths(self):
+        return [self.registry.path(name) for name in self.model_names]
 
-            X = data[['air_temp', 'process_temp', 'rotational_speed', 'torque', 'tool_wear']]
-            y = data['failure']
+    def _prepare_data(self):
+        """Dengelenmiş ve bölünmüş eğitim/test verisini döndürür.
 
-            #SMOTE ile veri dengeleme
-            smote = SMOTE(random_state=42)
+        İşlenmiş veri ve SMOTE/bölme parametreleri değişmediyse sonuç önbellekten
+        bellek eşlemeli olarak yüklenir; SMOTE yeniden çalıştırılmaz.
+        """
+        key = self.data_cache.key(self.data_path, self.smote_params, self.split_params,
+                                  columns=self.feature_columns, extra_files=self.input_files()[1:])
+        self.data_dir = self.data_cache.path(key)
+        cached = self.data_cache.load(key)
+        if cached is not None:
+            print("⏩ SMOTE ve veri bölme önbellekten yüklendi.")
+            return as_frames(*cached)
+
+        import numpy as np
+        import pandas as pd
+        from imblearn.over_sampling import SMOTE
+        from sklearn.model_selection import train_test_split
+        data = pd.read_csv(self.data_path)
+        data.columns = [col.replace('[', '').replace(']', '') for col in data.columns]
+
+        X = data[FEATURE_COLUMNS]
+        y = data['failure']
+        if self.history is not None:
+            #Her makinenin işlenmiş (son) okumasına o ana kadarki geçmiş penceresi eklenir
+            history = self.history.features(data['Product ID'].tolist(), data[HISTORY_COLUMNS].to_numpy())
+            X = pd.DataFrame(np.hstack([X.to_numpy(dtype=np.float64), history]), columns=MODEL_COLUMNS)
+
+        #SMOTE ile veri dengeleme
+        with span("train.smote", rows=len(X)) as trace:
+            smote = SMOTE(**self.smote_params)
             X_resampled, y_resampled = smote.fit_resample(X, y)
+            trace.set(rows_out=len(X_resampled))
+
+        #Veriyi bölme
+        splits = train_test_split(
+            X_resampled, y_resampled, stratify=y_resampled, **self.split_params
+        )
+        #Önbellekten dönen dizilerle aynı biçimde (float64 / int64) çalışmak için yeniden yükle
+        self.data_cache.save(key, *splits)
+        return as_frames(*self.data_cache.load(key))
+
+    def _thread_budget(self, n_cores):
+        """Çekirdekleri modeller arasında paylaştırır.
 
-            #Veriyi bölme
-            X_train, X_test, y_train, y_test = train_test_split(
-                X_resampled, y_resampled, test_size=0.2, random_state=42, stratify=y_resampled
-            )
+        n_jobs parametresi olmayan modeller (ör. SVC) tek iş parçacığı alır,
+        kalan çekirdekler çok iş parçacıklı modellere eşit bölünür.
+        """
+        multi = [name for name, model in self.models.items() if 'n_jobs' in model.get_params()]
+        budget = {name: 1 for name in self.models}
+        if multi:
+            spare = max(n_cores - (len(self.models) - len(multi)), len(multi))
+            for i, name in enumerate(multi):
+                budget[name] = spare // len(multi) + (1 if i < spare % len(multi) else 0)
+        return budget
 
-            #Model eğitimi
-            for model_name, model in self.models.items():
-                print(f"\n⭐ {model_name.upper()} eğitiliyor...")
-                model.fit(X_train, y_train)
-                joblib.dump(model, f"models/trained_models/classification/{model_name}.joblib")
-                self._evaluate_model(model, X_test, y_test)
+    def train_all(self, parallel=True, n_cores=None):
+        try:
+            X_train, X_test, y_train, y_test = self._prepare_data()
+
+            n_cores = n_cores or os.cpu_count() or 1
+            budget = self._thread_budget(n_cores) if parallel else {name: n_cores for name in self.models}
+            results = []
+
+            if parallel and len(self.models) > 1:
+                #Bağımsız modeller ayrı süreçlerde eşzamanlı eğitilir
+                print(f"\n⭐ {len(self.models)} model paralel eğitiliyor ({n_cores} çekirdek)...")
+                #spawn: alt süreçler üst sürecin veri çerçevelerini devralmaz (bellek ölçümü için)
+                context = multiprocessing.get_context("spawn")
+                with context.Pool(processes=len(self.models), maxtasksperchild=1) as pool:
+                    pending = [
+                        pool.apply_async(_fit_model, (name, model, self.data_dir, None, budget[name]))
+                        for name, model in self.models.items()
+                    ]
+                    for job in pending:
+                        results.append(job.get())
+            else:
+                for model_name, model in self.models.items():
+                    print(f"\n⭐ {model_name.upper()} eğitiliyor...")
+                    results.append(_fit_model(model_name, model, X_train, y_train, budget[model_name]))
+
+            #Kaydetme atomiktir: yarım kalan eğitim bozuk .joblib bırakmaz
+            metrics = {}
+            for model_name, model, elapsed, peak_memory in results:
+                #Eğitim alt süreçte ölçüldüğü için süre ize sonradan eklenir
+                record("train.fit", elapsed, model=model_name, rows=len(X_train), peak_memory=peak_memory)
+                self.models[model_name] = model
+                self.registry.save(model, model_name)
+                print(f"\n✅ {model_name.upper()} eğitildi ({elapsed:.2f} sn, {budget[model_name]} iş parçacığı)")
+                metrics[model_name], y_proba = self._evaluate_model(model, X_test, y_test)
+                self._verify_flat_predictor(model, X_test, y_proba)
+
+            self._print_training_summary(results, budget)
+            self._print_model_comparison(results, metrics)
+            return {name: {'seconds': elapsed, 'peak_memory': peak, **metrics[name]}
+                    for name, _, elapsed, peak in results}
 
         except Exception as e:
             print(f"\n Eğitim hatası: {str(e)}")
             raise
 
+    def _print_training_summary(self, results, budget):
+        print("\n" + "=" * 50)
+        print("⏱️ EĞİTİM ÖZETİ")
+        print("=" * 50)
+        print(f"{'Model':<15}{'Süre (sn)':>12}{'İş Parç.':>10}{'Tepe Bellek (MB)':>20}")
+        for model_name, _, elapsed, peak_memory in results:
+            print(f"{model_name:<15}{elapsed:>12.2f}{budget[model_name]:>10}{peak_memory / 1024 ** 2:>20.1f}")
+
+    def _verify_flat_predictor(self, model, X_test, y_proba):
+        """Ağaç modelleri için düz tahmincinin aynı olasılıkları verdiğini doğrular."""
+        flat = compile_model(model)
+        if flat is None:
+            return
+        try:
+            max_diff = verify(model, flat, X_test, expected=y_proba)
+            print(f"🌲 Düz tahminci doğrulandı (en büyük olasılık farkı: {max_diff:.1e})")
+        except ValueError as e:
+            print(f"⚠️ {e}; bu model için 'native' arka ucu kullanılmalı")
+
+    def _print_model_comparison(self, results, metrics):
+        """Modelleri (ör. tam SVC ve yaklaşık SVM) doğruluk ve maliyet açısından yan yana gösterir."""
+        print("\n" + "=" * 50)
+        print("⚖️ MODEL KARŞILAŞTIRMASI")
+        print("=" * 50)
+        print(f"{'Model':<15}{'Accuracy':>10}{'ROC-AUC':>10}{'Eğitim (sn)':>13}{'Tahmin (µs/satır)':>20}")
+        for model_name, _, elapsed, _ in results:
+            m = metrics[model_name]
+            print(f"{model_name:<15}{m['accuracy']:>10.4f}{m['roc_auc']:>10.4f}{elapsed:>13.2f}"
+                  f"{m['predict_us_per_row']:>20.2f}")
+
     def _evaluate_model(self, model, X_test, y_test):
+        from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
         y_pred = model.predict(X_test)
+        start = time.perf_counter()
         y_proba = model.predict_proba(X_test)[:, 1]
+        predict_seconds = time.perf_counter() - start
 
+        metrics = {
+            'accuracy': accuracy_score(y_test, y_pred),
+            'roc_auc': roc_auc_score(y_test, y_proba),
+            'predict_us_per_row': predict_seconds / len(X_test) * 1e6
+        }
         print("\n📊 Performans Metrikleri:")
-        print(f"Accuracy: {accuracy_score(y_test, y_pred):.4f}")
+        print(f"Accuracy: {metrics['accuracy']:.4f}")
         print(f"Precision: {precision_score(y_test, y_pred):.4f}")
         print(f"Recall: {recall_score(y_test, y_pred):.4f}")
         print(f"F1 Score: {f1_score(y_test, y_pred):.4f}")
-        print(f"ROC-AUC: {roc_auc_score(y_test, y_proba):.4f}")
\ No newline at end of file
+        print(f"ROC-AUC: {metrics['roc_auc']:.4f}")
+        return metrics, y_proba
\ No newline at end of file
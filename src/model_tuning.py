@@ -0,0 +1,201 @@
+import json
+import os
+import time
+import numpy as np
+from src.instrumentation import span
+
+TUNING_DIR = "models/tuning"
+TUNED_PARAMS_PATH = f"{TUNING_DIR}/best_params.json"
+
+#Model başına aranacak parametre uzayları (ModelTrainer'daki model adlarıyla)
+SEARCH_SPACES = {
+    "random_forest": {
+        'n_estimators': [50, 100, 200, 400],
+        'max_depth': [None, 8, 12, 16, 24],
+        'min_samples_leaf': [1, 2, 5],
+        'max_features': ['sqrt', 0.6, 1.0]
+    },
+    "svm": {
+        'C': [0.1, 1, 10, 100],
+        'gamma': ['scale', 0.001, 0.01, 0.1]
+    },
+    "svm_approx": {
+        'estimator__kernel__n_components': [100, 300, 600],
+        'estimator__kernel__gamma': [None, 0.05, 0.2, 0.5],
+        'estimator__svm__C': [0.1, 1, 10]
+    },
+    "xgboost": {
+        'n_estimators': [100, 200, 400],
+        'max_depth': [3, 4, 6, 8],
+        'learning_rate': [0.03, 0.1, 0.3],
+        'subsample': [0.7, 1.0],
+        'scale_pos_weight': [1, 3, 10]
+    }
+}
+
+
+def cached_folds(directory, y, n_splits=3, random_state=42):
+    """Katlama indekslerini eğitim önbelleği dizininde saklar ve yeniden kullanır."""
+    path = os.path.join(directory, f"folds_{n_splits}_{random_state}.npz")
+    if os.path.exists(path):
+        stored = np.load(path)
+        return [(stored[f"train_{i}"], stored[f"test_{i}"]) for i in range(n_splits)]
+    from sklearn.model_selection import StratifiedKFold
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    folds = list(splitter.split(np.zeros(len(y)), y))
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, **{f"{kind}_{i}": indices for i, fold in enumerate(folds)
+                          for kind, indices in zip(("train", "test"), fold)})
+    os.replace(tmp_path, path)
+    return folds
+
+
+def pareto_frontier(records):
+    """Tahmin süresi daha düşük ve ROC-AUC'si daha yüksek başka bir yapılandırması olmayanlar."""
+    ordered = sorted(records, key=lambda r: (r['predict_us_per_row'], -r['roc_auc']))
+    best_auc = -np.inf
+    for record in ordered:
+        record['on_frontier'] = record['roc_auc'] > best_auc
+        best_auc = max(best_auc, record['roc_auc'])
+    return [record for record in ordered if record['on_frontier']]
+
+
+class ModelTuner:
+    """Sınıflandırıcılar için ardışık yarılamalı (successive halving) rastgele arama.
+
+    Her model için parametre uzayından n_candidates yapılandırma seçilir; önce
+    az örnekle değerlendirilip kötüler elenir, kalanlar giderek daha fazla
+    örnekle yeniden denenir. Aday x katlama işleri tüm çekirdeklere dağıtılır.
+    Eğitim verisi ve katlamalar eğitim önbelleğinden (TrainingDataCache) gelir.
+    Her yapılandırmanın eğitim süresi, satır başına tahmin süresi ve ROC-AUC'si
+    kaydedilir; hız/doğruluk sınırı (Pareto) ve gecikme bütçesine uyan en iyi
+    yapılandırma raporlanır.
+    """
+
+    def __init__(self, trainer, n_candidates=24, cv=3, factor=3, n_jobs=-1, random_state=42,
+                 output_dir=TUNING_DIR):
+        self.trainer = trainer
+        self.n_candidates = n_candidates
+        self.cv = cv
+        self.factor = factor
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.output_dir = output_dir
+
+    def tune(self, model_names=None, latency_budget_us=None):
+        X_train, X_test, y_train, y_test = self.trainer._prepare_data()
+        folds = cached_folds(self.trainer.data_dir, np.asarray(y_train), self.cv, self.random_state)
+        model_names = model_names or [name for name in self.trainer.model_names if name in SEARCH_SPACES]
+
+        report = {}
+        for model_name in model_names:
+            if model_name not in SEARCH_SPACES:
+                raise ValueError(f"Arama uzayı tanımlı olmayan model: {model_name}")
+            print(f"\n🔎 {model_name.upper()} için hiperparametre araması...")
+            records = self._search(model_name, X_train, y_train, folds)
+            frontier = pareto_frontier(records)
+            best = self._pick(records, latency_budget_us)
+            report[model_name] = {'records': records, 'frontier': frontier, 'best': best}
+            self._print_frontier(model_name, frontier, best, latency_budget_us)
+
+        self._write_report(report, latency_budget_us)
+        return report
+
+    def _search(self, model_name, X_train, y_train, folds):
+        from sklearn.base import clone
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (HalvingRandomSearchCV için gerekli)
+        from sklearn.model_selection import HalvingRandomSearchCV
+        estimator = clone(self.trainer.models[model_name])
+        if 'n_jobs' in estimator.get_params():
+            #Paralellik adaylar arasında; tek modelin iş parçacıkları çekirdekleri taşırmasın
+            estimator.set_params(n_jobs=1)
+        search = HalvingRandomSearchCV(
+            estimator,
+            SEARCH_SPACES[model_name],
+            n_candidates=self.n_candidates,
+            factor=self.factor,
+            resource='n_samples',
+            cv=folds,
+            scoring='roc_auc',
+            refit=False,
+            n_jobs=self.n_jobs,
+            random_state=self.random_state
+        )
+        start = time.perf_counter()
+        with span("tune.search", model=model_name, rows=len(X_train), candidates=self.n_candidates):
+            search.fit(X_train, y_train)
+        print(f"   {search.n_iterations_} tur, {len(search.cv_results_['params'])} değerlendirme, "
+              f"{time.perf_counter() - start:.1f} sn")
+        return self._records(search)
+
+    def _records(self, search):
+        """Her yapılandırmanın ulaştığı son turdaki ölçümlerini döndürür."""
+        import pandas as pd
+        results = pd.DataFrame(search.cv_results_)
+        last = results.sort_values('iter').groupby(results['params'].map(repr)).tail(1)
+        records = []
+        for _, row in last.iterrows():
+            test_rows = row['n_resources'] / self.cv
+            records.append({
+                'params': row['params'],
+                'iteration': int(row['iter']),
+                'n_samples': int(row['n_resources']),
+                'roc_auc': float(row['mean_test_score']),
+                'roc_auc_std': float(row['std_test_score']),
+                'fit_seconds': float(row['mean_fit_time']),
+                'predict_us_per_row': float(row['mean_score_time'] / test_rows * 1e6),
+                'survived': int(row['iter']) == search.n_iterations_ - 1
+            })
+        return records
+
+    @staticmethod
+    def _pick(records, latency_budget_us):
+        """Son tura kalanlar içinde (varsa gecikme bütçesine uyan) en yüksek ROC-AUC."""
+        candidates = [r for r in records if r['survived']] or records
+        if latency_budget_us is not None:
+            candidates = [r for r in candidates if r['predict_us_per_row'] <= latency_budget_us]
+        return max(candidates, key=lambda r: r['roc_auc']) if candidates else None
+
+    @staticmethod
+    def _print_frontier(model_name, frontier, best, latency_budget_us):
+        print(f"\n⚡ {model_name} hız/doğruluk sınırı:")
+        print(f"{'ROC-AUC':>9}{'Eğitim (sn)':>13}{'Tahmin (µs/satır)':>20}{'Örnek':>8}  Parametreler")
+        for r in frontier:
+            marker = " ⭐" if best is not None and r['params'] == best['params'] else ""
+            print(f"{r['roc_auc']:>9.4f}{r['fit_seconds']:>13.2f}{r['predict_us_per_row']:>20.2f}"
+                  f"{r['n_samples']:>8}  {r['params']}{marker}")
+        if best is None:
+            print(f"⚠️ {latency_budget_us} µs/satır bütçesine uyan yapılandırma yok")
+
+    def _write_report(self, report, latency_budget_us):
+        import pandas as pd
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, "tuning_report.json")
+        with open(path, "w") as f:
+            json.dump({'latency_budget_us': latency_budget_us, 'models': report}, f, indent=2, default=repr)
+        rows = [{'model': name, **{k: v for k, v in r.items() if k != 'params'}, 'params': json.dumps(r['params'], default=repr)}
+                for name, entry in report.items() for r in entry['records']]
+        pd.DataFrame(rows).to_csv(os.path.join(self.output_dir, "tuning_frontier.csv"), index=False)
+        print(f"\n✅ Arama raporu kaydedildi: {path}")
+
+    def save_best_params(self, report, path=TUNED_PARAMS_PATH):
+        """Seçilen parametreleri ModelTrainer'ın bir sonraki eğitimde kullanacağı dosyaya yazar."""
+        best = load_tuned_params(path)
+        best.update({name: entry['best']['params'] for name, entry in report.items() if entry['best']})
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(best, f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+def load_tuned_params(path=TUNED_PARAMS_PATH):
+    """Kaydedilmiş en iyi parametreleri {model: params} olarak döndürür (yoksa boş)."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,64 @@
+import json
+import os
+
+PROFILE_JOURNAL_PATH = "data/profile_journal.jsonl"
+
+
+class ProfileJournal:
+    """Profil güncellemeleri için yalnızca-ekleme (append-only) günlük dosyası.
+
+    Her satır tek bir güncellemedir:
+    {"machine_id": ..., "machine_type": ..., "features": {...}, "timestamp": ...}
+    Güncellemeler sütunlu depoya yazılmadan önce buraya eklenir; depo yeniden
+    yazıldığında günlük boşaltılır. Yükleme sırasında depo üzerine yeniden oynatılır.
+    """
+
+    def __init__(self, path=PROFILE_JOURNAL_PATH):
+        self.path = path
+        self.entries = self._count_entries()
+
+    def _count_entries(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+    def _ends_mid_line(self):
+        """Dosya yarım yazılmış bir satırla (satır sonu olmadan) bitiyor mu?"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return False
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b"\n"
+
+    def append(self, records):
+        """Kayıtları günlüğe ekler ve diske zorla yazar (fsync)."""
+        if not records:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        #Yarım kalan satırın devamına yazılırsa yeni kayıt da okunamaz; yeni satırdan başla
+        prefix = "\n" if self._ends_mid_line() else ""
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(prefix + "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries += len(records)
+
+    def replay(self):
+        """Günlükteki kayıtları yazıldıkları sırayla döndürür (yarım kalan son satır atlanır)."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    #Çökme sırasında yarım yazılmış satır
+                    continue
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.entries = 0
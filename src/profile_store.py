@@ -0,0 +1,163 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+from src.machine_profile import FEATURE_COLUMNS
+
+PROFILE_STORE_PATH = "data/machine_profiles.npz"
+PROFILES_DIR = "machine_profiles"
+
+#Depodaki sütunlar ve tipleri (her özellik için tek bir dizi)
+STORE_DTYPES = {
+    'machine_id': str,
+    'machine_type': str,
+    **{col: np.float64 for col in FEATURE_COLUMNS},
+    'failure': np.int8,
+    'created_at': str,
+    'last_updated': str
+}
+
+
+class ProfileStore:
+    """Makine profillerini tek bir sütunlu (.npz) dosyada saklar.
+
+    Her özellik ayrı bir dizi olarak tutulur; satır sırası machine_id dizisiyle
+    aynıdır. JSON klasörü yalnızca içe/dışa aktarma formatı olarak kullanılır.
+    """
+
+    def __init__(self, path=PROFILE_STORE_PATH):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Tüm sütunları tek seferde okur. Depo yoksa None döndürür."""
+        if not self.exists():
+            return None
+        with np.load(self.path, allow_pickle=False) as data:
+            return {name: data[name] for name in data.files}
+
+    def save(self, columns):
+        """Sütunları geçici dosyaya yazıp atomik olarak yer değiştirir."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **columns)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def build_index(columns):
+        """machine_id -> satır numarası sözlüğü oluşturur."""
+        return {machine_id: row for row, machine_id in enumerate(columns['machine_id'].tolist())}
+
+    @staticmethod
+    def columns_from_records(records):
+        """Profil sözlüklerinden (JSON formatı) sütun dizileri üretir."""
+        records = list(records)
+        columns = {
+            'machine_id': [r['machine_id'] for r in records],
+            'machine_type': [r['machine_type'] for r in records],
+            'created_at': [r.get('created_at', '') for r in records],
+            'last_updated': [r.get('last_updated', '') for r in records]
+        }
+        for col in FEATURE_COLUMNS + ['failure']:
+            columns[col] = [r['features'].get(col, 0) for r in records]
+        return {name: np.asarray(columns[name], dtype=dtype) for name, dtype in STORE_DTYPES.items()}
+
+    @staticmethod
+    def columns_from_frame(data, id_col='Product ID', type_col='Type'):
+        """İşlenmiş DataFrame sütunlarından tek geçişte depo sütunları üretir."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        columns = {
+            'machine_id': data[id_col].to_numpy(dtype=str),
+            'machine_type': data[type_col].to_numpy(dtype=str),
+            'created_at': np.full(len(data), now),
+            'last_updated': np.full(len(data), now)
+        }
+        for col in FEATURE_COLUMNS + ['failure']:
+            if col in data:
+                columns[col] = data[col].to_numpy(dtype=STORE_DTYPES[col])
+            else:
+                columns[col] = np.zeros(len(data), dtype=STORE_DTYPES[col])
+        return columns
+
+    @staticmethod
+    def merge_unchanged(old, new):
+        """Yeni sütunları eski depoyla karşılaştırır.
+
+        Değişmeyen makinelerin created_at/last_updated değerleri korunur, var olan
+        makinelerin created_at değeri taşınır. Yeni sütunları ve değişmeyen satır
+        maskesini döndürür.
+        """
+        n = len(new['machine_id'])
+        if old is None or len(old['machine_id']) == 0 or n == 0:
+            return new, np.zeros(n, dtype=bool)
+
+        #Eski satırları machine_id üzerinden ikili aramayla eşleştir
+        old_ids = old['machine_id']
+        sorter = np.argsort(old_ids)
+        positions = np.minimum(np.searchsorted(old_ids, new['machine_id'], sorter=sorter), len(old_ids) - 1)
+        old_rows = sorter[positions]
+        matched = old_ids[old_rows] == new['machine_id']
+
+        same = matched & (old['machine_type'][old_rows] == new['machine_type'])
+        for col in FEATURE_COLUMNS + ['failure']:
+            same &= old[col][old_rows] == new[col]
+
+        new = dict(new)
+        new['created_at'] = np.where(matched, old['created_at'][old_rows], new['created_at'])
+        new['last_updated'] = np.where(same, old['last_updated'][old_rows], new['last_updated'])
+        return new, same
+
+    @staticmethod
+    def records_from_columns(columns):
+        """Sütun dizilerinden profil sözlükleri üretir (JSON formatı)."""
+        lists = {name: columns[name].tolist() for name in STORE_DTYPES}
+        for row in range(len(lists['machine_id'])):
+            yield {
+                'machine_id': lists['machine_id'][row],
+                'machine_type': lists['machine_type'][row],
+                'features': {col: lists[col][row] for col in FEATURE_COLUMNS + ['failure']},
+                'created_at': lists['created_at'][row],
+                'last_updated': lists['last_updated'][row]
+            }
+
+    def import_json_directory(self, directory=PROFILES_DIR):
+        """Eski JSON profil klasörünü okur ve sütunlara çevirir."""
+        if not os.path.exists(directory):
+            return None
+        records = []
+        for filename in os.listdir(directory):
+            if filename.endswith(".json"):
+                with open(f"{directory}/{filename}", "r") as f:
+                    records.append(json.load(f))
+        if not records:
+            return None
+        return self.columns_from_records(records)
+
+    def export_json_directory(self, columns, directory=PROFILES_DIR, max_workers=8):
+        """Sütunları makine başına bir JSON dosyası olarak dışa aktarır.
+
+        İçeriği değişmeyen dosyalar yeniden yazılmaz; yazılanlar geçici dosyadan
+        atomik olarak yer değiştirir. Yazılan dosya sayısını döndürür.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        def write(record):
+            path = f"{directory}/{record['machine_id']}.json"
+            content = json.dumps(record, indent=4)
+            if os.path.exists(path):
+                with open(path, "r") as f:
+                    if f.read() == content:
+                        return 0
+            with open(f"{path}.tmp", "w") as f:
+                f.write(content)
+            os.replace(f"{path}.tmp", path)
+            return 1
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return sum(pool.map(write, self.records_from_columns(columns)))
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+class QuantileSketch:
+    """Akış verisi için sabit bellekli, yaklaşık kantil özeti (KLL benzeri).
+
+    Değerler seviyelere ayrılmış tamponlarda tutulur; i. seviyedeki her öğe
+    2**i ağırlığındadır. Bir tampon k öğeyi aşınca sıralanır ve öğelerin yarısı
+    (rastgele tek/çift konumlar) bir üst seviyeye taşınır. Bellek kullanımı
+    yaklaşık k * log2(n / k) öğe ile sınırlıdır.
+    """
+
+    def __init__(self, k=2048, seed=42):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+
+    def _compact(self):
+        level = 0
+        while level < len(self.levels):
+            buffer = self.levels[level]
+            if len(buffer) > self.k:
+                buffer = np.sort(buffer)
+                #Tek sayıda öğe varsa biri bu seviyede kalır
+                leftover = buffer[:len(buffer) % 2]
+                paired = buffer[len(buffer) % 2:]
+                promoted = paired[self._rng.integers(2)::2]
+                self.levels[level] = leftover
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def quantile(self, q):
+        """q (0-1) kantilinin yaklaşık değerini döndürür."""
+        if self.count == 0:
+            return np.nan
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(buffer), 2 ** level, dtype=np.float64)
+                                  for level, buffer in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values, cumulative = values[order], np.cumsum(weights[order])
+        #Pandas'ın doğrusal enterpolasyonuyla uyumlu olması için (n - 1) * q sırası aranır
+        rank = q * (cumulative[-1] - 1)
+        position = min(int(np.searchsorted(cumulative - 1, rank, side='left')), len(values) - 1)
+        return float(values[position])
@@ -0,0 +1,141 @@
+import gzip
+import os
+import numpy as np
+from src.scoring_engine import risk_levels
+
+OUTPUT_FORMATS = ("csv", "csv.gz", "parquet", "jsonl")
+EXPORT_CHUNK_ROWS = 50_000
+
+
+def infer_format(output_path):
+    """Dosya uzantısından çıktı formatını belirler."""
+    if output_path.endswith(".gz"):
+        return "csv.gz"
+    if output_path.endswith(".parquet"):
+        return "parquet"
+    if output_path.endswith((".jsonl", ".json")):
+        return "jsonl"
+    return "csv"
+
+
+class ReportWriter:
+    """Raporu parça parça (DataFrame dilimleri halinde) diske yazan akış yazıcısı.
+
+    CSV, gzip ile sıkıştırılmış CSV, Parquet (pyarrow ParquetWriter, satır
+    grubu başına bir parça) ve JSON Lines desteklenir. Dosya önce geçici adla
+    yazılır ve yalnızca başarıyla kapatılınca yerine taşınır; yarım kalan
+    dışa aktarma eski raporun üzerine yazmaz.
+    """
+
+    def __init__(self, path, fmt=None, float_format="%.6f", encoding="utf-8"):
+        self.fmt = fmt or infer_format(path)
+        if self.fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"Desteklenmeyen çıktı formatı: {self.fmt} (desteklenenler: {', '.join(OUTPUT_FORMATS)})")
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.float_format = float_format
+        self.encoding = encoding
+        self.rows = 0
+        self._file = None
+        self._parquet = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _open(self, chunk):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.fmt == "parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Parquet çıktısı için 'pyarrow' kurulmalıdır: pip install pyarrow") from e
+            schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+            self._parquet = pq.ParquetWriter(self.tmp_path, schema, compression='zstd')
+        elif self.fmt == "csv.gz":
+            self._file = gzip.open(self.tmp_path, "wt", encoding=self.encoding, newline="", compresslevel=6)
+        else:
+            self._file = open(self.tmp_path, "w", encoding=self.encoding, newline="")
+
+    def write(self, chunk):
+        """Bir DataFrame dilimini rapora ekler (sütunlar her dilimde aynı olmalıdır)."""
+        first = self._file is None and self._parquet is None
+        if first:
+            self._open(chunk)
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            self._parquet.write_table(pa.Table.from_pandas(chunk, schema=self._parquet.schema, preserve_index=False))
+        elif self.fmt == "jsonl":
+            if len(chunk):
+                text = chunk.to_json(orient="records", lines=True, force_ascii=False)
+                self._file.write(text if text.endswith("\n") else text + "\n")
+        else:
+            chunk.to_csv(self._file, header=first, index=False, float_format=self.float_format)
+        self.rows += len(chunk)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        elif self._file is not None:
+            self._file.close()
+        else:
+            return self.path
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        """Yazmayı yarıda keser ve geçici dosyayı siler."""
+        try:
+            if self._parquet is not None:
+                self._parquet.close()
+            elif self._file is not None:
+                self._file.close()
+        finally:
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+
+
+def write_frame(df, output_path, fmt=None, chunk_rows=EXPORT_CHUNK_ROWS, **writer_options):
+    """Hazır bir DataFrame'i parça parça yazar."""
+    with ReportWriter(output_path, fmt, **writer_options) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            writer.write(df.iloc[start:start + chunk_rows])
+    return writer.rows
+
+
+def export_ranking(engine, risk, rows, output_path, fmt=None, model=None, scores=None,
+                   chunk_rows=EXPORT_CHUNK_ROWS, progress=None, **writer_options):
+    """Sıralı makine satırlarını özellikler, skorlar ve risk seviyeleriyle akış halinde yazar.
+
+    engine: özellik matrisini tutan ScoringEngine
+    risk: tüm filonun (önceden hesaplanmış) risk skorları; yeniden tahmin yapılmaz
+    rows: yazılacak satırlar, rapordaki sırayla (ör. RiskIndex.above() sonucu)
+    scores: isteğe bağlı {sütun adı: tüm filo için skor dizisi} (diğer modellerin skorları)
+    progress: verilirse her parçadan sonra progress(yazılan, toplam) çağrılır
+    Her parça için yalnızca o parçanın DataFrame'i kurulur; bellek kullanımı
+    filo boyutuna değil chunk_rows değerine bağlıdır. Yazılan satır sayısını döndürür.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    total = len(rows)
+    with ReportWriter(output_path, fmt, **writer_options) as writer:
+        for start in range(0, max(total, 1), chunk_rows):
+            batch = rows[start:start + chunk_rows]
+            df = engine.frame(batch, risk)
+            df.insert(0, 'rank', np.arange(start + 1, start + len(batch) + 1))
+            df['risk_level'] = risk_levels(df['risk_score'].to_numpy())
+            if model is not None:
+                df['model'] = model
+            for name, values in (scores or {}).items():
+                df[name] = np.asarray(values)[batch]
+            writer.write(df)
+            if progress is not None:
+                progress(min(start + chunk_rows, total), total)
+    return writer.rows
@@ -0,0 +1,76 @@
+import numpy as np
+
+
+class RiskIndex:
+    """Risk skorları üzerinde azalan sırada tutulan indeks.
+
+    İlk kurulumda skorlar bir kez sıralanır; sonrasında sayfa sorguları dilim
+    (O(sayfa boyutu)), eşik sorguları ikili arama (O(log n)) ile yanıtlanır.
+    Tip (L/M/H) bazında ayrı sıralı indeksler tutulur. Birkaç satırın skoru
+    değiştiğinde tüm filo yeniden sıralanmaz, yalnızca o satırlar yerleştirilir.
+    """
+
+    def __init__(self, risk, machine_types, order=None):
+        """order: hazır azalan sıralama (ör. parçalı skorlamanın birleştirdiği); yoksa sıralanır."""
+        self.machine_types = np.asarray(machine_types)
+        risk = np.asarray(risk)
+        self._build(risk, np.argsort(-risk, kind='stable') if order is None else np.asarray(order))
+
+    def _build(self, risk, order):
+        self.risk = risk
+        self.order = order
+        #Negatif skorlar artan sıradadır; searchsorted ile eşik araması yapılır
+        self._neg_sorted = -risk[order]
+        ordered_types = self.machine_types[order]
+        self._type_orders = {}
+        self._type_neg_sorted = {}
+        for machine_type in np.unique(self.machine_types).tolist():
+            type_order = order[ordered_types == machine_type]
+            self._type_orders[machine_type] = type_order
+            self._type_neg_sorted[machine_type] = -risk[type_order]
+
+    def _view(self, machine_type):
+        if machine_type is None:
+            return self.order, self._neg_sorted
+        if machine_type not in self._type_orders:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        return self._type_orders[machine_type], self._type_neg_sorted[machine_type]
+
+    def count(self, machine_type=None, min_score=None):
+        """Filtreye uyan makine sayısını döndürür."""
+        order, neg_sorted = self._view(machine_type)
+        if min_score is None:
+            return len(order)
+        return int(np.searchsorted(neg_sorted, -min_score, side='left'))
+
+    def above(self, min_score, machine_type=None):
+        """Skoru min_score değerinden büyük olan satırları (azalan sırada) döndürür."""
+        order, _ = self._view(machine_type)
+        return order[:self.count(machine_type, min_score)]
+
+    def page(self, page, page_size, machine_type=None, min_score=None):
+        """İstenen sayfadaki satırları ve filtreye uyan toplam makine sayısını döndürür."""
+        order, _ = self._view(machine_type)
+        total = self.count(machine_type, min_score)
+        start = max(page, 0) * page_size
+        return order[start:min(start + page_size, total)], total
+
+    def update(self, rows, risk):
+        """Skorları değişen satırları sıralı indekste yeniden konumlandırır."""
+        rows = np.asarray(rows, dtype=np.intp)
+        risk = np.asarray(risk)
+        if len(rows) == 0:
+            self.risk = risk
+            return
+        #Değişen satırları çıkar, yeni skorlarına göre ikili aramayla geri ekle
+        keep = self.order[~np.isin(self.order, rows)]
+        neg_keep = -risk[keep]
+        rows = np.unique(rows)
+        rows = rows[np.argsort(-risk[rows], kind='stable')]
+        new_scores = -risk[rows]
+        positions = np.searchsorted(neg_keep, new_scores, side='left')
+        ends = np.searchsorted(neg_keep, new_scores, side='right')
+        #Eşit skorlar satır sırasını korur (kararlı argsort ile aynı sonuç)
+        for i in np.flatnonzero(ends > positions):
+            positions[i] += np.searchsorted(keep[positions[i]:ends[i]], rows[i])
+        self._build(risk, np.insert(keep, positions, rows))
@@ -0,0 +1,251 @@
+import numpy as np
+from src.instrumentation import span
+from src.machine_profile import FEATURE_COLUMNS, RAW_FEATURE_NAMES
+from src.risk_index import RiskIndex
+from src.sensor_history import HISTORY_INDEX, MODEL_COLUMNS
+
+
+def _named_columns(model):
+    """Modelin eğitimde gördüğü sütun adları ve MODEL_COLUMNS içindeki konumları (adsızsa None).
+
+    Ham veri seti adlarıyla ('Torque Nm' vb.) eğitilmiş modeller (ör. regresyon
+    modelleri) RAW_FEATURE_NAMES ile özellik sütunlarına eşlenir.
+    """
+    names = getattr(model, 'feature_names_in_', None)
+    if names is None:
+        return None
+    names = [str(name) for name in names]
+    try:
+        return names, [MODEL_COLUMNS.index(RAW_FEATURE_NAMES.get(name, name)) for name in names]
+    except ValueError:
+        raise ValueError(f"Modelin özellik adları tanınmıyor: {names}") from None
+
+
+def model_width(model):
+    """Modelin girdisi için gereken en az sütun sayısı (geçmiş özellikleri varsa MODEL_COLUMNS kadar)."""
+    named = _named_columns(model)
+    if named is not None:
+        return max(named[1]) + 1
+    return getattr(model, 'n_features_in_', None) or len(FEATURE_COLUMNS)
+
+
+def with_history(features, machine_ids, history):
+    """Temel (n, 5) özelliklerin yanına sensör geçmişi özelliklerini ekler (MODEL_COLUMNS sırası).
+
+    machine_ids None ise veya makinenin geçmişi yoksa geçmiş özellikleri güncel
+    değerlerden türetilir (ortalama = güncel değer, std ve eğim 0).
+    """
+    return np.hstack([features, history.features(machine_ids, features[:, HISTORY_INDEX])])
+
+
+def _model_input(model, X):
+    """Matrisi modelin beklediği sütunlara indirger (geniş matris temel modellere de verilebilir)."""
+    width = model_width(model)
+    if X.shape[1] < width:
+        raise ValueError(f"Model {width} özellik bekliyor ({X.shape[1]} verildi); "
+                         "sensör geçmişi özellikleri with_history ile eklenmeli")
+    return X[:, :width] if X.shape[1] > width else X
+
+
+def _model_frame(model, X):
+    """Matrisi modelin eğitimde gördüğü sütun adlarıyla DataFrame olarak sarar."""
+    import pandas as pd
+    X = _model_input(model, X)
+    named = _named_columns(model)
+    if named is None:
+        return pd.DataFrame(X, columns=MODEL_COLUMNS[:X.shape[1]], copy=False)
+    names, columns = named
+    if columns == list(range(X.shape[1])):
+        return pd.DataFrame(X, columns=names, copy=False)
+    return pd.DataFrame(X[:, columns], columns=names)
+
+
+def predict_risk(model, X):
+    """Özellik matrisini modele verip arıza olasılıklarını döndürür."""
+    X = np.asarray(X)
+    if getattr(model, 'accepts_arrays', False):
+        #Düz ağaç tahmincisi (tree_inference) diziyle doğrudan çalışır
+        return model.predict_risk(_model_input(model, X))
+    #Modeller sütun isimleriyle eğitildi; DataFrame diziyi (gerekmedikçe) kopyalamadan sarar
+    return model.predict_proba(_model_frame(model, X))[:, 1]
+
+
+def predict_values(model, X):
+    """Regresyon modellerinin ham tahminlerini döndürür (predict_risk'in regresyon karşılığı)."""
+    X = np.asarray(X)
+    if getattr(model, 'accepts_arrays', False):
+        return model.predict(_model_input(model, X))
+    return np.asarray(model.predict(_model_frame(model, X)), dtype=np.float64)
+
+
+def risk_levels(risk, medium=0.3, high=0.7):
+    """Risk skorlarını 'high' / 'medium' / 'low' seviyelerine çevirir."""
+    return np.where(risk > high, 'high', np.where(risk > medium, 'medium', 'low'))
+
+
+class ScoringEngine:
+    """Filo özelliklerini bitişik bir float dizisinde kullanır ve risk skorlarını önbelleğe alır.
+
+    Skorlar model anahtarı ve MachineManager veri sürümüyle birlikte saklanır.
+    Yalnızca bazı makineler değiştiyse sadece o satırlar yeniden skorlanır.
+    """
+    CHUNK_ROWS = 50_000  #İlerleme bildirilirken parça başına satır
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.machine_ids = []
+        self.machine_types = np.empty(0, dtype=str)
+        self.features = np.empty((0, len(FEATURE_COLUMNS)), dtype=np.float64)
+        self.failures = np.empty(0, dtype=np.int8)
+        self.row_index = {}
+        self._matrix_version = -1
+        self._cache = {}  #model_key -> (veri sürümü, risk dizisi)
+        self._indexes = {}  #model_key -> RiskIndex (skorlarla aynı sürümde)
+        self._full_inputs = None  #Geçmiş özellikleri eklenmiş matris (gerekince kurulur)
+
+    def _rebuild_matrix(self):
+        #Anlık kopya: skorlama arka planda sürerken ana iş parçacığındaki düzenlemeler
+        #skorlanan matrisi değiştirmez; değişen satırlar sonraki sync'te kopyalanır
+        table = self.manager.machines
+        self.machine_ids = list(table.machine_ids)
+        self.row_index = dict(table.row_index)
+        self.machine_types = table.type_array()
+        self.features = table.feature_matrix().copy()
+        self.failures = table.failure_array().copy()
+        self._full_inputs = None
+        self._cache.clear()
+        self._indexes.clear()
+
+    def sync(self):
+        """Özellik matrisinin anlık kopyasını MachineManager ile eşitler ve güncellenen satırları döndürür.
+
+        Kopya MachineManager.lock altında alınır; böylece skorlanan satırlar ve
+        kaydedilen veri sürümü her zaman aynı anın verisidir.
+        """
+        with self.manager.lock:
+            version = self.manager.version
+            if self._matrix_version == version:
+                return []
+            changed = self.manager.changed_since(self._matrix_version)
+            if changed is None:
+                self._rebuild_matrix()
+                changed = list(self.machine_ids)
+            elif changed:
+                #Yalnızca değişen satırlar kopyalanır (makine kümesi aynı, satır indeksleri geçerli)
+                table = self.manager.machines
+                rows = [self.row_index[machine_id] for machine_id in changed]
+                self.features[rows] = table.feature_matrix()[rows]
+                self.failures[rows] = table.failure_array()[rows]
+                if self._full_inputs is not None:
+                    self._full_inputs[rows] = with_history(self.features[rows], changed, self.manager.history)
+            self._matrix_version = version
+        return changed
+
+    def full_inputs(self):
+        """Temel özellikler ve sensör geçmişi özellikleri (n, len(MODEL_COLUMNS))."""
+        if self._full_inputs is None:
+            self._full_inputs = with_history(self.features, self.machine_ids, self.manager.history)
+        return self._full_inputs
+
+    def inputs(self, model):
+        """Modelin girdi matrisi; geçmiş özellikleri yalnızca onları kullanan modeller için kurulur."""
+        if model_width(model) <= len(FEATURE_COLUMNS):
+            return self.features
+        return self.full_inputs()
+
+    def risk_scores(self, model_key, load_model, progress=None, scorer=None):
+        """Tüm filonun risk skorlarını döndürür.
+
+        model_key: önbellek anahtarı (ör. model dosyası ve değiştirilme zamanı)
+        load_model: modeli döndüren fonksiyon; yalnızca skorlama gerekirse çağrılır
+        progress: verilirse tam skorlama parçalar halinde yapılır ve her parçadan
+            sonra progress(biten, toplam) çağrılır (istisna fırlatarak iptal edebilir)
+        scorer: verilirse tam skorlama onunla yapılır (ör. sharded_scoring.ShardedScorer);
+            scorer(X, progress) (risk, sıralama) döndürür, sıralama indekse aktarılır
+        """
+        self.sync()
+        version = self._matrix_version
+        cached = self._cache.get(model_key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        changed = self.manager.changed_since(cached[0]) if cached is not None else None
+        if changed is None:
+            model = load_model()
+            self._indexes.pop(model_key, None)
+            with span("score.fleet", rows=len(self.features), sharded=scorer is not None):
+                if scorer is None:
+                    risk = self._predict_chunked(model, progress)
+                else:
+                    risk, order = scorer(self.inputs(model), progress)
+                    #Parçaların birleştirilmiş sıralaması yeniden sıralamadan kullanılır
+                    self._indexes[model_key] = RiskIndex(risk, self.machine_types, order=order)
+        else:
+            #Sadece değişen satırları yeniden skorla
+            risk = cached[1].copy()
+            rows = np.fromiter((self.row_index[m] for m in changed), dtype=np.intp, count=len(changed))
+            if len(rows):
+                model = load_model()
+                with span("score.partial", rows=len(rows)):
+                    risk[rows] = predict_risk(model, self.inputs(model)[rows])
+            if model_key in self._indexes:
+                self._indexes[model_key].update(rows, risk)
+        self._cache[model_key] = (version, risk)
+        return risk
+
+    def _predict_chunked(self, model, progress):
+        X = self.inputs(model)
+        if progress is None:
+            return predict_risk(model, X)
+        total = len(X)
+        risk = np.empty(total, dtype=np.float64)
+        for start in range(0, total, self.CHUNK_ROWS):
+            stop = min(start + self.CHUNK_ROWS, total)
+            risk[start:stop] = predict_risk(model, X[start:stop])
+            progress(stop, total)
+        return risk
+
+    def risk_index(self, model_key, load_model, progress=None, scorer=None):
+        """Güncel skorlar üzerinde sıralı RiskIndex döndürür (ilk sorguda kurulur)."""
+        risk = self.risk_scores(model_key, load_model, progress, scorer)
+        index = self._indexes.get(model_key)
+        if index is None:
+            index = RiskIndex(risk, self.machine_types)
+            self._indexes[model_key] = index
+        return index
+
+    def cached(self, model_key):
+        """Önbellekte güncel skor varsa döndürür (yeniden tahmin yapmaz); yoksa None."""
+        entry = self._cache.get(model_key)
+        if entry is None or entry[0] != self.manager.version:
+            return None
+        return entry[1]
+
+    def prime(self, model_key, risk, version):
+        """Başka yoldan (ör. çoklu model karşılaştırması) hesaplanmış skorları önbelleğe koyar.
+
+        version: skorların hesaplandığı veri sürümü; o zamandan beri değişen
+        makineler bir sonraki risk_scores çağrısında yeniden skorlanır.
+        """
+        self._cache[model_key] = (version, np.asarray(risk, dtype=np.float64))
+        self._indexes.pop(model_key, None)
+
+    def invalidate(self, model_key=None):
+        """Önbellekteki skorları siler (model yeniden eğitildiğinde)."""
+        if model_key is None:
+            self._cache.clear()
+            self._indexes.clear()
+        else:
+            self._cache.pop(model_key, None)
+            self._indexes.pop(model_key, None)
+
+    def frame(self, rows, risk):
+        """Verilen satırlar için makine, özellik ve risk skorlarını içeren DataFrame üretir."""
+        import pandas as pd
+        rows = np.asarray(rows, dtype=np.intp)
+        df = pd.DataFrame(self.features[rows], columns=FEATURE_COLUMNS)
+        df.insert(0, 'machine_id', [self.machine_ids[row] for row in rows])
+        df.insert(1, 'type', self.machine_types[rows])
+        df['failure'] = self.failures[rows]
+        df['risk_score'] = risk[rows]
+        return df
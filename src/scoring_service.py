@@ -0,0 +1,300 @@
+import asyncio
+import json
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.machine_manager import MachineManager
+from src.machine_profile import FEATURE_COLUMNS
+from src.model_registry import get_registry
+from src.scoring_engine import predict_risk, risk_levels, with_history
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MODEL_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_]+$")
+CONTENT_LENGTH_PATTERN = re.compile(r"^[0-9]+$")
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ServiceStats:
+    """İstek gecikmeleri ve mikro-parti boyutları için kayan pencere istatistikleri."""
+
+    def __init__(self, window=10_000):
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.requests = 0
+        self.batches = 0
+        self.rows = 0
+        self.errors = 0
+
+    def record_request(self, seconds):
+        self.requests += 1
+        self.latencies.append(seconds)
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.rows += size
+        self.batch_sizes.append(size)
+
+    def snapshot(self):
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        batch_sizes = np.array(self.batch_sizes) if self.batch_sizes else np.zeros(1)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'batches': self.batches,
+            'rows_scored': self.rows,
+            'latency_ms': {
+                'p50': float(np.percentile(latencies, 50)),
+                'p99': float(np.percentile(latencies, 99)),
+                'max': float(latencies.max())
+            },
+            'batch_size': {
+                'mean': float(batch_sizes.mean()),
+                'p50': float(np.percentile(batch_sizes, 50)),
+                'max': int(batch_sizes.max())
+            }
+        }
+
+
+class MicroBatcher:
+    """Eşzamanlı tekil istekleri model başına mikro-partilerde birleştirir.
+
+    İlk istek geldiğinde max_latency_ms kadar beklenir; bu sürede gelen diğer
+    istekler aynı partiye eklenir. Parti max_batch_size satıra ulaşırsa beklemeden
+    skorlanır. Tahmin iş parçacığı havuzunda çalışır, olay döngüsü bloklanmaz.
+    """
+
+    def __init__(self, registry, max_batch_size=256, max_latency_ms=5.0, workers=2, stats=None, backend=None):
+        self.registry = registry
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.stats = stats or ServiceStats()
+        self._pending = {}  #model -> [(satırlar, future)]
+        self._pending_rows = {}
+        self._timers = {}
+
+    async def predict(self, model_name, rows):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(model_name, []).append((rows, future))
+        self._pending_rows[model_name] = self._pending_rows.get(model_name, 0) + len(rows)
+        if self._pending_rows[model_name] >= self.max_batch_size:
+            self._flush(model_name)
+        elif model_name not in self._timers:
+            self._timers[model_name] = loop.call_later(self.max_latency, self._flush, model_name)
+        return await future
+
+    def _flush(self, model_name):
+        timer = self._timers.pop(model_name, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(model_name, [])
+        self._pending_rows.pop(model_name, None)
+        if batch:
+            asyncio.ensure_future(self._run_batch(model_name, batch))
+
+    async def _run_batch(self, model_name, batch):
+        rows = np.concatenate([part for part, _ in batch])
+        loop = asyncio.get_running_loop()
+        try:
+            scores = await loop.run_in_executor(self.executor, self._predict, model_name, rows)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.stats.record_batch(len(rows))
+        offset = 0
+        for part, future in batch:
+            if not future.done():
+                future.set_result(scores[offset:offset + len(part)])
+            offset += len(part)
+
+    def _predict(self, model_name, rows):
+        return predict_risk(self.registry.get(model_name, backend=self.backend), rows)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+class ScoringService:
+    """Modelleri yerel ağda sunan asyncio tabanlı basit HTTP/1.1 skorlama servisi.
+
+    Uç noktalar:
+      GET  /health  - servis durumu
+      GET  /models  - kullanılabilir sınıflandırma modelleri
+      GET  /stats   - p50/p99 gecikme ve parti boyutu istatistikleri
+      POST /predict - {"model": "xgboost", "machine_id": "M14860"}
+                      {"model": "svm", "machine_ids": [...]}
+                      {"model": "svm", "features": {"air_temp": ..., ...}}
+                      {"model": "svm", "instances": [{...}, {...}]}
+    """
+
+    def __init__(self, host="127.0.0.1", port=8080, default_model="xgboost", max_batch_size=256,
+                 max_latency_ms=5.0, workers=2, manager=None, registry=None, backend=None):
+        self.host = host
+        self.port = port
+        self.default_model = default_model
+        self.registry = registry or get_registry()
+        self.manager = manager or MachineManager()
+        self.stats = ServiceStats()
+        self.batcher = MicroBatcher(self.registry, max_batch_size, max_latency_ms, workers, self.stats, backend)
+
+    # ---------------------- HTTP ----------------------
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3 or not parts[2].startswith('HTTP/'):
+                    await self._reject(writer, 400, 'Geçersiz istek satırı')
+                    break
+                method, path, _ = parts
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = headers.get('content-length') or '0'
+                if not CONTENT_LENGTH_PATTERN.match(length):
+                    await self._reject(writer, 400, f"Geçersiz Content-Length: {length}")
+                    break
+                length = int(length)
+                if length > MAX_BODY_BYTES:
+                    await self._reject(writer, 413, 'İstek gövdesi çok büyük')
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self._route(method, path.split('?')[0], body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _reject(self, writer, status, message):
+        """Okunamayan isteği yanıtlar; gövde sınırı belirsiz olduğundan bağlantı kapatılır."""
+        self.stats.errors += 1
+        self._write_response(writer, status, {'error': message}, False)
+        await writer.drain()
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(headers.encode('latin-1') + body)
+
+    async def _route(self, method, path, body):
+        if path == "/health":
+            return 200, {'status': 'ok', 'machines': len(self.manager.machines)}
+        if path == "/models":
+            return 200, {'models': self.registry.available()}
+        if path == "/stats":
+            return 200, {**self.stats.snapshot(), 'registry': self.registry.stats()}
+        if path == "/predict":
+            if method != "POST":
+                return 405, {'error': 'POST kullanılmalı'}
+            return await self._predict(body)
+        return 404, {'error': f"Bilinmeyen yol: {path}"}
+
+    # ---------------------- Tahmin ----------------------
+
+    def _parse_rows(self, request):
+        """İstekten (makine kimlikleri, özellik matrisi) üretir.
+
+        Matris sensör geçmişi özelliklerini de içerir; geçmişle eğitilmemiş
+        modeller yalnızca ilk beş sütunu kullanır.
+        """
+        if 'machine_id' in request or 'machine_ids' in request:
+            machine_ids = request.get('machine_ids') or [request['machine_id']]
+            if not isinstance(machine_ids, list):
+                raise TypeError("machine_ids bir liste olmalı")
+            table = self.manager.machines
+            missing = [m for m in machine_ids if m not in table]
+            if missing:
+                raise KeyError(f"Bilinmeyen makine: {', '.join(missing[:10])}")
+            rows = [table.row_index[m] for m in machine_ids]
+            return machine_ids, with_history(table.feature_matrix()[rows], machine_ids, self.manager.history)
+
+        instances = request.get('instances') or ([request['features']] if 'features' in request else None)
+        if not instances:
+            raise ValueError("machine_id, machine_ids, features veya instances alanı gerekli")
+        if not isinstance(instances, list) or not all(isinstance(item, dict) for item in instances):
+            raise TypeError("features bir nesne, instances nesnelerden oluşan bir liste olmalı")
+        rows = np.array([[float(item[col]) for col in FEATURE_COLUMNS] for item in instances], dtype=np.float64)
+        machine_ids = [item.get('machine_id') for item in instances]
+        return machine_ids, with_history(rows, machine_ids, self.manager.history)
+
+    async def _predict(self, body):
+        start = time.perf_counter()
+        try:
+            request = json.loads(body or b'{}')
+            if not isinstance(request, dict):
+                raise TypeError("İstek gövdesi bir JSON nesnesi olmalı")
+            model_name = request.get('model', self.default_model)
+            if not MODEL_NAME_PATTERN.match(str(model_name)):
+                raise ValueError(f"Geçersiz model adı: {model_name}")
+            machine_ids, rows = self._parse_rows(request)
+        except KeyError as e:
+            self.stats.errors += 1
+            return 400, {'error': f"Eksik veya bilinmeyen alan: {e}"}
+        except (ValueError, TypeError) as e:
+            self.stats.errors += 1
+            return 400, {'error': str(e)}
+
+        try:
+            scores = await self.batcher.predict(model_name, rows)
+        except FileNotFoundError:
+            self.stats.errors += 1
+            return 404, {'error': f"Model bulunamadı: {model_name}"}
+        except Exception as e:
+            self.stats.errors += 1
+            return 500, {'error': f"Tahmin başarısız: {e}"}
+
+        levels = risk_levels(scores)
+        self.stats.record_request(time.perf_counter() - start)
+        return 200, {
+            'model': model_name,
+            'predictions': [
+                {'machine_id': machine_id, 'risk_score': float(score), 'risk_level': str(level)}
+                for machine_id, score, level in zip(machine_ids, scores, levels)
+            ]
+        }
+
+    async def serve_forever(self):
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        print(f"🚀 Skorlama servisi çalışıyor: http://{self.host}:{self.port} "
+              f"(parti: {self.batcher.max_batch_size}, bekleme: {self.batcher.max_latency * 1000:.1f} ms)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.batcher.close()
+
+
+def run_service(**kwargs):
+    """Servisi başlatır ve Ctrl+C ile durdurulana kadar çalıştırır."""
+    service = ScoringService(**kwargs)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("\n🛑 Skorlama servisi durduruldu.")
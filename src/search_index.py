@@ -0,0 +1,61 @@
+from collections import defaultdict
+import numpy as np
+
+
+class SearchIndex:
+    """Makine kimlikleri için sıralı dizi ve n-gram (1-3 karakter) indeksi.
+
+    Kimlikler küçük harfe göre sıralı tutulur. 1-3 karakterlik sorgular
+    doğrudan ilgili n-gram listesinden, daha uzun sorgular trigram
+    listelerinin kesişimiyle yanıtlanır. Sonuçlar her zaman sıralı konumlar
+    olarak döner, böylece liste görünümü ek sıralama yapmaz. İndeks ilk
+    sorguda kurulur.
+    """
+    NGRAM = 3
+
+    def __init__(self, machine_ids=()):
+        ids = sorted(machine_ids, key=lambda machine_id: (machine_id.lower(), machine_id))
+        self.ids = np.array(ids, dtype=str)
+        self._lower = np.char.lower(self.ids) if len(ids) else self.ids
+        self._ngrams = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _build_ngrams(self):
+        n = self.NGRAM
+        postings = defaultdict(list)
+        for position, key in enumerate(self._lower.tolist()):
+            #Kısa sorgular tarama yapmasın diye 1 ve 2 karakterlik parçalar da indekslenir
+            grams = {key[i:i + size] for size in range(1, n + 1) for i in range(len(key) - size + 1)}
+            for gram in grams:
+                postings[gram].append(position)
+        self._ngrams = {gram: np.array(positions, dtype=np.int64) for gram, positions in postings.items()}
+
+    def search(self, query):
+        """Sorguyu (büyük/küçük harf duyarsız) içeren kimliklerin sıralı konumları."""
+        query = query.strip().lower()
+        if not query:
+            return np.arange(len(self.ids))
+        if self._ngrams is None:
+            self._build_ngrams()
+        if len(query) <= self.NGRAM:
+            #Sorgunun kendisi indekslenmiş bir parça; liste zaten sıralı ve kesin
+            return self._ngrams.get(query, np.empty(0, dtype=np.int64))
+
+        grams = {query[i:i + self.NGRAM] for i in range(len(query) - self.NGRAM + 1)}
+        postings = [self._ngrams.get(gram) for gram in grams]
+        if any(positions is None for positions in postings):
+            return np.empty(0, dtype=np.int64)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for positions in postings[1:]:
+            candidates = np.intersect1d(candidates, positions, assume_unique=True)
+            if not len(candidates):
+                return candidates
+        #Trigramların hepsini içermek alt dizi olmayı garanti etmez; doğrula
+        return candidates[np.char.find(self._lower[candidates], query) >= 0]
+
+    def matches(self, query):
+        """Sorguyla eşleşen kimlikleri sıralı bir dizi olarak döndürür."""
+        return self.ids[self.search(query)]
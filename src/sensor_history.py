@@ -0,0 +1,201 @@
+import json
+import os
+import numpy as np
+from src.machine_profile import FEATURE_COLUMNS
+
+HISTORY_DIR = "data/history"
+HISTORY_COLUMNS = ['tool_wear', 'torque']  #Geçmişi tutulan sensörler
+HISTORY_STATS = ('mean', 'std', 'slope')
+HISTORY_FEATURES = [f"{col}_{stat}" for col in HISTORY_COLUMNS for stat in HISTORY_STATS]
+#Geçmiş özellikleriyle eğitilen modellerin girdi sütunları (ilk beşi temel özellikler)
+MODEL_COLUMNS = FEATURE_COLUMNS + HISTORY_FEATURES
+HISTORY_INDEX = [FEATURE_COLUMNS.index(col) for col in HISTORY_COLUMNS]
+
+
+class SensorHistory:
+    """Makine başına son okumaları tutan, diskte bellek eşlemeli halka tamponlar.
+
+    Her makineye bir yuva (slot) ayrılır; yuvada son `window` okuma sabit
+    boyutlu bir halka tamponda durur. Pencere üzerindeki toplamlar (Σy, Σy²,
+    Σx·y; x okumanın yaşı, en yeni 0) her yeni okumada O(1) güncellenir,
+    böylece kayan ortalama, varyans ve eğim pencere yeniden taranmadan
+    hesaplanır. Kayan nokta hatası birikmesin diye tampon her tam turda bir
+    kez baştan toplanır (okuma başına amortize O(1)).
+
+    Diziler HISTORY_DIR altında .npy dosyalarıdır ve np.load(mmap_mode='r+')
+    ile açılır; okumalar doğrudan dosyaya yazılır, flush() ile kalıcı olur.
+    """
+    WINDOW = 32
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, directory=HISTORY_DIR, window=None):
+        self.directory = directory
+        self.window = window or self.WINDOW
+        self.machine_ids = []  #yuva -> machine_id
+        self.slots = {}  #machine_id -> yuva
+        self._ids_dirty = False
+        self._open()
+
+    # ---------------------- Depolama ----------------------
+
+    def _path(self, name):
+        return os.path.join(self.directory, f"{name}.npy")
+
+    def _open(self):
+        meta_path = os.path.join(self.directory, "ids.json")
+        try:
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+            if meta['window'] != self.window or meta['columns'] != HISTORY_COLUMNS:
+                raise ValueError("Geçmiş deposu farklı bir pencereyle oluşturulmuş")
+            self._readings = np.load(self._path("readings"), mmap_mode='r+')
+            self._sums = np.load(self._path("sums"), mmap_mode='r+')
+            self._counters = np.load(self._path("counters"), mmap_mode='r+')
+        except (OSError, ValueError, KeyError):
+            self.machine_ids = []
+            self._allocate(self.INITIAL_CAPACITY)
+            return
+        self.machine_ids = meta['machine_ids']
+        self.slots = {machine_id: slot for slot, machine_id in enumerate(self.machine_ids)}
+
+    def _allocate(self, capacity):
+        """Verilen kapasitede yeni dosyalar oluşturur; mevcut yuvalar kopyalanır."""
+        os.makedirs(self.directory, exist_ok=True)
+        used = len(self.machine_ids)
+        n_columns = len(HISTORY_COLUMNS)
+        shapes = {
+            'readings': ((capacity, self.window, n_columns), np.float64),
+            'sums': ((capacity, n_columns, 3), np.float64),  #Σy, Σy², Σx·y
+            'counters': ((capacity, 2), np.int64)  #penceredeki okuma sayısı, sonraki yazma konumu
+        }
+        arrays = {}
+        for name, (shape, dtype) in shapes.items():
+            tmp_path = f"{self._path(name)}.tmp"
+            array = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=shape)
+            array[:] = 0
+            if used:
+                array[:used] = getattr(self, f"_{name}")[:used]
+            array.flush()
+            arrays[name] = array
+        for name, array in arrays.items():
+            #Eşleme dosyaya (inode) bağlıdır; yeniden adlandırma sonrası da geçerli kalır
+            os.replace(f"{self._path(name)}.tmp", self._path(name))
+            setattr(self, f"_{name}", array)
+        self._ids_dirty = True
+        self._write_ids()
+
+    def _write_ids(self):
+        if not self._ids_dirty:
+            return
+        meta_path = os.path.join(self.directory, "ids.json")
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({'window': self.window, 'columns': HISTORY_COLUMNS, 'machine_ids': self.machine_ids}, f)
+        os.replace(tmp_path, meta_path)
+        self._ids_dirty = False
+
+    def files(self):
+        """İçeriği geçmiş özelliklerini belirleyen dosyalar (önbellek özeti için)."""
+        self.flush()
+        return [os.path.join(self.directory, "ids.json"), self._path("sums"), self._path("counters")]
+
+    def flush(self):
+        for array in (self._readings, self._sums, self._counters):
+            array.flush()
+        self._write_ids()
+
+    def reset(self):
+        """Tüm geçmişi siler (veri seti yeniden işlendiğinde)."""
+        self.machine_ids = []
+        self.slots = {}
+        self._counters[:] = 0
+        self._sums[:] = 0
+        self._ids_dirty = True
+
+    def __len__(self):
+        return len(self.machine_ids)
+
+    # ---------------------- Okuma ekleme ----------------------
+
+    def _slot(self, machine_id):
+        slot = self.slots.get(machine_id)
+        if slot is None:
+            slot = len(self.machine_ids)
+            if slot >= len(self._counters):
+                self._allocate(2 * len(self._counters))
+            self.machine_ids.append(machine_id)
+            self.slots[machine_id] = slot
+            self._ids_dirty = True
+        return slot
+
+    def append(self, machine_id, values):
+        """Makineye yeni bir okuma ekler (HISTORY_COLUMNS sırasıyla); O(1)."""
+        slot = self._slot(machine_id)
+        y = np.asarray(values, dtype=np.float64)
+        sums = self._sums[slot]
+        count, head = (int(value) for value in self._counters[slot])
+        if count == self.window:
+            #En eski okuma (yaşı window-1) pencereden çıkar
+            old = self._readings[slot, head]
+            sums[:, 0] -= old
+            sums[:, 1] -= old * old
+            sums[:, 2] += (self.window - 1) * old
+            count -= 1
+        sums[:, 2] -= sums[:, 0]  #Kalan okumalar bir yaş büyür (x -> x - 1)
+        sums[:, 0] += y
+        sums[:, 1] += y * y
+        self._readings[slot, head] = y
+        head = (head + 1) % self.window
+        count += 1
+        if head == 0:
+            self._recompute(slot, count, head)
+        self._counters[slot] = (count, head)
+
+    def extend(self, machine_ids, values):
+        """Okumaları sırayla ekler; values (n, len(HISTORY_COLUMNS)) dizisidir."""
+        for machine_id, row in zip(machine_ids, np.asarray(values, dtype=np.float64)):
+            self.append(machine_id, row)
+
+    def _recompute(self, slot, count, head):
+        readings = np.roll(self._readings[slot], -head, axis=0)[self.window - count:]
+        ages = np.arange(-(count - 1), 1, dtype=np.float64)
+        sums = self._sums[slot]
+        sums[:, 0] = readings.sum(axis=0)
+        sums[:, 1] = (readings * readings).sum(axis=0)
+        sums[:, 2] = ages @ readings
+
+    # ---------------------- Özellikler ----------------------
+
+    def statistics(self, slots):
+        """Yuvalar için (ortalama, std, eğim) dizilerini döndürür; her biri (k, sütun)."""
+        count = self._counters[slots, 0].astype(np.float64)[:, None]
+        sums = self._sums[slots]
+        safe = np.maximum(count, 1.0)
+        mean = sums[:, :, 0] / safe
+        std = np.sqrt(np.maximum(sums[:, :, 1] / safe - mean * mean, 0.0))
+        #x = -(n-1) ... 0 için Σx ve Σx² kapalı formda
+        sum_x = -count * (count - 1) / 2
+        sum_xx = (count - 1) * count * (2 * count - 1) / 6
+        denominator = count * sum_xx - sum_x * sum_x
+        numerator = count * sums[:, :, 2] - sum_x * sums[:, :, 0]
+        slope = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+        return mean, std, slope
+
+    def features(self, machine_ids, current):
+        """Makineler için HISTORY_FEATURES sırasıyla (n, 6) özellik matrisi.
+
+        current: makinelerin güncel HISTORY_COLUMNS değerleri (n, 2). Geçmişi
+        olmayan makinelerde ortalama güncel değer, std ve eğim 0 kabul edilir.
+        machine_ids None ise tüm satırlar geçmişsiz sayılır.
+        """
+        current = np.asarray(current, dtype=np.float64)
+        n = len(current)
+        mean, std, slope = current.copy(), np.zeros_like(current), np.zeros_like(current)
+        if machine_ids is not None and self.machine_ids:
+            slots = np.fromiter((self.slots.get(machine_id, -1) for machine_id in machine_ids),
+                                dtype=np.intp, count=n)
+            known = np.flatnonzero(slots >= 0)
+            if len(known):
+                mean[known], std[known], slope[known] = self.statistics(slots[known])
+        #Sütun sırası: her sensör için ortalama, std, eğim
+        return np.stack([mean, std, slope], axis=2).reshape(n, len(HISTORY_FEATURES))
@@ -0,0 +1,84 @@
+import csv
+import json
+import time
+from itertools import islice
+from src.machine_manager import MachineManager
+from src.machine_profile import RAW_FEATURE_NAMES
+
+#Ham sensör dışa aktarımlarındaki sütun adlarını (köşeli parantezsiz) profil alanlarına eşler
+FIELD_ALIASES = {
+    'Product ID': 'machine_id',
+    'Type': 'machine_type',
+    **RAW_FEATURE_NAMES,
+    'Machine failure': 'failure'
+}
+
+
+def normalize_update(update):
+    """Ham veya standart sütun adlı bir kaydı profil alan adlarına çevirir."""
+    normalized = {}
+    for key, value in update.items():
+        #Veri işlemedeki gibi köşeli parantezler atılır: 'Torque [Nm]' -> 'Torque Nm'
+        key = key.replace('[', '').replace(']', '').strip()
+        normalized[FIELD_ALIASES.get(key, key)] = value
+    return normalized
+
+
+def read_updates(path):
+    """CSV, JSON Lines (.jsonl) veya JSON (.json) dosyasındaki güncellemeleri tek tek okur.
+
+    CSV ve JSON Lines satır satır okunur (dosya belleğe alınmaz); .json dosyası
+    nesnelerden oluşan bir liste (veya tek bir nesne) olarak bir kerede okunur.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.endswith(".json"):
+            updates = json.load(f)
+            if isinstance(updates, dict):
+                updates = [updates]
+            if not isinstance(updates, list) or not all(isinstance(update, dict) for update in updates):
+                raise ValueError(f"{path}: JSON dosyası nesnelerden oluşan bir liste olmalı")
+            for update in updates:
+                yield normalize_update(update)
+        elif path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield normalize_update(json.loads(line))
+        else:
+            for row in csv.DictReader(f):
+                yield normalize_update(row)
+
+
+class SensorIngestor:
+    """Makine başına sensör güncellemelerini tüm filoyu yeniden işlemeden alır.
+
+    Güncellemeler parti parti MachineManager.apply_updates ile uygulanır:
+    her parti önce günlüğe eklenir, sonra yalnızca ilgili makineler yerinde
+    güncellenir ve yeniden skorlama için işaretlenir.
+    """
+
+    def __init__(self, manager=None, batch_size=500):
+        self.manager = manager or MachineManager()
+        self.batch_size = batch_size
+
+    def ingest(self, updates):
+        """Güncelleme akışını partiler halinde uygular ve toplam istatistikleri döndürür."""
+        totals = {'applied': 0, 'created': 0, 'rejected': 0, 'batches': 0}
+        start = time.perf_counter()
+        updates = (normalize_update(update) for update in updates)
+        while True:
+            batch = list(islice(updates, self.batch_size))
+            if not batch:
+                break
+            stats = self.manager.apply_updates(batch)
+            for key, value in stats.items():
+                totals[key] += value
+            totals['batches'] += 1
+        totals['seconds'] = time.perf_counter() - start
+        return totals
+
+    def ingest_file(self, path):
+        return self.ingest(read_updates(path))
+
+    def compact(self):
+        """Günlükteki güncellemeleri sütunlu depoya yazar ve günlüğü boşaltır."""
+        self.manager.save_profiles()
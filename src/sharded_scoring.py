@@ -0,0 +1,332 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from src.machine_manager import MachineManager
+from src.model_registry import ModelRegistry, get_registry
+from src.scoring_engine import ScoringEngine, predict_risk, predict_values
+
+SHARD_ROWS = 50_000  #Parça başına en fazla satır
+SHARDS_PER_WORKER = 4  #Yük dengesi için süreç başına en az parça sayısı
+SHARDED_MIN_ROWS = 200_000  #Bu boyuttan küçük filolar tek süreçte skorlanır (havuz kurulumu karşılanmaz)
+SCALING_RESULTS_PATH = "data/scaling_report.json"
+SETUP_TIMEOUT = 120  #Süreçlerin modeli yükleyip hazır olması için en uzun bekleme (sn)
+
+#Havuz sürecinin durumu: model ve paylaşılan bellek görünümleri (initializer kurar)
+_WORKER = {}
+
+
+def shard_bounds(n_rows, n_shards):
+    """Satırları n_shards ardışık aralığa böler; [(başlangıç, bitiş), ...]."""
+    n_shards = max(1, min(n_shards, n_rows))
+    edges = np.linspace(0, n_rows, n_shards + 1).astype(np.int64)
+    return [(int(start), int(stop)) for start, stop in zip(edges[:-1], edges[1:])]
+
+
+def should_shard(n_rows, workers=None):
+    """Parçalı skorlamanın kurulum maliyetini karşılayıp karşılamayacağı.
+
+    Tek çekirdekte veya küçük filolarda süreç başlatma ve her süreçte model
+    yükleme, skorlamadan kazanılandan uzun sürer; bu durumda tek süreçte skorlanır.
+    """
+    n_cores = os.cpu_count() or 1
+    return min(workers or n_cores, n_cores) > 1 and n_rows >= SHARDED_MIN_ROWS
+
+
+def _attach(spec):
+    """(ad, şekil, dtype) ile paylaşılan bellek bloğuna kopyasız dizi görünümü açar."""
+    name, shape, dtype = spec
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _init_worker(base_dir, name, task, backend, inputs, risk, order, threads, ready, errors):
+    """Her havuz süreci modeli bir kez yükler ve paylaşılan dizilere bağlanır.
+
+    Kurulum hatası süreci öldürmez (Pool ölen süreçleri sonsuza dek yeniden
+    başlatır); hata errors kuyruğuna yazılır ve engel (barrier) kırılır, böylece
+    üst süreç beklemeden hatayı görür.
+    """
+    try:
+        from threadpoolctl import threadpool_limits
+        _WORKER['limits'] = threadpool_limits(limits=threads)  #Süreç ömrü boyunca geçerli
+        _WORKER['model'] = ModelRegistry(base_dir).get(name, task, backend=backend)
+        _WORKER['task'] = task
+        #Bloklar referansla tutulur; kapanırsa görünümler geçersiz olur
+        _WORKER['blocks'] = []
+        for key, spec in (('inputs', inputs), ('risk', risk), ('order', order)):
+            block, array = _attach(spec)
+            _WORKER['blocks'].append(block)
+            _WORKER[key] = array
+    except Exception as e:
+        errors.put(f"{type(e).__name__}: {e}")
+        ready.abort()
+        return
+    #Tüm süreçler hazır olana kadar beklenir; kurulum süresi skorlamadan ayrı ölçülür
+    try:
+        ready.wait(timeout=SETUP_TIMEOUT)
+    except threading.BrokenBarrierError:
+        pass  #Başka bir süreç başarısız oldu veya süre doldu; üst süreç havuzu kapatır
+
+
+def _score_shard(start, stop):
+    """Bir satır aralığını skorlar ve aralığın yerel sıralamasını yazar.
+
+    Regresyon modellerinde skor, kendi birimindeki ham tahmindir (kırpılmaz).
+    """
+    begin = time.perf_counter()
+    X = _WORKER['inputs'][start:stop]
+    if _WORKER['task'] == "classification":
+        scores = predict_risk(_WORKER['model'], X)
+    else:
+        scores = predict_values(_WORKER['model'], X)
+    risk = _WORKER['risk']
+    risk[start:stop] = scores
+    _WORKER['order'][start:stop] = start + np.argsort(-risk[start:stop], kind='stable')
+    return start, stop, time.perf_counter() - begin, os.getpid()
+
+
+def _score_bounds(bounds):
+    return _score_shard(*bounds)
+
+
+def merge_shards(risk, order):
+    """Parça içinde sıralı satırları tek bir küresel (azalan) sıralamada birleştirir.
+
+    Kararlı argsort (timsort) önceden sıralı parçaları koşu olarak algılar;
+    birleştirme O(n log parça) sürer ve eşit skorlarda satır sırası korunur,
+    yani sonuç np.argsort(-risk, kind='stable') ile aynıdır.
+    """
+    return order[np.argsort(-risk[order], kind='stable')]
+
+
+class ShardedScorer:
+    """Filoyu paylaşılan bellekteki özellik matrisi üzerinde satır parçaları halinde skorlar.
+
+    Özellik matrisi bir kez paylaşılan belleğe kopyalanır; havuz süreçleri onu
+    kopyalamadan görür ve skorları ile parça içi sıralamaları yine paylaşılan
+    çıktı dizilerine yazar (sonuçlar süreçler arasında taşınmaz). Model her
+    süreçte initializer ile bir kez yüklenir. Parçalar bittikçe progress
+    çağrılır; istisna fırlatan progress havuzu sonlandırarak iptal eder.
+    Model önce üst süreçte kayıt defterinden alınır, böylece eksik veya bozuk
+    model dosyası havuz kurulmadan hata verir; süreçlerdeki kurulum hataları
+    da RuntimeError olarak üst sürece taşınır (havuz beklemede kalmaz).
+    Çağrı (risk, sıralama) döndürür; son çalıştırmanın süreleri stats'tadır:
+    setup_seconds (paylaşılan bellek, süreç başlatma, model yükleme),
+    score_seconds (yalnızca parçaların skorlanması) ve merge_seconds.
+    """
+
+    def __init__(self, name, task="classification", workers=None, backend=None, registry=None,
+                 shard_rows=SHARD_ROWS):
+        self.name = name
+        self.task = task
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.backend = backend
+        self.registry = registry or get_registry()
+        self.shard_rows = shard_rows
+        self.stats = None
+
+    def __call__(self, X, progress=None):
+        start = time.perf_counter()
+        #Model yüklenemiyorsa hata burada, süreçler başlatılmadan oluşur
+        self.registry.get(self.name, self.task, backend=self.backend)
+        X = np.asarray(X, dtype=np.float64)
+        n_rows = len(X)
+        if n_rows == 0:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.intp)
+        n_shards = max(self.workers * SHARDS_PER_WORKER, -(-n_rows // self.shard_rows))
+        shards = shard_bounds(n_rows, n_shards)
+        workers = min(self.workers, len(shards))
+        threads = max(1, (os.cpu_count() or 1) // workers)  #Süreç başına iş parçacığı bütçesi
+
+        blocks = []
+        arrays = {}
+        specs = {}
+        try:
+            for key, shape, dtype in (('inputs', X.shape, np.float64), ('risk', (n_rows,), np.float64),
+                                      ('order', (n_rows,), np.intp)):
+                block = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(dtype).itemsize)
+                blocks.append(block)
+                arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+                specs[key] = (block.name, shape, dtype)
+            arrays['inputs'][:] = X
+
+            shard_seconds = []
+            pids = set()
+            done = 0
+            #spawn: GUI'nin iş parçacıkları varken fork güvenli değil
+            context = multiprocessing.get_context("spawn")
+            ready = context.Barrier(workers)
+            errors = context.Queue()
+            with context.Pool(workers, initializer=_init_worker,
+                              initargs=(self.registry.base_dir, self.name, self.task, self.backend,
+                                        specs['inputs'], specs['risk'], specs['order'], threads,
+                                        ready, errors)) as pool:
+                #İlk görev ancak tüm süreçler kurulumu bitirip engeli geçince (veya engel kırılınca) döner
+                try:
+                    pool.apply_async(os.getpid).get(timeout=SETUP_TIMEOUT + 5)
+                except multiprocessing.TimeoutError:
+                    ready.abort()
+                if ready.broken:
+                    try:
+                        reason = errors.get(timeout=1)
+                    except queue.Empty:
+                        reason = f"süreçler {SETUP_TIMEOUT} sn içinde hazır olmadı"
+                    #with bloğundan çıkış havuzu sonlandırır
+                    raise RuntimeError(f"Parçalı skorlama kurulamadı ({self.name}): {reason}")
+                setup_seconds = time.perf_counter() - start
+                score_start = time.perf_counter()
+                for shard_start, shard_stop, seconds, pid in pool.imap_unordered(_score_bounds, shards):
+                    shard_seconds.append(seconds)
+                    pids.add(pid)
+                    done += shard_stop - shard_start
+                    if progress is not None:
+                        progress(done, n_rows)
+                score_seconds = time.perf_counter() - score_start
+
+            merge_start = time.perf_counter()
+            risk = arrays['risk'].copy()
+            order = merge_shards(risk, arrays['order'])
+            merge_seconds = time.perf_counter() - merge_start
+        finally:
+            arrays = None  #Görünümler bırakılmadan blok kapatılamaz
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        self.stats = {
+            'model': self.name,
+            'machines': n_rows,
+            'workers': workers,
+            'processes': len(pids),
+            'shards': len(shards),
+            'threads_per_worker': threads,
+            'setup_seconds': setup_seconds,
+            'score_seconds': score_seconds,
+            'shard_seconds': float(np.sum(shard_seconds)),
+            'merge_seconds': merge_seconds,
+            'total_seconds': time.perf_counter() - start,
+            #Kurulum hariç, parça skorlamasının verimi
+            'machines_per_second': n_rows / score_seconds if score_seconds > 0 else float('inf')
+        }
+        return risk, order
+
+
+def score_sharded(model_name="xgboost", workers=None, task="classification", backend=None,
+                  manager=None, registry=None, engine=None, shard_rows=SHARD_ROWS, progress=None):
+    """Filoyu ShardedScorer ile skorlar; (risk, küresel sıralama, istatistikler) döndürür."""
+    registry = registry or get_registry()
+    engine = engine or ScoringEngine(manager or MachineManager())
+    engine.sync()
+    #Girdi genişliği (sensör geçmişi özellikleri) için model üst süreçte de gerekir
+    X = engine.inputs(registry.get(model_name, task, backend=backend))
+    scorer = ShardedScorer(model_name, task, workers, backend, registry, shard_rows)
+    risk, order = scorer(X, progress)
+    return risk, order, scorer.stats
+
+
+def score_in_process(model, X, task="classification"):
+    """Aynı matrisi tek süreçte skorlar; (skorlar, süre) döndürür (hızlanma tabanı)."""
+    start = time.perf_counter()
+    if task == "classification":
+        scores = predict_risk(model, X)
+    else:
+        scores = predict_values(model, X)
+    return np.asarray(scores, dtype=np.float64), time.perf_counter() - start
+
+
+def scaling_report(model_name="xgboost", worker_counts=None, task="classification", backend=None,
+                   manager=None, registry=None, shard_rows=SHARD_ROWS, target_machines=1_000_000,
+                   output_path=SCALING_RESULTS_PATH, verbose=True):
+    """Parçalı skorlamanın süreç sayısına göre hızlanmasını tek süreçli skorlamaya karşı ölçer.
+
+    Taban, aynı matrisin tek süreçte predict_risk ile skorlanmasıdır (model
+    önceden yüklü). Her süreç sayısı için kurulum (süreç başlatma ve model
+    yükleme) ile parça skorlaması ayrı ölçülür; hızlanma ve verim yalnızca
+    skorlama süresinden, uçtan uca hızlanma ise kurulum dahil süreden
+    hesaplanır. target_machines makinelik filonun tahmini süresi
+    kurulum + satır / parça verimi (birleştirme doğrusal ölçeklenir) olarak,
+    başabaş noktası da kurulumun satır başına kazançla karşılandığı filo
+    boyutu olarak raporlanır. Tek çekirdekte yalnızca tek süreçli ölçüm yapılır.
+    Sonuçlar output_path'e JSON olarak yazılır ve döndürülür.
+    """
+    import json
+    registry = registry or get_registry()
+    engine = ScoringEngine(manager or MachineManager())
+    engine.sync()
+    n_cores = os.cpu_count() or 1
+    if worker_counts is None:
+        worker_counts = [2 ** i for i in range(1, n_cores.bit_length()) if 2 ** i < n_cores]
+        worker_counts += [n_cores] if n_cores > 1 else []
+    worker_counts = sorted(set(worker_counts))
+
+    model = registry.get(model_name, task, backend=backend)
+    X = engine.inputs(model)
+    n_rows = len(X)
+    reference, baseline = score_in_process(model, X, task)
+    baseline_per_row = baseline / n_rows if n_rows else 0.0
+
+    runs = []
+    for workers in worker_counts:
+        scorer = ShardedScorer(model_name, task, workers, backend, registry, shard_rows)
+        risk, _ = scorer(X)
+        stats = scorer.stats
+        if not np.allclose(risk, reference):
+            raise RuntimeError(f"{workers} süreçli skorlar tek süreçli skorlarla eşleşmiyor")
+        per_row = (stats['score_seconds'] + stats['merge_seconds']) / n_rows
+        saving = baseline_per_row - per_row
+        speedup = baseline / stats['score_seconds'] if stats['score_seconds'] > 0 else float('inf')
+        runs.append({
+            **stats,
+            'speedup': speedup,
+            'efficiency': speedup / workers,
+            'end_to_end_speedup': baseline / stats['total_seconds'],
+            'projected_seconds': stats['setup_seconds'] + target_machines * per_row,
+            #Bu boyuttan büyük filolarda kurulum kendini amorti eder (kazanç yoksa None)
+            'break_even_machines': int(np.ceil(stats['setup_seconds'] / saving)) if saving > 0 else None
+        })
+
+    report = {
+        'model': model_name, 'task': task, 'backend': backend or "native", 'cores': n_cores,
+        'machines': n_rows, 'target_machines': target_machines,
+        'in_process': {
+            'seconds': baseline,
+            'machines_per_second': n_rows / baseline if baseline > 0 else float('inf'),
+            'projected_seconds': target_machines * baseline_per_row
+        },
+        'runs': runs
+    }
+    best = min(runs, key=lambda run: run['total_seconds'], default=None)
+    report['recommended_workers'] = best['workers'] if best and best['total_seconds'] < baseline else 1
+    if output_path:
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output_path, "w") as f:
+            json.dump(report, f, indent=2)
+    if verbose:
+        print("\n" + "=" * 50)
+        print(f"📈 ÖLÇEKLENME: {model_name} ({n_rows} makine, {n_cores} çekirdek)")
+        print("=" * 50)
+        print(f"Tek süreç: {baseline:.3f} sn ({report['in_process']['machines_per_second']:,.0f} makine/sn), "
+              f"{target_machines:,} makine için ~{report['in_process']['projected_seconds']:.1f} sn")
+        if not runs:
+            print("⚠️ Tek çekirdek: parçalı skorlama hızlanma sağlamaz, tek süreçte skorlanır")
+        else:
+            print(f"\n{'Süreç':>6}{'Kurulum (sn)':>14}{'Skorlama (sn)':>15}{'Hızlanma':>10}{'Verim':>8}"
+                  f"{'Uçtan uca':>11}{f'{target_machines:,} için (sn)':>22}{'Başabaş (makine)':>18}")
+            for run in runs:
+                break_even = "-" if run['break_even_machines'] is None else f"{run['break_even_machines']:,}"
+                print(f"{run['workers']:>6}{run['setup_seconds']:>14.2f}{run['score_seconds']:>15.3f}"
+                      f"{run['speedup']:>10.2f}{run['efficiency']:>8.0%}{run['end_to_end_speedup']:>11.2f}"
+                      f"{run['projected_seconds']:>22.1f}{break_even:>18}")
+            if report['recommended_workers'] == 1:
+                print("\n⚠️ Bu filo boyutunda parçalı skorlama kurulum maliyetini karşılamıyor; tek süreç önerilir")
+            else:
+                print(f"\n✅ Önerilen süreç sayısı: {report['recommended_workers']}")
+        if output_path:
+            print(f"\n📄 Ölçekleme raporu kaydedildi: {output_path}")
+    return report
@@ -0,0 +1,133 @@
+"""Başlangıç süresi raporu: hangi modülün içe aktarılması ne kadar sürdü.
+
+main.py --startup-report ile çalıştırıldığında ImportTimer, diğer tüm
+içe aktarmalardan önce sys.meta_path'in başına eklenir. Her modülün
+yüklenmesi (create_module + exec_module) ölçülür; bir modülün içinde
+içe aktarılan modüllerin süresi ayrı tutulur, böylece hem kapsayıcı
+(inclusive) hem de modülün kendi (self) süresi raporlanır. Rapor GUI ilk
+kez boşta kaldığında, yani pencere kullanıma hazır olduğunda yazdırılır.
+"""
+import sys
+import threading
+import time
+
+
+class _TimedLoader:
+    """Asıl yükleyiciyi sarar; bilinmeyen öznitelikler asıl yükleyiciye yönlendirilir."""
+
+    def __init__(self, loader, timer):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        #Modül asıl yükleyicisini görür (importlib.resources vb. tür kontrolleri için)
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._timer._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer._exit()
+
+
+class ImportTimer:
+    """sys.meta_path'e eklenen ve modül yükleme sürelerini ölçen bulucu (finder)."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.modules = {}  #modül adı -> [kapsayıcı süre, kendi süresi, iş parçacığı adı]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        if getattr(self._local, 'finding', False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name):
+        #[modül, başlangıç, alt modüllerde geçen süre]
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def _exit(self):
+        stack = self._stack()
+        name, start, children = stack.pop()
+        elapsed = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += elapsed
+        with self._lock:
+            self.modules[name] = [elapsed, elapsed - children, threading.current_thread().name]
+
+    def by_package(self):
+        """Üst düzey paket başına toplam (kendi) süreler, büyükten küçüğe."""
+        totals = {}
+        with self._lock:
+            items = list(self.modules.items())
+        for name, (_, own, _) in items:
+            package = name.split('.')[0]
+            totals[package] = totals.get(package, 0.0) + own
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def report(self, top=15):
+        with self._lock:
+            items = sorted(self.modules.items(), key=lambda item: item[1][1], reverse=True)
+        elapsed = time.perf_counter() - self.start
+        total = sum(own for _, (_, own, _) in items)
+        lines = [
+            "\n" + "=" * 50,
+            "🚀 BAŞLANGIÇ RAPORU",
+            "=" * 50,
+            f"Başlangıçtan ilk boşta kalmaya: {elapsed * 1000:.0f} ms",
+            f"İçe aktarılan modül: {len(items)}, toplam içe aktarma süresi: {total * 1000:.0f} ms",
+            f"\n{'Kendi (ms)':>11}{'Kapsayıcı (ms)':>16}  Modül"
+        ]
+        for name, (inclusive, own, thread) in items[:top]:
+            where = "" if thread == "MainThread" else f"  [{thread}]"
+            lines.append(f"{own * 1000:>11.1f}{inclusive * 1000:>16.1f}  {name}{where}")
+        lines.append(f"\n{'Toplam (ms)':>11}  Paket")
+        for package, own in self.by_package()[:top]:
+            lines.append(f"{own * 1000:>11.1f}  {package}")
+        return "\n".join(lines)
+
+    def print_report(self, top=15):
+        print(self.report(top))
+
+
+def install_import_timer():
+    """ImportTimer'ı kurar; diğer içe aktarmalardan önce çağrılmalıdır."""
+    return ImportTimer().install()
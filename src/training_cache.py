@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+import numpy as np
+from src.build_cache import BuildCache
+from src.machine_profile import FEATURE_COLUMNS
+from src.sensor_history import MODEL_COLUMNS
+
+TRAINING_CACHE_DIR = "data/cache/training"
+SPLIT_NAMES = ("X_train", "X_test", "y_train", "y_test")
+
+
+def load_arrays(directory, names=SPLIT_NAMES):
+    """Önbellek dizinindeki .npy dizilerini bellek eşlemeli (kopyasız) açar."""
+    return tuple(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r') for name in names)
+
+
+def as_frames(X_train, X_test, y_train, y_test):
+    """Dizileri modellerin beklediği sütun isimleriyle, veriyi kopyalamadan sarar."""
+    import pandas as pd
+    columns = MODEL_COLUMNS[:X_train.shape[1]]  #Geçmiş özellikleri varsa temel özelliklerin ardından
+    return (
+        pd.DataFrame(X_train, columns=columns, copy=False),
+        pd.DataFrame(X_test, columns=columns, copy=False),
+        pd.Series(y_train, name='failure', copy=False),
+        pd.Series(y_test, name='failure', copy=False)
+    )
+
+
+class TrainingDataCache:
+    """SMOTE ile dengelenmiş ve bölünmüş eğitim/test dizilerinin disk önbelleği.
+
+    Anahtar, işlenmiş veri dosyasının içerik özeti ile SMOTE ve bölme
+    parametrelerinden üretilir. Diziler <dizin>/<anahtar>/ altında .npy olarak
+    saklanır ve np.load(mmap_mode='r') ile kopyalanmadan açılır; eğitim alt
+    süreçleri de aynı dosyaları eşler. Dizin önce geçici adla yazılıp sonra
+    yeniden adlandırılır, yarım kalan yazma önbellek sayılmaz.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, base_dir=TRAINING_CACHE_DIR, keep=3):
+        self.base_dir = base_dir
+        self.keep = keep  #Saklanacak en fazla önbellek girdisi
+
+    def key(self, data_path, smote_params, split_params, columns=FEATURE_COLUMNS, extra_files=()):
+        """extra_files: içeriği özellikleri etkileyen diğer dosyalar (ör. sensör geçmişi)."""
+        params = {
+            'smote': smote_params,
+            'split': split_params,
+            'features': list(columns),
+            'format': self.FORMAT_VERSION
+        }
+        return BuildCache.fingerprint(files=[data_path, *extra_files], params=params)[:24]
+
+    def path(self, key):
+        return os.path.join(self.base_dir, key)
+
+    def load(self, key):
+        """Önbellekteki dizileri döndürür; yoksa None."""
+        directory = self.path(key)
+        if not os.path.exists(os.path.join(directory, "meta.json")):
+            return None
+        try:
+            arrays = load_arrays(directory)
+        except (OSError, ValueError):
+            return None
+        os.utime(directory)  #En son kullanılan girdiler budamada korunur
+        return arrays
+
+    def save(self, key, X_train, X_test, y_train, y_test):
+        directory = self.path(key)
+        tmp_dir = f"{directory}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        arrays = {
+            'X_train': np.ascontiguousarray(X_train, dtype=np.float64),
+            'X_test': np.ascontiguousarray(X_test, dtype=np.float64),
+            'y_train': np.ascontiguousarray(y_train, dtype=np.int64),
+            'y_test': np.ascontiguousarray(y_test, dtype=np.int64)
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump({name: list(array.shape) for name, array in arrays.items()}, f)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_dir, directory)
+        self._prune()
+        return directory
+
+    def _prune(self):
+        entries = [os.path.join(self.base_dir, name) for name in os.listdir(self.base_dir)
+                   if not name.endswith(".tmp")]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for directory in entries[self.keep:]:
+            shutil.rmtree(directory, ignore_errors=True)
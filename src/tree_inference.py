@@ -0,0 +1,178 @@
+import json
+import numpy as np
+
+BACKENDS = ("native", "flat")
+
+
+class FlatTreeEnsemble:
+    """Ağaç topluluğunun düz dizilerle temsil edilen tahmincisi.
+
+    Tüm ağaçların düğümleri tek bir dizide birleştirilir (özellik, eşik, sol/sağ
+    çocuk, eksik değer yönü, yaprak değeri). Yapraklar kendilerini gösterir, bu
+    yüzden en derin ağaç kadar adımda tüm satırlar ve ağaçlar birlikte NumPy ile
+    ilerletilir. Özellikler orijinal kütüphanelerdeki gibi float32'ye çevrilip
+    karşılaştırılır, böylece aynı yaprağa düşülür.
+
+    kind='mean'     -> olasılık = ağaçların yaprak değerlerinin ortalaması (Random Forest)
+    kind='logistic' -> olasılık = sigmoid(taban marj + yaprak değerleri toplamı) (XGBoost)
+    """
+    CHUNK_ROWS = 4096  #(satır x ağaç) düğüm matrisini bellekte sınırlı tutar
+    accepts_arrays = True  #predict_risk DataFrame sarmalamadan doğrudan dizi verir
+
+    def __init__(self, feature, threshold, left, right, default_left, value, roots, max_depth,
+                 kind, strict=False, base_margin=0.0, source=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.kind = kind
+        self.strict = strict  #XGBoost: x < eşik, scikit-learn: x <= eşik
+        self.base_margin = base_margin
+        self.source = source
+        self.classes_ = np.array([0, 1])
+
+    def leaves(self, X):
+        """Her satırın her ağaçta düştüğü yaprak düğümünün (global) indeksini döndürür."""
+        X = np.asarray(X, dtype=np.float32)
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        rows = np.arange(len(X))[:, None]
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            threshold = self.threshold[node]
+            go_left = x < threshold if self.strict else x <= threshold
+            missing = np.isnan(x)
+            if missing.any():
+                go_left = np.where(missing, self.default_left[node], go_left)
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict_risk(self, X):
+        """Sınıf 1 (arıza) olasılıklarını döndürür."""
+        X = np.asarray(X, dtype=np.float32)
+        risk = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), self.CHUNK_ROWS):
+            stop = start + self.CHUNK_ROWS
+            values = self.value[self.leaves(X[start:stop])]
+            if self.kind == 'mean':
+                risk[start:stop] = values.mean(axis=1)
+            else:
+                margin = self.base_margin + values.sum(axis=1, dtype=np.float64)
+                risk[start:stop] = 1.0 / (1.0 + np.exp(-margin))
+        return risk
+
+    def predict_proba(self, X):
+        risk = self.predict_risk(X)
+        return np.column_stack([1.0 - risk, risk])
+
+    def predict(self, X):
+        return (self.predict_risk(X) > 0.5).astype(np.int64)
+
+
+def _concat_trees(trees):
+    """Ağaç başına (feature, threshold, left, right, default_left, value, depth) listesini birleştirir."""
+    offsets = np.cumsum([0] + [len(tree[0]) for tree in trees[:-1]])
+    parts = list(zip(*trees))
+    feature, threshold, left, right, default_left, value = (np.concatenate(part) for part in parts[:6])
+    #Çocuk indeksleri ağaç içinden global indekse taşınır
+    shift = np.repeat(offsets, [len(tree[0]) for tree in trees])
+    left = left + shift
+    right = right + shift
+    return feature, threshold, left, right, default_left, value, offsets.astype(np.int64), max(parts[6])
+
+
+def _tree_depth(left, right):
+    """Kökten en derin yaprağa kadar olan adım sayısı (seviye seviye ilerleyerek)."""
+    depth = 0
+    frontier = np.array([0])
+    while True:
+        frontier = frontier[left[frontier] != frontier]  #Yalnızca iç düğümler ilerler
+        if not len(frontier):
+            return depth
+        frontier = np.concatenate([left[frontier], right[frontier]])
+        depth += 1
+
+
+def _from_sklearn_forest(model):
+    positive = list(model.classes_).index(1)
+    trees = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        nodes = np.arange(tree.node_count)
+        is_leaf = tree.children_left < 0
+        #Yapraklar kendilerini gösterir; özellik 0 ve eşik önemsizdir
+        left = np.where(is_leaf, nodes, tree.children_left).astype(np.int64)
+        right = np.where(is_leaf, nodes, tree.children_right).astype(np.int64)
+        feature = np.where(is_leaf, 0, tree.feature).astype(np.int64)
+        counts = tree.value[:, 0, :]
+        totals = counts.sum(axis=1)
+        value = counts[:, positive] / np.where(totals == 0, 1.0, totals)
+        missing_left = getattr(tree, 'missing_go_to_left', None)
+        default_left = np.zeros(tree.node_count, dtype=bool) if missing_left is None \
+            else np.asarray(missing_left, dtype=bool)
+        trees.append((feature, tree.threshold.astype(np.float64), left, right, default_left, value,
+                      _tree_depth(left, right)))
+    feature, threshold, left, right, default_left, value, roots, depth = _concat_trees(trees)
+    return FlatTreeEnsemble(feature, threshold, left, right, default_left, value, roots, depth,
+                            kind='mean', strict=False, source=type(model).__name__)
+
+
+def _from_xgboost(model):
+    booster = model.get_booster()
+    config = json.loads(booster.save_raw(raw_format='json'))
+    learner = config['learner']
+    objective = learner['objective']['name']
+    if objective != 'binary:logistic' or learner['gradient_booster']['name'] != 'gbtree':
+        return None
+    base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+    base_margin = float(np.log(base_score / (1.0 - base_score)))
+
+    trees = []
+    for tree in learner['gradient_booster']['model']['trees']:
+        left = np.asarray(tree['left_children'], dtype=np.int64)
+        right = np.asarray(tree['right_children'], dtype=np.int64)
+        nodes = np.arange(len(left))
+        is_leaf = left < 0
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        left = np.where(is_leaf, nodes, left)
+        right = np.where(is_leaf, nodes, right)
+        feature = np.where(is_leaf, 0, np.asarray(tree['split_indices'], dtype=np.int64))
+        #Yapraklarda split_conditions yaprak ağırlığını tutar
+        value = np.where(is_leaf, conditions, np.float32(0))
+        default_left = np.asarray(tree['default_left'], dtype=bool)
+        trees.append((feature, conditions, left, right, default_left, value, _tree_depth(left, right)))
+    feature, threshold, left, right, default_left, value, roots, depth = _concat_trees(trees)
+    return FlatTreeEnsemble(feature, threshold, left, right, default_left, value, roots, depth,
+                            kind='logistic', strict=True, base_margin=base_margin, source=type(model).__name__)
+
+
+def compile_model(model):
+    """Desteklenen ağaç topluluklarını FlatTreeEnsemble'a çevirir; desteklenmiyorsa None döner."""
+    name = type(model).__name__
+    if name == 'RandomForestClassifier':
+        flat = _from_sklearn_forest(model)
+    elif name == 'XGBClassifier':
+        flat = _from_xgboost(model)
+    else:
+        return None
+    if flat is not None:
+        #Sensör geçmişiyle eğitilen modellerde girdi genişliği korunur
+        flat.n_features_in_ = getattr(model, 'n_features_in_', None)
+    return flat
+
+
+def verify(model, flat, X, atol=1e-6, expected=None):
+    """Düz tahmincinin olasılıklarını orijinal modelle karşılaştırır; en büyük farkı döndürür.
+
+    expected: modelin X için önceden hesaplanmış sınıf 1 olasılıkları (verilmezse hesaplanır)
+    """
+    if expected is None:
+        expected = model.predict_proba(X)[:, 1]
+    actual = flat.predict_risk(np.asarray(X, dtype=np.float64))
+    max_diff = float(np.max(np.abs(expected - actual))) if len(expected) else 0.0
+    if max_diff > atol:
+        raise ValueError(f"Düz tahminci {flat.source} modelinden farklı sonuç veriyor (en büyük fark: {max_diff:.2e})")
+    return max_diff
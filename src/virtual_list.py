@@ -0,0 +1,136 @@
+import tkinter as tk
+from tkinter import ttk, font as tkfont
+import numpy as np
+
+
+class VirtualList(ttk.Frame):
+    """Yalnızca görünen satırları çizen sanal liste.
+
+    Öğeler herhangi bir dizi (liste veya NumPy dizisi) olabilir; Listbox'a her
+    zaman yalnızca ekrana sığan pencere eklenir, kaydırma çubuğu ise tüm öğe
+    sayısına göre çalışır. Böylece 100 bin makinelik bir listeyi göstermek ve
+    filtrelemek, görünen satır sayısıyla orantılı maliyetlidir.
+    Seçim değiştiğinde <<ListboxSelect>> olayı üretilir.
+    """
+
+    def __init__(self, master, width=25, height=25, **kwargs):
+        super().__init__(master, **kwargs)
+        self.items = []
+        self.offset = 0
+        self.selected_index = None
+        self.visible_rows = height
+
+        self.listbox = tk.Listbox(self, width=width, height=height, activestyle='none', exportselection=False)
+        self.line_height = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<MouseWheel>", self._on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll(3))
+        self.listbox.bind("<Up>", lambda event: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda event: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda event: self._move_selection(-self.visible_rows))
+        self.listbox.bind("<Next>", lambda event: self._move_selection(self.visible_rows))
+
+    # ---------------------- Veri ----------------------
+
+    def set_items(self, items):
+        """Gösterilecek öğeleri değiştirir ve listenin başına döner."""
+        self.items = items
+        self.offset = 0
+        self.selected_index = None
+        self._render()
+
+    def __len__(self):
+        return len(self.items)
+
+    def get(self, index):
+        return str(self.items[index])
+
+    def selected(self):
+        """Seçili öğeyi döndürür (seçim yoksa None)."""
+        if self.selected_index is None or self.selected_index >= len(self.items):
+            return None
+        return self.get(self.selected_index)
+
+    def index_of(self, value):
+        """Öğenin konumunu döndürür (listede yoksa None)."""
+        positions = np.flatnonzero(np.asarray(self.items) == value)
+        return int(positions[0]) if len(positions) else None
+
+    def select(self, index):
+        """Verilen konumdaki öğeyi seçer ve görünür hale getirir."""
+        self.selected_index = index
+        self.see(index)
+
+    # ---------------------- Kaydırma ----------------------
+
+    def see(self, index):
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.visible_rows:
+            self.offset = index - self.visible_rows + 1
+        self._render()
+
+    def scroll(self, rows):
+        self._set_offset(self.offset + rows)
+
+    def _set_offset(self, offset):
+        offset = max(0, min(int(offset), max(len(self.items) - self.visible_rows, 0)))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._set_offset(float(amount) * len(self.items))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_resize(self, event):
+        rows = max(event.height // self.line_height, 1)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self._render()
+
+    # ---------------------- Seçim ----------------------
+
+    def _on_select(self, event):
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        self.selected_index = self.offset + selection[0]
+        self.event_generate("<<ListboxSelect>>")
+
+    def _move_selection(self, step):
+        if not len(self.items):
+            return "break"
+        current = self.offset if self.selected_index is None else self.selected_index
+        self.select(max(0, min(current + step, len(self.items) - 1)))
+        self.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    # ---------------------- Çizim ----------------------
+
+    def _render(self):
+        window = self.items[self.offset:self.offset + self.visible_rows]
+        self.listbox.delete(0, tk.END)
+        if len(window):
+            self.listbox.insert(tk.END, *[str(item) for item in window])
+        if self.selected_index is not None and self.offset <= self.selected_index < self.offset + len(window):
+            self.listbox.selection_set(self.selected_index - self.offset)
+
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.offset / total, min((self.offset + self.visible_rows) / total, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
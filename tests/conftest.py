@@ -0,0 +1,21 @@
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Depodaki eğitilmiş modeller ve profillerle, yazmaları geçici dizine giden çalışma dizini."""
+    for name in ("models", "machine_profiles"):
+        source = os.path.join(ROOT, name)
+        if not os.path.isdir(source):
+            pytest.skip(f"{name}/ bulunamadı")
+        os.symlink(source, tmp_path / name)
+    (tmp_path / "data").mkdir()
+    monkeypatch.chdir(tmp_path)
+    from src import model_registry
+    monkeypatch.setattr(model_registry, "_default_registry", None)
+    return tmp_path
@@ -0,0 +1,78 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.fleet_table import FleetTable  # noqa: E402
+from src.machine_profile import FEATURE_COLUMNS, MachineProfile  # noqa: E402
+
+
+def _profile(i):
+    features = {col: float(i * 10 + offset) for offset, col in enumerate(FEATURE_COLUMNS)}
+    features['failure'] = i % 2
+    return MachineProfile(f"M{i:03d}", "LMH"[i % 3], features, created_at="2024-01-01 00:00:00",
+                          last_updated=f"2024-02-{1 + i % 28:02d} 10:30:00")
+
+
+def _assert_consistent(table, expected):
+    assert sorted(table) == sorted(expected)
+    assert len(table.feature_matrix()) == len(table.failure_array()) == len(table.type_array()) == len(expected)
+    for machine_id, profile in expected.items():
+        row = table.row_index[machine_id]
+        assert table.machine_ids[row] == machine_id
+        view = table[machine_id]
+        assert view.machine_type == profile.machine_type
+        assert dict(view.features) == profile.features
+        assert view.last_updated == profile.last_updated
+        np.testing.assert_array_equal(table.feature_matrix()[row], [profile.features[c] for c in FEATURE_COLUMNS])
+
+
+def test_insert_grows_capacity_and_keeps_rows():
+    table = FleetTable()
+    expected = {}
+    capacities = set()
+    for i in range(100):
+        profile = _profile(i)
+        table[profile.machine_id] = profile
+        expected[profile.machine_id] = profile
+        capacities.add(len(table._failure))
+    #Kapasite her seferinde ikiye katlanır (en az 16): yeniden ayırma sayısı logaritmik
+    assert sorted(capacities) == [16, 32, 64, 128]
+    _assert_consistent(table, expected)
+
+
+def test_delete_moves_last_row_into_the_gap():
+    table = FleetTable()
+    expected = {}
+    for i in range(20):
+        profile = _profile(i)
+        table[profile.machine_id] = expected[profile.machine_id] = profile
+
+    for machine_id in ("M005", "M019", "M000", "M010"):
+        del table[machine_id]
+        del expected[machine_id]
+        _assert_consistent(table, expected)
+    assert table.machine_ids[0] == "M017"  #M000 silinince o anki son satır başa taşındı
+
+    #Silinen kimlik yeniden eklenince sona yazılır
+    table["M005"] = expected["M005"] = _profile(5)
+    assert table.machine_ids[-1] == "M005"
+    _assert_consistent(table, expected)
+
+
+def test_update_in_place_and_columns_round_trip():
+    table = FleetTable()
+    for i in range(10):
+        profile = _profile(i)
+        table[profile.machine_id] = profile
+    view = table["M003"]
+    view.features['torque'] = 99.5
+    view.features['failure'] = 1
+    table["M003"] = view  #Aynı satırın görünümü kopyalanmaz; değişiklik zaten yerinde
+    assert table["M003"].features['torque'] == 99.5
+
+    copy = FleetTable()
+    copy.load_columns(table.to_columns())
+    assert copy.machine_ids == table.machine_ids
+    np.testing.assert_array_equal(copy.feature_matrix(), table.feature_matrix())
+    np.testing.assert_array_equal(copy.failure_array(), table.failure_array())
+    assert [copy[m].last_updated for m in copy] == [table[m].last_updated for m in table]
@@ -0,0 +1,43 @@
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("xgboost")
+pytest.importorskip("threadpoolctl")
+
+from src.cli import main  # noqa: E402
+
+
+def _classifiers():
+    return sorted(name[:-len(".joblib")] for name in os.listdir("models/trained_models/classification"))
+
+
+def test_compare_excludes_regression_by_default(workspace):
+    main(["compare", "--workers", "1", "--output", "data/comparison.csv"])
+    df = pd.read_csv("data/comparison.csv")
+    classifiers = _classifiers()
+    assert len(df) > 0
+    assert not any(column.startswith("value_") for column in df.columns)
+    assert sorted(column[len("score_"):] for column in df.columns if column.startswith("score_")) == classifiers
+    np.testing.assert_allclose(df["ensemble_score"], df[[f"score_{name}" for name in classifiers]].mean(axis=1), atol=1e-5)
+
+
+def test_compare_shows_regression_as_raw_values(workspace):
+    if not os.path.isdir("models/trained_models/regression"):
+        pytest.skip("regresyon modeli yok")
+    main(["compare", "--workers", "1", "--regression", "--output", "data/comparison.csv"])
+    df = pd.read_csv("data/comparison.csv")
+    classifiers = _classifiers()
+    value_columns = [column for column in df.columns if column.startswith("value_")]
+    assert value_columns
+    for column in value_columns:
+        #Ham tahminler (takım aşınması, dakika) kırpılmaz, sabit 1.0 olmaz
+        assert df[column].nunique() > 1
+        assert df[column].max() > 1.0
+    #Risk, uyum ve sıra hesaplarına yalnızca sınıflandırıcılar katılır
+    assert sorted(column[len("rank_delta_"):] for column in df.columns
+                  if column.startswith("rank_delta_")) == classifiers
+    np.testing.assert_allclose(df["ensemble_score"], df[[f"score_{name}" for name in classifiers]].mean(axis=1), atol=1e-5)
+    assert df["ensemble_score"].between(0, 1).all()
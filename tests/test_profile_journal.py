@@ -0,0 +1,60 @@
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.machine_manager import MachineManager  # noqa: E402
+from src.profile_journal import ProfileJournal  # noqa: E402
+
+
+def _truncate_last_line(path, keep=15):
+    with open(path, "rb") as f:
+        content = f.read()
+    last_start = content.rstrip(b"\n").rfind(b"\n") + 1
+    with open(path, "wb") as f:
+        f.write(content[:last_start + keep])
+
+
+def _manager(tmp_path):
+    return MachineManager(store_path=str(tmp_path / "profiles.npz"), profiles_dir=str(tmp_path / "none"),
+                          journal_path=str(tmp_path / "journal.jsonl"))
+
+
+def test_replay_skips_truncated_line_and_append_starts_fresh(tmp_path):
+    journal = ProfileJournal(str(tmp_path / "journal.jsonl"))
+    journal.append([{'machine_id': f"M{i}", 'features': {'torque': i}} for i in range(3)])
+    _truncate_last_line(journal.path)
+    assert [record['machine_id'] for record in journal.replay()] == ["M0", "M1"]
+
+    journal = ProfileJournal(journal.path)
+    journal.append([{'machine_id': "M9", 'features': {'torque': 9}}])
+    assert [record['machine_id'] for record in journal.replay()] == ["M0", "M1", "M9"]
+
+
+def test_truncated_journal_recovers_and_compacts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = _manager(tmp_path)
+    for i, machine_type in enumerate("LMH"):
+        manager.create_machine(f"M{i}", machine_type, {'air_temp': 300, 'process_temp': 310,
+                                                       'rotational_speed': 1500, 'torque': 40, 'tool_wear': i})
+    assert not os.path.exists(manager.journal.path)  #create_machine depoyu yazıp günlüğü boşaltır
+
+    manager.apply_updates([{'machine_id': "M0", 'torque': 50}, {'machine_id': "M1", 'torque': 60}])
+    _truncate_last_line(manager.journal.path)  #İkinci kayıt yazılırken çökme
+
+    recovered = _manager(tmp_path)
+    assert recovered.machines["M0"].features['torque'] == 50
+    assert recovered.machines["M1"].features['torque'] == 40
+
+    recovered.apply_updates([{'machine_id': "M2", 'tool_wear': 99}])
+    reloaded = _manager(tmp_path)
+    assert reloaded.machines["M0"].features['torque'] == 50
+    assert reloaded.machines["M2"].features['tool_wear'] == 99
+
+    monkeypatch.setattr(MachineManager, "COMPACT_AFTER", 1)
+    reloaded.apply_updates([{'machine_id': "M1", 'torque': 70}])
+    assert not os.path.exists(reloaded.journal.path) and reloaded.journal.entries == 0
+
+    compacted = _manager(tmp_path)
+    np.testing.assert_array_equal(compacted.machines.feature_matrix(), reloaded.machines.feature_matrix())
+    assert [compacted.machines[m].features['torque'] for m in ("M0", "M1", "M2")] == [50, 70, 40]
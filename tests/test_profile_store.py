@@ -0,0 +1,64 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.profile_store import STORE_DTYPES, ProfileStore  # noqa: E402
+
+
+def _records(n=6):
+    return [{
+        'machine_id': f"M{i:03d}",
+        'machine_type': "LMH"[i % 3],
+        'features': {'air_temp': 300.0 + i, 'process_temp': 310.5, 'rotational_speed': 1500.0 + 10 * i,
+                     'torque': 40.25, 'tool_wear': float(i), 'failure': i % 2},
+        'created_at': "2024-01-01 00:00:00",
+        'last_updated': f"2024-01-0{1 + i % 5} 12:00:00"
+    } for i in range(n)]
+
+
+def test_npz_round_trip(tmp_path):
+    store = ProfileStore(str(tmp_path / "nested" / "profiles.npz"))
+    assert store.load() is None
+    columns = ProfileStore.columns_from_records(_records())
+    store.save(columns)
+    loaded = store.load()
+
+    assert set(loaded) == set(STORE_DTYPES)
+    for name, dtype in STORE_DTYPES.items():
+        assert loaded[name].dtype == np.dtype(dtype) or dtype is str and loaded[name].dtype.kind == 'U'
+        np.testing.assert_array_equal(loaded[name], columns[name])
+    assert list(ProfileStore.records_from_columns(loaded)) == _records()
+    assert not (tmp_path / "nested" / "profiles.npz.tmp").exists()
+
+
+def test_merge_unchanged_keeps_timestamps_of_unchanged_rows():
+    old = ProfileStore.columns_from_records(_records())
+    records = _records()[1:]  #M000 silindi
+    records[0]['features']['torque'] = 55.0  #M001 özelliği değişti
+    records[1]['machine_type'] = 'H'  #M002 tipi değişti
+    records.append({**_records(7)[6], 'machine_id': "M999"})  #Yeni makine
+    records.reverse()  #Satır sırası eşleşmeyi etkilememeli
+    for record in records:
+        record['created_at'] = record['last_updated'] = "2025-06-01 08:00:00"
+    new = ProfileStore.columns_from_records(records)
+
+    merged, same = ProfileStore.merge_unchanged(old, new)
+    ids = merged['machine_id'].tolist()
+    assert dict(zip(ids, same.tolist())) == {
+        'M999': False, 'M005': True, 'M004': True, 'M003': True, 'M002': False, 'M001': False
+    }
+    old_rows = [ProfileStore.build_index(old).get(machine_id) for machine_id in ids]
+    for row, (machine_id, unchanged) in enumerate(zip(ids, same.tolist())):
+        if machine_id == 'M999':
+            assert merged['created_at'][row] == "2025-06-01 08:00:00"
+        else:
+            assert merged['created_at'][row] == old['created_at'][old_rows[row]]
+        expected = old['last_updated'][old_rows[row]] if unchanged else "2025-06-01 08:00:00"
+        assert merged['last_updated'][row] == expected
+    np.testing.assert_array_equal(merged['torque'], new['torque'])
+
+
+def test_merge_unchanged_without_old_store():
+    new = ProfileStore.columns_from_records(_records())
+    merged, same = ProfileStore.merge_unchanged(None, new)
+    assert merged is new and not same.any()
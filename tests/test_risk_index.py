@@ -0,0 +1,41 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.risk_index import RiskIndex  # noqa: E402
+
+
+def _expected_order(risk, types, machine_type=None):
+    order = np.argsort(-risk, kind='stable')
+    return order if machine_type is None else order[types[order] == machine_type]
+
+
+def _check(index, risk, types):
+    for machine_type in (None, 'L', 'M', 'H', 'X'):
+        expected = _expected_order(risk, types, machine_type)
+        np.testing.assert_array_equal(index.page(0, len(risk), machine_type)[0], expected)
+        assert index.count(machine_type) == len(expected)
+        for min_score in (0.0, 0.25, 0.5, 0.95, 1.0):
+            above = expected[risk[expected] > min_score]
+            np.testing.assert_array_equal(index.above(min_score, machine_type), above)
+            assert index.count(machine_type, min_score) == len(above)
+            for page in (0, 1, 3):
+                rows, total = index.page(page, 7, machine_type, min_score)
+                assert total == len(above)
+                np.testing.assert_array_equal(rows, above[page * 7:page * 7 + 7])
+
+
+def test_partial_updates_match_stable_argsort():
+    rng = np.random.default_rng(3)
+    n = 400
+    risk = rng.integers(0, 20, size=n) / 20  #Eşit skorlar kararlı sırayı sınar
+    types = rng.choice(np.array(['L', 'M', 'H']), size=n)
+    index = RiskIndex(risk, types)
+    _check(index, risk, types)
+
+    for _ in range(25):
+        risk = risk.copy()
+        rows = rng.choice(n, size=int(rng.integers(0, 30)), replace=False)
+        risk[rows] = rng.integers(0, 20, size=len(rows)) / 20
+        index.update(rows, risk)
+        _check(index, risk, types)
@@ -0,0 +1,99 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.machine_manager import MachineManager  # noqa: E402
+from src.machine_profile import FEATURE_COLUMNS  # noqa: E402
+from src.scoring_engine import ScoringEngine  # noqa: E402
+from src.sensor_history import MODEL_COLUMNS  # noqa: E402
+
+
+class _StubModel:
+    """sklearn gerektirmeyen, skorladığı satır sayısını sayan deterministik model."""
+    accepts_arrays = True
+
+    def __init__(self, width=len(FEATURE_COLUMNS)):
+        self.n_features_in_ = width
+        self.weights = np.linspace(0.1, 0.9, width)
+        self.scored_rows = 0
+
+    def predict_risk(self, X):
+        self.scored_rows += len(X)
+        return 1 / (1 + np.exp(-(X @ self.weights) / 1000))
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = MachineManager(store_path=str(tmp_path / "profiles.npz"), profiles_dir=str(tmp_path / "none"),
+                             journal_path=str(tmp_path / "journal.jsonl"))
+    rng = np.random.default_rng(7)
+    for i in range(50):
+        features = dict(zip(FEATURE_COLUMNS, rng.uniform([295, 305, 1200, 10, 0], [305, 315, 2800, 70, 250])))
+        features['failure'] = 0
+        manager.create_machine(f"M{i:03d}", "LMH"[i % 3], features, persist=False)
+    return manager
+
+
+def _full_scores(manager, model):
+    return ScoringEngine(manager).risk_scores("fresh", lambda: model)
+
+
+@pytest.mark.parametrize("width", [len(FEATURE_COLUMNS), len(MODEL_COLUMNS)])
+def test_partial_rescore_matches_full_rescore(manager, width):
+    model = _StubModel(width)
+    engine = ScoringEngine(manager)
+    engine.risk_index("k", lambda: model)
+    assert model.scored_rows == 50
+
+    machine = manager.machines["M007"]
+    machine.features['torque'] = 65.0
+    manager.save_machine(machine)
+    manager.apply_updates([
+        {'machine_id': 'M010', 'tool_wear': 240},
+        {'machine_id': 'M020', 'torque': 12.5, 'air_temp': 299.0},
+        {'machine_id': 'M010', 'torque': 55.0},
+    ])
+
+    model.scored_rows = 0
+    risk = engine.risk_scores("k", lambda: model)
+    assert model.scored_rows == 3
+    np.testing.assert_allclose(risk, _full_scores(manager, _StubModel(width)))
+    np.testing.assert_array_equal(engine.risk_index("k", lambda: model).order,
+                                  np.argsort(-risk, kind='stable'))
+
+
+def test_primed_scores_rescore_only_later_changes(manager):
+    model = _StubModel()
+    engine = ScoringEngine(manager)
+    engine.sync()
+    version = manager.version
+    engine.prime("k", _full_scores(manager, _StubModel()), version)
+
+    manager.apply_updates([{'machine_id': 'M003', 'rotational_speed': 2750}])
+    risk = engine.risk_scores("k", lambda: model)
+    assert model.scored_rows == 1
+    np.testing.assert_allclose(risk, _full_scores(manager, _StubModel()))
+
+
+def test_added_machine_forces_rebuild(manager):
+    model = _StubModel()
+    engine = ScoringEngine(manager)
+    engine.risk_scores("k", lambda: model)
+
+    features = dict(manager.machines["M000"].features)
+    features['tool_wear'] = 200.0
+    manager.create_machine("M999", "H", features, persist=False)
+    model.scored_rows = 0
+    risk = engine.risk_scores("k", lambda: model)
+    assert model.scored_rows == 51
+    assert engine.machine_ids[-1] == "M999"
+    np.testing.assert_allclose(risk, _full_scores(manager, _StubModel()))
+
+
+def test_snapshot_ignores_edits_until_sync(manager):
+    engine = ScoringEngine(manager)
+    engine.sync()
+    before = engine.features.copy()
+    manager.machines["M001"].features['torque'] = 69.0  #Kayıt edilmemiş düzenleme anlık kopyayı değiştirmez
+    np.testing.assert_array_equal(engine.features, before)
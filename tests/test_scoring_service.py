@@ -0,0 +1,148 @@
+import asyncio
+import json
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.machine_manager import MachineManager  # noqa: E402
+from src.scoring_service import MicroBatcher, ScoringService  # noqa: E402
+
+FEATURES = {'air_temp': 300.0, 'process_temp': 310.0, 'rotational_speed': 1500.0, 'torque': 40.0, 'tool_wear': 100.0}
+
+
+class _StubModel:
+    accepts_arrays = True
+    n_features_in_ = 5
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_risk(self, X):
+        self.batches.append(len(X))
+        return X[:, 4] / 1000
+
+
+class _StubRegistry:
+    """Tek bir 'stub' modeli sunan, sklearn gerektirmeyen kayıt defteri."""
+
+    def __init__(self):
+        self.model = _StubModel()
+
+    def get(self, name, task="classification", backend=None):
+        if name != "stub":
+            raise FileNotFoundError(name)
+        return self.model
+
+    def available(self):
+        return ["stub"]
+
+    def stats(self):
+        return {}
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = MachineManager(store_path=str(tmp_path / "profiles.npz"), profiles_dir=str(tmp_path / "none"),
+                             journal_path=str(tmp_path / "journal.jsonl"))
+    manager.create_machine("M1", "L", FEATURES, persist=False)
+    service = ScoringService(port=0, default_model="stub", max_latency_ms=1.0, manager=manager,
+                             registry=_StubRegistry())
+    yield service
+    service.batcher.close()
+
+
+def _exchange(service, raw_requests):
+    """Her ham isteği servise ayrı bir bağlantıdan gönderir; (durum, gövde) listesi döndürür."""
+    async def run():
+        server = await asyncio.start_server(service._handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        responses = []
+        async with server:
+            for raw in raw_requests:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(raw)
+                await writer.drain()
+                response = await asyncio.wait_for(reader.read(), timeout=5)
+                writer.close()
+                head, _, body = response.partition(b"\r\n\r\n")
+                responses.append((int(head.split()[1]), json.loads(body) if body else None))
+        return responses
+    return asyncio.run(run())
+
+
+def _post(body, content_length=None):
+    body = body.encode() if isinstance(body, str) else body
+    length = len(body) if content_length is None else content_length
+    return (f"POST /predict HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n"
+            "Connection: close\r\n\r\n").encode() + body
+
+
+def test_rejects_malformed_requests_with_400(service):
+    responses = _exchange(service, [
+        b"GARBAGE\r\n\r\n",
+        b"GET /health\r\n\r\n",
+        _post('{"model": "stub"}', content_length=-5),
+        _post('{"model": "stub"}', content_length="abc"),
+        _post('[1, 2]'),
+    ])
+    assert [status for status, _ in responses] == [400] * 5
+    assert all('error' in payload for _, payload in responses)
+    assert service.stats.errors == 5
+
+
+def test_predict_round_trip(service):
+    responses = _exchange(service, [
+        b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n",
+        _post(json.dumps({'machine_id': 'M1'})),
+        _post(json.dumps({'instances': [dict(FEATURES, tool_wear=200.0), FEATURES]})),
+        _post(json.dumps({'model': 'missing', 'features': FEATURES})),
+    ])
+    assert responses[0] == (200, {'status': 'ok', 'machines': 1})
+    status, payload = responses[1]
+    assert status == 200 and payload['predictions'][0]['machine_id'] == 'M1'
+    assert payload['predictions'][0]['risk_score'] == pytest.approx(0.1)
+    status, payload = responses[2]
+    assert status == 200
+    assert [p['risk_score'] for p in payload['predictions']] == pytest.approx([0.2, 0.1])
+    assert responses[3][0] == 404
+
+
+def _rows(*tool_wear):
+    rows = np.tile([300.0, 310.0, 1500.0, 40.0, 0.0], (len(tool_wear), 1))
+    rows[:, 4] = tool_wear
+    return rows
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    registry = _StubRegistry()
+
+    async def run():
+        batcher = MicroBatcher(registry, max_batch_size=100, max_latency_ms=50)
+        try:
+            return await asyncio.gather(*(batcher.predict("stub", _rows(i, i + 1)) for i in range(0, 10, 2)))
+        finally:
+            batcher.close()
+
+    results = asyncio.run(run())
+    assert registry.model.batches == [10]
+    for i, scores in zip(range(0, 10, 2), results):
+        np.testing.assert_allclose(scores, [i / 1000, (i + 1) / 1000])
+
+
+def test_micro_batcher_flushes_when_batch_is_full():
+    registry = _StubRegistry()
+
+    async def run():
+        #Bekleme süresi çok uzun: yalnızca parti boyutuna ulaşılması skorlamayı başlatabilir
+        batcher = MicroBatcher(registry, max_batch_size=4, max_latency_ms=60_000)
+        try:
+            full = asyncio.gather(batcher.predict("stub", _rows(1, 2)), batcher.predict("stub", _rows(3, 4)))
+            return await asyncio.wait_for(full, timeout=5), batcher.stats.snapshot()
+        finally:
+            batcher.close()
+
+    results, stats = asyncio.run(run())
+    assert registry.model.batches == [4]
+    assert stats['batches'] == 1 and stats['batch_size']['max'] == 4
+    np.testing.assert_allclose(np.concatenate(results), [0.001, 0.002, 0.003, 0.004])
@@ -0,0 +1,18 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.search_index import SearchIndex  # noqa: E402
+
+
+def _brute_force(index, query):
+    query = query.strip().lower()
+    return np.array([i for i, machine_id in enumerate(index.ids.tolist()) if query in machine_id.lower()],
+                    dtype=np.int64)
+
+
+@pytest.mark.parametrize("query", ["", "m", "M", "0", "7", "l0", "-1", "m-0", "h-01", "L-0123", "xyz", "  m1 "])
+def test_search_matches_substring_scan(query):
+    ids = [f"{kind}-{i:04d}" for i, kind in zip(range(500), "LMH" * 200)] + ["M1", "m10", "Hm"]
+    index = SearchIndex(ids)
+    np.testing.assert_array_equal(index.search(query), _brute_force(index, query))
@@ -0,0 +1,36 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.machine_manager import MachineManager  # noqa: E402
+from src.sensor_history import HISTORY_FEATURES  # noqa: E402
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  #Geçmiş deposu varsayılan göreli dizine (data/history) yazılır
+    return MachineManager(store_path=str(tmp_path / "profiles.npz"), profiles_dir=str(tmp_path / "none"),
+                          journal_path=str(tmp_path / "journal.jsonl"))
+
+
+def test_batch_keeps_every_reading_in_order(manager):
+    base = {'air_temp': 300.0, 'process_temp': 310.0, 'rotational_speed': 1500.0}
+    stats = manager.apply_updates([
+        {'machine_id': 'M1', 'machine_type': 'L', **base, 'tool_wear': 10, 'torque': 40},
+        {'machine_id': 'M1', 'machine_type': 'L', 'tool_wear': 20},
+        {'machine_id': 'M1', 'machine_type': 'L', 'tool_wear': 30, 'torque': 44},
+        {'machine_id': 'M1', 'machine_type': 'L', 'torque': 46},
+        {'machine_id': 'M1', 'machine_type': 'L', 'air_temp': 301.0},  #Geçmiş sütunu yok: okuma değil
+    ])
+    assert stats['rejected'] == 0
+
+    expected = {
+        'tool_wear': np.array([10.0, 20.0, 30.0, 30.0]),
+        'torque': np.array([40.0, 40.0, 44.0, 46.0])
+    }
+    features = manager.history.features(['M1'], [[30.0, 46.0]])[0]
+    actual = dict(zip(HISTORY_FEATURES, features))
+    for column, readings in expected.items():
+        assert actual[f"{column}_mean"] == pytest.approx(readings.mean())
+        assert actual[f"{column}_std"] == pytest.approx(readings.std())
+        assert actual[f"{column}_slope"] == pytest.approx(np.polyfit(np.arange(len(readings)), readings, 1)[0])
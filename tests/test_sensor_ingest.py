@@ -0,0 +1,36 @@
+import json
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.sensor_ingest import read_updates  # noqa: E402
+
+RAW_ROWS = [
+    {'Product ID': 'M1', 'Type': 'L', 'Torque [Nm]': 41.5, 'Tool wear [min]': 12},
+    {'Product ID': 'M2', 'Air temperature [K]': 299.1, 'Machine failure': 1}
+]
+EXPECTED = [
+    {'machine_id': 'M1', 'machine_type': 'L', 'torque': 41.5, 'tool_wear': 12},
+    {'machine_id': 'M2', 'air_temp': 299.1, 'failure': 1}
+]
+
+
+def test_json_jsonl_and_csv_read_the_same_updates(tmp_path):
+    (tmp_path / "updates.json").write_text(json.dumps(RAW_ROWS, indent=2))
+    (tmp_path / "updates.jsonl").write_text("".join(json.dumps(row) + "\n" for row in RAW_ROWS) + "\n")
+    (tmp_path / "updates.csv").write_text(
+        "Product ID,Type,Torque [Nm],Tool wear [min]\nM1,L,41.5,12\n")
+
+    assert list(read_updates(str(tmp_path / "updates.json"))) == EXPECTED
+    assert list(read_updates(str(tmp_path / "updates.jsonl"))) == EXPECTED
+    assert list(read_updates(str(tmp_path / "updates.csv"))) == [
+        {'machine_id': 'M1', 'machine_type': 'L', 'torque': '41.5', 'tool_wear': '12'}
+    ]
+
+
+def test_json_must_hold_objects(tmp_path):
+    (tmp_path / "single.json").write_text(json.dumps(RAW_ROWS[0]))
+    assert list(read_updates(str(tmp_path / "single.json"))) == EXPECTED[:1]
+    (tmp_path / "bad.json").write_text("[1, 2]")
+    with pytest.raises(ValueError):
+        list(read_updates(str(tmp_path / "bad.json")))
@@ -0,0 +1,37 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.model_registry import ModelRegistry  # noqa: E402
+from src.sharded_scoring import ShardedScorer, merge_shards, shard_bounds  # noqa: E402
+
+
+class _ParentOnlyRegistry:
+    """Üst süreçte model döndüren, süreçlerin ise boş dizinden yükleyemediği kayıt defteri."""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+
+    def get(self, name, task="classification", backend=None):
+        return object()
+
+
+def test_missing_model_raises_before_pool(tmp_path):
+    scorer = ShardedScorer("does_not_exist", workers=2, registry=ModelRegistry(str(tmp_path)))
+    with pytest.raises(FileNotFoundError):
+        scorer(np.zeros((10, 5)))
+
+
+def test_worker_setup_failure_raises_instead_of_hanging(tmp_path):
+    scorer = ShardedScorer("does_not_exist", workers=2, registry=_ParentOnlyRegistry(str(tmp_path)))
+    with pytest.raises(RuntimeError, match="does_not_exist"):
+        scorer(np.zeros((10, 5)))
+
+
+def test_merge_shards_matches_global_sort():
+    rng = np.random.default_rng(0)
+    risk = rng.integers(0, 20, size=1000) / 20  #Eşit skorlar sıralamanın kararlılığını sınar
+    order = np.empty(len(risk), dtype=np.intp)
+    for start, stop in shard_bounds(len(risk), 7):
+        order[start:stop] = start + np.argsort(-risk[start:stop], kind='stable')
+    np.testing.assert_array_equal(merge_shards(risk, order), np.argsort(-risk, kind='stable'))
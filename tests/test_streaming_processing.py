@@ -0,0 +1,93 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from src.data_processor import DataProcessor  # noqa: E402
+from src.machine_manager import MachineManager  # noqa: E402
+
+RANK_ERROR = 0.01  #Kantil özetinin izin verilen sıra hatası (k=2048, birkaç bin satır için bol)
+RAW_COLUMNS = {
+    'air_temp': 'Air temperature [K]',
+    'process_temp': 'Process temperature [K]',
+    'rotational_speed': 'Rotational speed [rpm]',
+    'torque': 'Torque [Nm]',
+    'tool_wear': 'Tool wear [min]'
+}
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    """Tekrar eden Product ID'ler ve uç aykırı değerler içeren küçük bir ai4i2020 benzeri dosya."""
+    rng = np.random.default_rng(11)
+    n = 6000
+    product_ids = [f"{'LMH'[i % 3]}{i % 4000:05d}" for i in range(n)]
+    values = {
+        'air_temp': rng.normal(300, 2, n),
+        'process_temp': rng.normal(310, 1.5, n),
+        'rotational_speed': rng.normal(1540, 180, n),
+        'torque': rng.normal(40, 10, n),
+        'tool_wear': rng.uniform(0, 250, n)
+    }
+    outliers = rng.choice(n, size=40, replace=False)
+    values['torque'][outliers[:20]] = 400.0
+    values['rotational_speed'][outliers[20:]] = 9000.0
+    data = pd.DataFrame({
+        'UDI': np.arange(1, n + 1),
+        'Product ID': product_ids,
+        'Type': [product_id[0] for product_id in product_ids],
+        **{RAW_COLUMNS[col]: column for col, column in values.items()},
+        'Machine failure': rng.integers(0, 2, n)
+    })
+    for flag in ('TWF', 'HDF', 'PWF', 'OSF', 'RNF'):
+        data[flag] = 0
+    path = tmp_path / "raw.csv"
+    data.to_csv(path, index=False)
+    return path
+
+
+def _run(workdir, monkeypatch, csv_path, chunksize):
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+    manager = MachineManager(store_path=str(workdir / "profiles.npz"), profiles_dir=str(workdir / "none"),
+                             journal_path=str(workdir / "journal.jsonl"))
+    result = DataProcessor(chunksize=chunksize, manager=manager).process_data(str(csv_path))
+    return result, pd.read_csv(workdir / DataProcessor.PROCESSED_PATH), manager
+
+
+def test_streaming_matches_in_memory(tmp_path, monkeypatch, raw_csv):
+    _, memory_out, memory_manager = _run(tmp_path / "memory", monkeypatch, raw_csv, None)
+    stats, stream_out, stream_manager = _run(tmp_path / "stream", monkeypatch, raw_csv, 700)
+
+    raw = pd.read_csv(raw_csv)
+    q1, q3 = DataProcessor.OUTLIER_QUANTILES
+    factor = DataProcessor.IQR_FACTOR
+    tolerance = {}
+    for col, (low, high) in stats['thresholds'].items():
+        exact = raw[RAW_COLUMNS[col]]
+        #Eşikler kantillerin doğrusal fonksiyonu; özetin sıra hatası sınırlarını verir
+        q1_range = exact.quantile([q1 - RANK_ERROR, q1 + RANK_ERROR]).to_numpy()
+        q3_range = exact.quantile([q3 - RANK_ERROR, q3 + RANK_ERROR]).to_numpy()
+        assert (1 + factor) * q1_range[0] - factor * q3_range[1] <= low <= (1 + factor) * q1_range[1] - factor * q3_range[0]
+        assert (1 + factor) * q3_range[0] - factor * q1_range[1] <= high <= (1 + factor) * q3_range[1] - factor * q1_range[0]
+        exact_low, exact_high = exact.quantile(q1), exact.quantile(q3)
+        iqr = exact_high - exact_low
+        tolerance[col] = max(abs(low - (exact_low - factor * iqr)), abs(high - (exact_high + factor * iqr))) + 1e-9
+
+    assert stats['rows_in'] == 6000
+    assert stats['rows_out'] == len(memory_out) == 4000
+    assert stream_out['Product ID'].tolist() == memory_out['Product ID'].tolist()
+    for col in ('Type', 'failure', 'UDI'):
+        assert stream_out[col].tolist() == memory_out[col].tolist()
+    for col, limit in tolerance.items():
+        assert np.abs(stream_out[col].to_numpy() - memory_out[col].to_numpy()).max() <= limit
+        #Eklenen uç değerler akış modunda da kendi eşiğine kırpılır
+        low, high = stats['thresholds'][col]
+        assert low <= stream_out[col].min() and stream_out[col].max() <= high
+
+    memory_table, stream_table = memory_manager.machines, stream_manager.machines
+    assert stream_table.machine_ids == memory_table.machine_ids
+    assert stream_table.machine_types == memory_table.machine_types
+    np.testing.assert_array_equal(stream_table.failure_array(), memory_table.failure_array())
+    limits = np.array([tolerance[col] for col in DataProcessor.NUM_COLS])
+    assert (np.abs(stream_table.feature_matrix() - memory_table.feature_matrix()) <= limits).all()
@@ -0,0 +1,56 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+
+from sklearn.ensemble import RandomForestClassifier  # noqa: E402
+from src.tree_inference import compile_model  # noqa: E402
+
+
+def _dataset(n=2000, missing=0.0, seed=5):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 5)) * [2.0, 1.5, 180.0, 10.0, 60.0] + [300.0, 310.0, 1540.0, 40.0, 110.0]
+    y = ((X[:, 3] > 48) & (X[:, 4] > 150) | (X[:, 2] < 1300)).astype(int)
+    if missing:
+        X[rng.random(X.shape) < missing] = np.nan
+    return X, y
+
+
+def _split_rows(flat, X, seed=6):
+    """Her iç düğüm için, bölme özelliği tam eşik değerinde olan bir satır üretir."""
+    internal = np.flatnonzero(flat.left != np.arange(len(flat.left)))
+    rows = X[np.random.default_rng(seed).integers(0, len(X), size=len(internal))].copy()
+    rows[np.arange(len(internal)), flat.feature[internal]] = flat.threshold[internal]
+    return rows
+
+
+def _assert_parity(model, X, atol):
+    flat = compile_model(model)
+    assert flat is not None
+    for rows in (X, _split_rows(flat, X)):
+        np.testing.assert_allclose(flat.predict_risk(rows), model.predict_proba(rows)[:, 1], rtol=0, atol=atol)
+
+
+def test_random_forest_parity():
+    X, y = _dataset()
+    model = RandomForestClassifier(n_estimators=25, max_depth=12, random_state=0).fit(X, y)
+    _assert_parity(model, X, atol=1e-12)
+
+
+def test_random_forest_missing_values():
+    X, y = _dataset(missing=0.05)
+    try:
+        model = RandomForestClassifier(n_estimators=25, max_depth=12, random_state=0).fit(X, y)
+    except ValueError:
+        pytest.skip("Bu scikit-learn sürümü ormanlarda eksik değer desteklemiyor")
+    _assert_parity(model, X, atol=1e-12)
+
+
+@pytest.mark.parametrize("base_score", [None, 0.2])
+def test_xgboost_parity(base_score):
+    xgboost = pytest.importorskip("xgboost")
+    X, y = _dataset(missing=0.05)
+    model = xgboost.XGBClassifier(n_estimators=40, max_depth=5, learning_rate=0.3, tree_method="hist",
+                                  base_score=base_score, random_state=0).fit(X, y)
+    #XGBoost marjı float32 ile toplar; düz tahminci float64 kullanır
+    _assert_parity(model, X, atol=1e-5)